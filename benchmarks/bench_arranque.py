@@ -0,0 +1,83 @@
+"""Arranque en frío: tiempo hasta dibujar el formulario de acceso.
+
+Cada medición corre en un proceso nuevo (sin módulos en memoria, como un
+worker de Streamlit recién levantado): importa streamlit, corre app.py con
+AppTest y reporta el tiempo y qué dependencias pesadas quedaron cargadas.
+El escenario "sesion" entra ya autenticado contra un almacén local vacío
+(primer render completo, pestañas incluidas).
+
+Uso: python benchmarks/bench_arranque.py [--repeticiones 5] [--app app.py] [--limite 1500]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PESADOS = ["pandas", "numpy", "gspread", "plotly.express", "plotly.graph_objects", "fpdf", "xlsxwriter", "requests"]
+
+HIJO = r"""
+import json, sys, time
+t = time.perf_counter()
+import streamlit
+t_streamlit = time.perf_counter() - t
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=120)
+if {sesion!r}:
+    at.secrets['almacen'] = 'local'
+    at.secrets['almacen_path'] = {tmp!r} + '/f.sqlite'
+    at.secrets['cola_path'] = {tmp!r} + '/cola.json'
+    at.secrets['metricas_path'] = ''
+    at.session_state['password_correct'] = True
+t_app = time.perf_counter()
+at.run()
+fin = time.perf_counter()
+print(json.dumps({{
+    'ms': 1000 * (t_streamlit + fin - t_app),
+    'ms_streamlit': 1000 * t_streamlit,
+    'ms_app': 1000 * (fin - t_app),
+    'error': bool(at.exception),
+    'modulos': [m for m in {pesados!r} if m in sys.modules],
+}}))
+"""
+
+
+def medir(app, sesion, tmp):
+    """Un proceso nuevo: streamlit + primer at.run() de `app` (sin contar el import de AppTest)"""
+    codigo = HIJO.format(app=app, sesion=sesion, tmp=tmp, pesados=PESADOS)
+    salida = subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, capture_output=True, text=True, check=True)
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def correr(app, escenario, repeticiones):
+    with tempfile.TemporaryDirectory(prefix="arranque_") as tmp:
+        corridas = [medir(app, escenario == "sesion", tmp) for _ in range(repeticiones)]
+    return {
+        'ms': round(statistics.median(c['ms'] for c in corridas), 1),
+        'ms_streamlit': round(statistics.median(c['ms_streamlit'] for c in corridas), 1),
+        'ms_app': round(statistics.median(c['ms_app'] for c in corridas), 1),
+        'error': any(c['error'] for c in corridas),
+        'modulos': corridas[-1]['modulos'],
+    }
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--repeticiones", type=int, default=5)
+    p.add_argument("--app", default=os.path.join(RAIZ, "app.py"))
+    p.add_argument("--limite", type=float, default=None, help="ms máximos hasta el login (sale con 1 si se pasa)")
+    args = p.parse_args()
+
+    res = {}
+    print(f"{'escenario':<10} {'total ms':>10} {'streamlit':>10} {'app':>10}  pesados cargados")
+    for escenario in ("login", "sesion"):
+        r = res[escenario] = correr(os.path.abspath(args.app), escenario, args.repeticiones)
+        aviso = "  ⚠ excepción en el script" if r['error'] else ""
+        print(f"{escenario:<10} {r['ms']:>10.1f} {r['ms_streamlit']:>10.1f} {r['ms_app']:>10.1f}  {', '.join(r['modulos']) or '-'}{aviso}")
+
+    if args.limite is not None and res["login"]['ms'] > args.limite:
+        print(f"REGRESIÓN arranque: {res['login']['ms']} ms > {args.limite} ms")
+        sys.exit(1)
@@ -0,0 +1,110 @@
+"""Importación de un estado de cuenta grande (CSV y OFX) contra una hoja ya poblada.
+
+La mitad de los movimientos del estado ya está en "Hoja 1" (deben salir como
+duplicados); el destino es AlmacenSheets sobre gspread falso para contar las
+llamadas append_rows. Una segunda pasada del mismo archivo no debe agregar nada.
+
+Uso: python benchmarks/bench_importador.py [--filas 50000] [--existentes 100000] [--tamano 5000]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gspread_falso import LibroFalso  # noqa: E402
+from sintetico import libro_sintetico, movimientos  # noqa: E402
+from finanzas.almacen import ENCABEZADOS, AlmacenSheets  # noqa: E402
+from finanzas.cliente_sheets import ClienteSheets, CubetaFichas  # noqa: E402
+from finanzas.esquema import parsear_fechas, parsear_numeros, tipar  # noqa: E402
+from finanzas.importador import importar  # noqa: E402
+from finanzas.snapshot import SnapshotLocal  # noqa: E402
+
+CUENTA = "BBVA"
+
+
+def estado(filas):
+    """Movimientos de una sola cuenta, como DataFrame de "Hoja 1" (texto)"""
+    df = pd.DataFrame(movimientos(filas, semilla=7, desde="2030-01-01"), columns=ENCABEZADOS["Hoja 1"])
+    df["BANCO"] = CUENTA
+    return df
+
+
+def escribir_csv(df, ruta):
+    """Formato típico de banco: dd/mm/aaaa, cargo y abono en columnas separadas"""
+    gasto = df["TIPO"] == "Gasto"
+    importe = parsear_numeros(df["IMPORTE"])
+    pd.DataFrame({
+        "Fecha": parsear_fechas(df["FECHA"]).dt.strftime("%d/%m/%Y"),
+        "Concepto": df["DESCRIPCION"].str.upper(),
+        "Cargo": importe.where(gasto).map("{:,.2f}".format).replace("nan", ""),
+        "Abono": importe.where(~gasto).map("{:,.2f}".format).replace("nan", ""),
+    }).to_csv(ruta, index=False)
+
+
+def escribir_ofx(df, ruta):
+    importe = parsear_numeros(df["IMPORTE"]).where(df["TIPO"] != "Gasto", -parsear_numeros(df["IMPORTE"]))
+    fechas = parsear_fechas(df["FECHA"]).dt.strftime("%Y%m%d120000[-6:CST]")
+    with open(ruta, "w", encoding="utf-8") as f:
+        f.write("OFXHEADER:100\nDATA:OFXSGML\n\n<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>\n")
+        for i, (fecha, monto, desc) in enumerate(zip(fechas, importe, df["DESCRIPCION"])):
+            f.write(f"<STMTTRN>\n<TRNTYPE>{'DEBIT' if monto < 0 else 'CREDIT'}\n<DTPOSTED>{fecha}\n"
+                    f"<TRNAMT>{monto:.2f}\n<FITID>{i}\n<NAME>{desc[:32]}\n<MEMO>{desc}\n</STMTTRN>\n")
+        f.write("</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>\n")
+
+
+def _almacen(tmp):
+    libro = LibroFalso(libro_sintetico(0))
+    sin_limite = CubetaFichas(float("inf"), float("inf"))
+    almacen = AlmacenSheets(ClienteSheets(libro, lectura=sin_limite, escritura=sin_limite),
+                            SnapshotLocal(os.path.join(tmp, f"snap_{time.perf_counter_ns()}.sqlite")))
+    return libro, almacen
+
+
+def medir(ruta, existentes, tamano, tmp):
+    """Tiempo de una importación; memoria pico en otra corrida bajo tracemalloc"""
+    libro, almacen = _almacen(tmp)
+    t = time.perf_counter()
+    resumen = importar(ruta, almacen, CUENTA, existentes, tamano=tamano)
+    seg = time.perf_counter() - t
+    tracemalloc.start()
+    importar(ruta, _almacen(tmp)[1], CUENTA, existentes, tamano=tamano)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    # Reimportar el mismo archivo contra la hoja ya actualizada no agrega nada
+    importados = tipar(pd.DataFrame(almacen.leer("Hoja 1")), "Hoja 1")
+    repetido = importar(ruta, _almacen(tmp)[1], CUENTA, pd.concat([existentes, importados], ignore_index=True), tamano=tamano)
+    return seg, pico, libro.llamadas["append_rows"], resumen, repetido["nuevas"]
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--filas", type=int, default=50_000)
+    p.add_argument("--existentes", type=int, default=100_000)
+    p.add_argument("--tamano", type=int, default=5000)
+    args = p.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_imp_")
+    try:
+        df = estado(args.filas)
+        # La primera mitad del estado ya se había capturado a mano / por Telegram
+        hoja = pd.concat([pd.DataFrame(movimientos(args.existentes), columns=ENCABEZADOS["Hoja 1"]),
+                          df.iloc[:args.filas // 2]], ignore_index=True)
+        existentes = tipar(hoja, "Hoja 1")
+        rutas = {"csv": os.path.join(tmp, "estado.csv"), "ofx": os.path.join(tmp, "estado.ofx")}
+        escribir_csv(df, rutas["csv"])
+        escribir_ofx(df, rutas["ofx"])
+
+        print(f"{args.filas:,} movimientos en el estado · {len(existentes):,} ya en la hoja · trozos de {args.tamano:,}")
+        print(f"{'formato':<8} {'seg':>8} {'filas/s':>12} {'MB pico':>8} {'append_rows':>12} {'nuevas':>8} {'duplicadas':>11} {'2a pasada':>10}")
+        for formato, ruta in rutas.items():
+            seg, pico, llamadas, r, repetido = medir(ruta, existentes, args.tamano, tmp)
+            print(f"{formato:<8} {seg:>8.2f} {r['leidas'] / seg:>12,.0f} {pico / 1e6:>8.1f} {llamadas:>12} "
+                  f"{r['nuevas']:>8,} {r['duplicadas']:>11,} {repetido:>10,}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
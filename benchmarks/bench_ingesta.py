@@ -0,0 +1,62 @@
+"""Ingesta de "Hoja 1": conversión anterior (astype(str) + apply por fila) vs esquema tipado.
+
+Uso: python benchmarks/bench_ingesta.py [filas]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from finanzas.esquema import importe_real, tipar  # noqa: E402
+
+
+def registros_sinteticos(n, semilla=0):
+    """Filas como las entrega get_all_records (números ya numericizados)"""
+    rng = np.random.default_rng(semilla)
+    fechas = (pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 2000, n), unit='D')).strftime('%Y-%m-%d')
+    return pd.DataFrame({
+        'ORIGEN': rng.choice(['Manual', 'Telegram', 'Auto'], n),
+        'FECHA': fechas,
+        'DESCRIPCION': rng.choice(['tacos', 'super mercado', 'gasolina', 'renta', 'sueldo'], n),
+        'IMPORTE': rng.uniform(1, 5000, n).round(2),
+        'NOTA': '-', 'REFERENCIA': '-',
+        'TIPO': rng.choice(['Gasto', 'Ingreso', 'Pago', 'Devolucion'], n),
+        'BANCO': rng.choice(['BBVA', 'Nu', 'Efectivo', 'Amex', 'Santander'], n),
+        'PLAZO_MESES': rng.choice([1, 1, 1, 3, 6, 12], n),
+        'INTERES': rng.choice([0, 0, 10], n),
+        'DIA_CORTE': rng.choice([0, 15, 28], n),
+    }).to_dict('records')
+
+
+def anterior(registros):
+    df = pd.DataFrame(registros).astype(str)
+    df['IMPORTE'] = pd.to_numeric(df['IMPORTE'], errors='coerce').fillna(0).abs()
+    df['FECHA'] = pd.to_datetime(df['FECHA'], errors='coerce', dayfirst=True)
+    df['IMPORTE_REAL'] = df.apply(lambda x: -x['IMPORTE'] if 'GASTO' in str(x['TIPO']).upper() else x['IMPORTE'], axis=1)
+    return df
+
+
+def tipado(registros):
+    df = tipar(pd.DataFrame(registros), "Hoja 1")
+    df['IMPORTE_REAL'] = importe_real(df)
+    return df
+
+
+def medir(nombre, fn, registros):
+    t = time.perf_counter()
+    df = fn(registros)
+    seg = time.perf_counter() - t
+    n = len(registros)
+    print(f"{nombre:<10} {n / seg:>14,.0f} filas/s {df.memory_usage(deep=True).sum() / n:>10,.1f} bytes/fila")
+    return df
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    registros = registros_sinteticos(n)
+    a = medir("anterior", anterior, registros)
+    b = medir("esquema", tipado, registros)
+    assert np.allclose(a['IMPORTE_REAL'], b['IMPORTE_REAL'])
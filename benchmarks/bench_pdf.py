@@ -0,0 +1,34 @@
+"""Cierre de mes en PDF: costo por documento en serie, con un pool nuevo por lote
+y con el pool que la app reutiliza (el primer lote paga el arranque de los procesos).
+
+Uso: python benchmarks/bench_pdf.py [movimientos]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_ingesta import registros_sinteticos, tipado  # noqa: E402
+from finanzas.documentos import crear_pool, generar_lote, trabajos_cierre  # noqa: E402
+
+
+def medir(trabajos, procesos, pool=None, nombre=""):
+    t = time.perf_counter()
+    zip_bytes = generar_lote(trabajos, procesos, pool)
+    seg = time.perf_counter() - t
+    print(f"procesos={procesos or os.cpu_count():<3} {nombre:<14} {len(trabajos):>5} docs {seg:>7.2f} s {1000 * seg / len(trabajos):>8.2f} ms/doc {len(zip_bytes) / 1e6:>7.2f} MB")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    df = tipado(registros_sinteticos(n))
+    # Algunos cobros para que también salgan recibos
+    df.loc[df.sample(frac=0.05, random_state=0).index, 'DESCRIPCION'] = "Cobro Juan"
+    mes = df['FECHA'].max()
+    trabajos = trabajos_cierre(df, mes)
+    medir(trabajos, 1, nombre="serie")
+    medir(trabajos, None, nombre="pool nuevo")
+    pool = crear_pool()
+    medir(trabajos, None, pool, "pool, 1er lote")
+    medir(trabajos, None, pool, "pool, 2o lote")
+    pool.shutdown()
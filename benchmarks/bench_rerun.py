@@ -0,0 +1,79 @@
+"""Costo de un rerun de app.py según qué cambió, sobre un libro sintético local.
+
+Escenarios, en orden y sobre la misma sesión de AppTest:
+  primer render · widget (sólo cambia un number_input) · horizonte del calendario
+  · cobro (anexa a "Hoja 1" y edita "Deudas" por la cola) · lectura que ya trae
+  el cobro · widget otra vez
+Por escenario: ms del rerun y qué artefactos derivados se recalcularon (fallos
+de cache en el registro de métricas). Un rerun por widget no debe recalcular nada.
+
+Uso: python benchmarks/bench_rerun.py [--filas 100000]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+from sintetico import libro_sintetico  # noqa: E402
+from finanzas.almacen import AlmacenLocal  # noqa: E402
+
+
+def poblar(ruta, filas):
+    almacen = AlmacenLocal(ruta)
+    for hoja, valores in libro_sintetico(filas).items(): almacen.anexar(hoja, valores[1:])
+    almacen.con.close()
+
+
+def ultimo_rerun(ruta):
+    with open(ruta, encoding="utf-8") as f: r = json.loads(f.readlines()[-1])
+    return r["total_ms"], sorted(k[6:-7] for k in r["contadores"] if k.startswith("cache.") and k.endswith(".fallos"))
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--filas", type=int, default=100_000)
+    args = p.parse_args()
+
+    from streamlit.testing.v1 import AppTest
+    tmp = tempfile.mkdtemp(prefix="bench_rerun_")
+    try:
+        poblar(os.path.join(tmp, "f.sqlite"), args.filas)
+        at = AppTest.from_file(os.path.join(RAIZ, "app.py"), default_timeout=300)
+        at.secrets["almacen"] = "local"
+        at.secrets["almacen_path"] = os.path.join(tmp, "f.sqlite")
+        at.secrets["cola_path"] = os.path.join(tmp, "cola.json")
+        at.secrets["metricas_path"] = metricas = os.path.join(tmp, "metricas.jsonl")
+        at.session_state["password_correct"] = True
+
+        def widget():
+            # Multa simulada de la pestaña 4: sólo cambia el texto de "Nueva deuda estimada"
+            n = next(x for x in at.number_input if str(x.key).startswith("pen_"))
+            n.set_value(n.value + 100)
+
+        def cobro():
+            at.button[[b.label for b in at.button].index("✅ Registrar Cobro")].click()
+
+        def leer():
+            time.sleep(6)  # vence la lectura cacheada (ttl 5 s) y la cola ya envió
+
+        pasos = [("primer render", lambda: None),
+                 ("widget", widget),
+                 ("horizonte", lambda: at.slider(key="cal_meses").set_value(6)),
+                 ("cobro (cola)", cobro),
+                 ("lectura con el cobro", leer),
+                 ("widget", widget)]
+        print(f"{args.filas:,} movimientos")
+        print(f"{'escenario':<22} {'ms':>9}  recalculados")
+        for nombre, accion in pasos:
+            accion()
+            at.run()
+            ms, fallos = ultimo_rerun(metricas)
+            aviso = "  ⚠ excepción en el script" if at.exception else ""
+            print(f"{nombre:<22} {ms:>9.1f}  {', '.join(fallos) or '-'}{aviso}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
@@ -0,0 +1,236 @@
+"""Suite de benchmarks por etapa sobre un libro sintético y gspread falso.
+
+Cada etapa se corre `--repeticiones` veces para el tiempo (se queda el mejor) y
+una vez más bajo tracemalloc para la memoria pico. Con --guardar se escribe la
+línea base; sin él se compara contra ella y sale con código 1 si alguna etapa
+empeora más de la tolerancia.
+
+Uso: python benchmarks/bench_suite.py [--filas 1000,10000,100000] [--guardar]
+                                      [--base benchmarks/baseline.json] [--tolerancia 0.25]
+"""
+import argparse
+import gc
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gspread_falso import LibroFalso  # noqa: E402
+from sintetico import COMPRAS, GASTOS, libro_sintetico, movimientos  # noqa: E402
+from finanzas.agenda import generar as generar_agenda  # noqa: E402
+from finanzas.almacen import AlmacenSheets  # noqa: E402
+from finanzas.bitacora import IndiceBitacora  # noqa: E402
+from finanzas.categorias import Categorizador  # noqa: E402
+from finanzas.cliente_sheets import ClienteSheets, CubetaFichas  # noqa: E402
+from finanzas.cubo import construir_cubo  # noqa: E402
+from finanzas.cuentas import con_limites, resumen_cuentas  # noqa: E402
+from finanzas.documentos import generar_lote, generar_pdf, trabajos_cierre  # noqa: E402
+from finanzas.esquema import importe_real, tipar  # noqa: E402
+from finanzas.exportar import exportar  # noqa: E402
+from finanzas.localizador import Localizador  # noqa: E402
+from finanzas.motor import generar_flujo_real  # noqa: E402
+from finanzas.pronostico import pronosticar  # noqa: E402
+from finanzas.serie import SerieSaldo  # noqa: E402
+from finanzas.snapshot import SnapshotLocal  # noqa: E402
+
+BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+MAX_XLSX = 100_000  # xlsxwriter escribe celda por celda: arriba de esto sólo CSV
+MIN_DIFERENCIA = 0.005  # segundos; por debajo el ruido domina
+REGLAS = ([{"PATRON": p, "CATEGORIA": p.split()[0].title(), "TIPO": "palabra"} for p in GASTOS + COMPRAS]
+          + [{"PATRON": r"^(pago|devolucion)\b", "CATEGORIA": "Movimientos internos", "TIPO": "regex"}])
+
+
+# ================= ETAPAS =================
+# Cada etapa recibe el contexto (dict) y devuelve lo que aporta a las siguientes.
+def e_lectura_completa(ctx):
+    libro = LibroFalso(ctx['hojas'])
+    # Sin límite de cuota: aquí se mide el trabajo, no la espera por la cubeta
+    sin_limite = CubetaFichas(float("inf"), float("inf"))
+    cliente = ClienteSheets(libro, lectura=sin_limite, escritura=sin_limite)
+    almacen = AlmacenSheets(cliente, SnapshotLocal(os.path.join(ctx['tmp'], f"snap_{time.perf_counter_ns()}.sqlite")))
+    return {'libro': libro, 'almacen': almacen, 'registros': almacen.leer_todo(list(ctx['hojas']))}
+
+
+def e_lectura_incremental(ctx):
+    almacen = ctx['almacen']
+    almacen.anexar("Hoja 1", movimientos(50, semilla=99))
+    return {'nuevos': almacen.leer("Hoja 1")}
+
+
+def e_tipado(ctx):
+    df = tipar(pd.DataFrame(ctx['registros']["Hoja 1"]), "Hoja 1")
+    df['IMPORTE_REAL'] = importe_real(df)
+    return {'df_movs': df,
+            'df_deudas': tipar(pd.DataFrame(ctx['registros']["Deudas"]), "Deudas"),
+            'df_inv': tipar(pd.DataFrame(ctx['registros']["Inversiones"]), "Inversiones")}
+
+
+def e_cuentas(ctx):
+    return {'df_cuentas': con_limites(resumen_cuentas(ctx['df_movs']), ctx['df_deudas'])}
+
+
+def e_flujo(ctx):
+    return {'df_flujo': generar_flujo_real(ctx['df_movs'].copy())}
+
+
+def e_categorias(ctx):
+    """Recategorizar todo el historial tras un cambio de reglas (categorizador y memo nuevos)"""
+    desc = ctx['df_movs']['DESCRIPCION']
+    Categorizador(REGLAS).aplicar(desc, desc.str.split().str[0])
+    return {}
+
+
+def e_agenda(ctx):
+    """Calendario de 12 meses: pagos, cortes y mensualidades de todas las deudas activas"""
+    generar_agenda(ctx['df_deudas'], ctx['df_cuentas'], ctx['df_flujo'], ctx['df_movs']['FECHA'].max().date(), 12)
+    return {}
+
+
+def e_cubo(ctx):
+    return {'cubo': construir_cubo(ctx['df_flujo'])}
+
+
+def e_bitacora(ctx):
+    indice = IndiceBitacora(ctx['df_movs'])
+    cursor = None
+    for _ in range(10):
+        _, cursor = indice.consultar(cursor=cursor, limite=100)
+    indice.consultar(cuentas=["BBVA", "Nu"], texto="super", limite=100)
+    return {}
+
+
+def e_serie(ctx):
+    serie = SerieSaldo(ctx['df_movs'])
+    serie.vista()
+    serie.vista(modo="Semanal")
+    return {}
+
+
+def e_pronostico(ctx):
+    pronosticar(ctx['df_flujo'], ctx['df_deudas'], meses=60, escenarios=10_000, semilla=0)
+    return {}
+
+
+def e_deudas(ctx):
+    """Camino de escritura de la pestaña 4: ABONADO de hasta 50 deudas en un solo batch_update"""
+    loc = Localizador(ctx['registros']["Deudas"])
+    celdas = [c for nombre in ctx['df_deudas']['NOMBRE'].astype(str).head(50) for c in loc.celdas(nombre, ABONADO=1)]
+    ctx['almacen'].actualizar_celdas("Deudas", celdas)
+    return {}
+
+
+def e_export_csv(ctx):
+    exportar(ctx['df_movs'], time.perf_counter_ns(), formato="csv", carpeta=os.path.join(ctx['tmp'], "exports"))
+    return {}
+
+
+def e_export_xlsx(ctx):
+    exportar(ctx['df_movs'], time.perf_counter_ns(), formato="xlsx", carpeta=os.path.join(ctx['tmp'], "exports"))
+    return {}
+
+
+def e_pdf(ctx):
+    df = ctx['df_movs']
+    for r in df.tail(50).itertuples(index=False):
+        generar_pdf(str(r.FECHA), r.BANCO, r.IMPORTE, r.DESCRIPCION)
+    generar_lote(trabajos_cierre(df, df['FECHA'].max()), procesos=1)
+    return {}
+
+
+ETAPAS = [e_lectura_completa, e_lectura_incremental, e_tipado, e_cuentas, e_flujo, e_categorias, e_agenda, e_cubo, e_bitacora,
+          e_serie, e_pronostico, e_deudas, e_export_csv, e_export_xlsx, e_pdf]
+
+
+# ================= MEDICIÓN =================
+def _llamadas(ctx):
+    return sum(ctx['libro'].llamadas.values()) if 'libro' in ctx else 0
+
+
+def medir(etapa, ctx, repeticiones):
+    """Mejor tiempo, memoria pico y llamadas a la API de una corrida"""
+    mejor, salida, api = float("inf"), {}, 0
+    for _ in range(repeticiones):
+        gc.collect()
+        antes = _llamadas(ctx)
+        t = time.perf_counter()
+        salida = etapa(ctx)
+        mejor = min(mejor, time.perf_counter() - t)
+        api = _llamadas(salida) if 'libro' in salida else _llamadas(ctx) - antes
+    gc.collect()
+    tracemalloc.start()
+    etapa(ctx)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'seg': round(mejor, 5), 'mb': round(pico / 1e6, 2), 'api': api}, salida
+
+
+def correr(filas, repeticiones):
+    tmp = tempfile.mkdtemp(prefix="bench_")
+    try:
+        ctx = {'hojas': libro_sintetico(filas), 'tmp': tmp}
+        res = {}
+        for etapa in ETAPAS:
+            nombre = etapa.__name__[2:]
+            if nombre == "export_xlsx" and filas > MAX_XLSX: continue
+            res[nombre], salida = medir(etapa, ctx, repeticiones)
+            ctx.update(salida)
+        return res
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def comparar(actual, base, tolerancia):
+    """Lista de (filas, etapa, métrica, base, actual) que empeoraron"""
+    peores = []
+    for filas, etapas in actual.items():
+        for etapa, m in etapas.items():
+            b = base.get(filas, {}).get(etapa)
+            if not b: continue
+            if m['seg'] > b['seg'] * (1 + tolerancia) and m['seg'] - b['seg'] > MIN_DIFERENCIA:
+                peores.append((filas, etapa, 'seg', b['seg'], m['seg']))
+            if m['mb'] > b['mb'] * (1 + tolerancia) and m['mb'] - b['mb'] > 1:
+                peores.append((filas, etapa, 'mb', b['mb'], m['mb']))
+            if m.get('api', 0) > b.get('api', 0):
+                peores.append((filas, etapa, 'api', b.get('api', 0), m['api']))
+    return peores
+
+
+def imprimir(filas, res, base):
+    print(f"\n== {filas:,} filas ==")
+    print(f"{'etapa':<20} {'seg':>10} {'base':>10} {'MB pico':>10} {'base':>10} {'API':>5}")
+    for etapa, m in res.items():
+        b = base.get(etapa, {})
+        print(f"{etapa:<20} {m['seg']:>10.4f} {b.get('seg', float('nan')):>10.4f} {m['mb']:>10.2f} {b.get('mb', float('nan')):>10.2f} {m['api']:>5}")
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--filas", default="1000,10000,100000")
+    p.add_argument("--repeticiones", type=int, default=3)
+    p.add_argument("--base", default=BASE)
+    p.add_argument("--tolerancia", type=float, default=0.25)
+    p.add_argument("--guardar", action="store_true", help="escribe los resultados como nueva línea base")
+    args = p.parse_args()
+
+    base = {}
+    if os.path.exists(args.base):
+        with open(args.base, encoding="utf-8") as f: base = json.load(f)
+    actual = {}
+    for n in (int(x) for x in args.filas.split(",")):
+        actual[str(n)] = correr(n, args.repeticiones)
+        imprimir(n, actual[str(n)], base.get(str(n), {}))
+
+    if args.guardar:
+        with open(args.base, "w", encoding="utf-8") as f: json.dump({**base, **actual}, f, indent=1)
+        print(f"\nLínea base guardada en {args.base}")
+    else:
+        peores = comparar(actual, base, args.tolerancia)
+        for filas, etapa, metrica, b, a in peores:
+            print(f"REGRESIÓN {filas} filas · {etapa} · {metrica}: {b} -> {a}")
+        sys.exit(1 if peores else 0)
@@ -0,0 +1,77 @@
+"""Lector de Telegram (long-polling) contra el Bot API falso de telegram_falso.py.
+
+Escenarios:
+  mensajes  · latencia mensaje -> fila en la cola y peticiones getUpdates por mensaje
+  409       · otro proceso sondea el mismo bot: el lector debe esperar, no girar
+  401       · token inválido: lo mismo
+Por escenario: peticiones getUpdates hechas y el último error del trabajador.
+
+Uso: python benchmarks/bench_telegram.py [--mensajes 20] [--segundos 12]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+from telegram_falso import TelegramFalso  # noqa: E402
+from finanzas.telegram import ClienteTelegram, TrabajadorTelegram  # noqa: E402
+
+CHAT = 42
+
+
+class ColaFalsa:
+    """Sólo anota cuándo llega cada fila"""
+
+    def __init__(self):
+        self.llegadas = []
+
+    def anexar(self, hoja, filas):
+        self.llegadas.extend(time.perf_counter() for _ in filas)
+
+
+def trabajador(url, token, cola):
+    ruta = os.path.join(tempfile.mkdtemp(prefix="bench_tg_"), "offset.json")
+    return TrabajadorTelegram(ClienteTelegram(token, url), cola, CHAT, ruta=ruta, timeout=5).iniciar()
+
+
+def mensajes(n):
+    servidor = TelegramFalso().iniciar()
+    cola = ColaFalsa()
+    bot = trabajador(servidor.url, servidor.token, cola)
+    time.sleep(0.2)  # ya está esperando en getUpdates
+    enviados = []
+    for i in range(n):
+        enviados.append(time.perf_counter())
+        servidor.mensaje(CHAT, f"{i + 1} tacos")
+        while len(cola.llegadas) <= i: time.sleep(0.001)
+        time.sleep(0.05)
+    lat = [(llega - envio) * 1000 for envio, llega in zip(enviados, cola.llegadas)]
+    print(f"{'mensajes':<10} {n} anotados · latencia mediana {statistics.median(lat):.1f} ms · "
+          f"máx {max(lat):.1f} ms · {servidor.llamadas['getUpdates']} getUpdates · error: {bot.ultimo_error}")
+    servidor.detener()
+
+
+def fallas(nombre, segundos, estado=None, token=None):
+    # Un servidor por escenario: los trabajadores anteriores no se detienen
+    servidor = TelegramFalso().iniciar()
+    if estado: servidor.fallar(estado, "Conflict: terminated by other getUpdates request", veces=10_000)
+    bot = trabajador(servidor.url, token or servidor.token, ColaFalsa())
+    time.sleep(segundos)
+    print(f"{nombre:<10} {servidor.llamadas['getUpdates']} getUpdates en {segundos} s · "
+          f"fallos seguidos {bot.fallos} · error: {bot.ultimo_error}")
+    servidor.detener()
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--mensajes", type=int, default=20)
+    p.add_argument("--segundos", type=int, default=12)
+    args = p.parse_args()
+
+    mensajes(args.mensajes)
+    fallas("409", args.segundos, estado=409)
+    fallas("401", args.segundos, token="otro")
@@ -0,0 +1,141 @@
+"""Spreadsheet/Worksheet de gspread en memoria (sólo la superficie que usa la app).
+
+Las celdas se guardan como texto, igual que las devuelve la API con
+get_all_values. `llamadas` cuenta cada método, una entrada por petición HTTP
+que haría el gspread real, para comparar cuántas llamadas cuesta cada etapa.
+"""
+import re
+from collections import Counter
+
+from gspread.cell import Cell
+from gspread.utils import a1_range_to_grid_range, a1_to_rowcol, numericise_all
+
+
+def _texto(v):
+    if v is None: return ""
+    if isinstance(v, float) and v.is_integer(): return str(int(v))
+    return str(v)
+
+
+class HojaFalsa:
+    def __init__(self, libro, titulo, valores=None):
+        self.libro = libro
+        self.title = titulo
+        self._valores = [[_texto(c) for c in f] for f in (valores or [])]
+
+    def _contar(self, metodo):
+        self.libro.llamadas[metodo] += 1
+
+    @property
+    def row_count(self):
+        return len(self._valores)
+
+    def _rango(self, a1):
+        r = a1_range_to_grid_range(a1)
+        f0, f1 = r.get('startRowIndex', 0), r.get('endRowIndex', len(self._valores))
+        c0, c1 = r.get('startColumnIndex', 0), r.get('endColumnIndex')
+        return [list(f[c0:c1]) for f in self._valores[f0:f1]]
+
+    # ---------- lectura ----------
+    def get_all_values(self):
+        self._contar("get_all_values")
+        return [list(f) for f in self._valores]
+
+    def get_all_records(self, head=1):
+        self._contar("get_all_records")
+        if not self._valores: return []
+        encabezado = self._valores[head - 1]
+        ancho = len(encabezado)
+        return [dict(zip(encabezado, numericise_all((f + [""] * ancho)[:ancho]))) for f in self._valores[head:]]
+
+    def row_values(self, fila):
+        self._contar("row_values")
+        return list(self._valores[fila - 1]) if fila <= len(self._valores) else []
+
+    def col_values(self, col):
+        self._contar("col_values")
+        return [f[col - 1] if col <= len(f) else "" for f in self._valores]
+
+    def batch_get(self, rangos):
+        self._contar("batch_get")
+        return [self._rango(a1) for a1 in rangos]
+
+    def get(self, rango):
+        self._contar("get")
+        return self._rango(rango)
+
+    def find(self, consulta, in_row=None, in_column=None, case_sensitive=True):
+        self._contar("find")
+        for i, f in enumerate(self._valores, 1):
+            if in_row and i != in_row: continue
+            for j, v in enumerate(f, 1):
+                if in_column and j != in_column: continue
+                if (consulta.search(v) if isinstance(consulta, re.Pattern) else v == consulta):
+                    return Cell(i, j, v)
+        return None
+
+    # ---------- escritura ----------
+    def append_row(self, valores, **_):
+        self._contar("append_row")
+        self._valores.append([_texto(c) for c in valores])
+
+    def append_rows(self, valores, **_):
+        self._contar("append_rows")
+        self._valores.extend([_texto(c) for c in f] for f in valores)
+
+    def _poner(self, fila, col, valor):
+        while len(self._valores) < fila: self._valores.append([])
+        f = self._valores[fila - 1]
+        while len(f) < col: f.append("")
+        f[col - 1] = _texto(valor)
+
+    def update_cell(self, fila, col, valor):
+        self._contar("update_cell")
+        self._poner(fila, col, valor)
+
+    def batch_update(self, datos, **_):
+        self._contar("batch_update")
+        for d in datos:
+            fila, col = a1_to_rowcol(d["range"].split(":")[0])
+            for i, valores in enumerate(d["values"]):
+                for j, v in enumerate(valores):
+                    self._poner(fila + i, col + j, v)
+
+
+class LibroFalso:
+    def __init__(self, hojas):
+        """`hojas`: {titulo: [[encabezado...], [fila...], ...]}; la primera es sheet1"""
+        self.llamadas = Counter()
+        self._hojas = {t: HojaFalsa(self, t, v) for t, v in hojas.items()}
+
+    @property
+    def sheet1(self):
+        self.llamadas["sheet1"] += 1
+        return next(iter(self._hojas.values()))
+
+    def worksheet(self, titulo):
+        # En gspread real cada worksheet() / sheet1 / worksheets() pide los metadatos del libro
+        self.llamadas["worksheet"] += 1
+        return self._hojas[titulo]
+
+    def worksheets(self):
+        self.llamadas["worksheets"] += 1
+        return list(self._hojas.values())
+
+    def add_worksheet(self, title, rows=100, cols=26, **_):
+        self.llamadas["add_worksheet"] += 1
+        self._hojas[title] = HojaFalsa(self, title)
+        return self._hojas[title]
+
+    def values_batch_get(self, rangos, params=None):
+        self.llamadas["values_batch_get"] += 1
+        res = []
+        for a1 in rangos:
+            titulo, _, rango = a1.rpartition("!") if "!" in a1 else (a1, "", "")
+            hoja = self._hojas[titulo.strip("'").replace("''", "'")]
+            valores = [list(f) for f in hoja._valores] if not rango else hoja._rango(rango)
+            # La API omite celdas vacías al final de cada fila y filas vacías al final
+            valores = [f[:max((i + 1 for i, c in enumerate(f) if c != ""), default=0)] for f in valores]
+            while valores and not valores[-1]: valores.pop()
+            res.append({"range": a1, "values": valores} if valores else {"range": a1})
+        return {"valueRanges": res}
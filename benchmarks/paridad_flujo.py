@@ -0,0 +1,128 @@
+"""Paridad de generar_flujo_real (vectorizado) contra el ciclo fila a fila anterior.
+
+Ambos reciben el mismo "Hoja 1" sintético tal como lo entrega get_all_records
+(fechas dd/mm/aaaa, montos con separador de miles, MSI con interés y corte) y
+deben dar las mismas mensualidades: fechas, descripciones, importes, signo,
+categoría y tipo de flujo, fila por fila después de ordenar.
+
+Única diferencia intencional: el ciclo leía también las fechas ISO con
+dayfirst=True e intercambiaba día y mes si el día es <= 12 (2019-01-04 ->
+2019-04-01). Las fechas se comparan aparte (dd/mm/aaaa deben coincidir, las ISO
+que el ciclo volteaba sólo se cuentan) y ambos reciben FECHA ya leída.
+
+Uso: python benchmarks/paridad_flujo.py [--filas 50000]
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+from gspread.utils import numericise_all
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sintetico import movimientos  # noqa: E402
+from finanzas.almacen import ENCABEZADOS  # noqa: E402
+from finanzas.esquema import parsear_fechas  # noqa: E402
+from finanzas.motor import generar_flujo_real  # noqa: E402
+
+COLUMNAS = ['FECHA', 'DESCRIPCION', 'IMPORTE', 'IMPORTE_REAL', 'CATEGORIA', 'TIPO_FLUJO']
+
+
+def fila_a_fila(df_bruto):
+    """generar_flujo_real antes de vectorizarlo (sin cambios, salvo el nombre)"""
+    pagos_proyectados = []
+
+    # Garantizar columnas mínimas
+    for c in ['PLAZO_MESES', 'INTERES', 'DIA_CORTE']:
+        if c not in df_bruto.columns: df_bruto[c] = 0
+
+    for index, row in df_bruto.iterrows():
+        try:
+            if pd.isna(pd.to_datetime(row['FECHA'], errors='coerce')): continue
+
+            # Extracción segura de datos
+            fecha_compra = pd.to_datetime(row['FECHA'], dayfirst=True)
+            monto_original = abs(float(str(row['IMPORTE']).replace(',', '')))
+
+            try: plazo = int(float(str(row['PLAZO_MESES'])))
+            except: plazo = 1
+            if plazo < 1: plazo = 1
+
+            try: interes_pct = float(str(row['INTERES']).replace('%', ''))
+            except: interes_pct = 0.0
+
+            try: dia_corte = int(float(str(row['DIA_CORTE'])))
+            except: dia_corte = 0
+
+            # Lógica Financiera
+            monto_total = monto_original * (1 + (interes_pct / 100))
+            pago_mensual = monto_total / plazo
+
+            # Lógica de Corte de Tarjeta
+            fecha_inicio = fecha_compra
+            if dia_corte > 0 and fecha_compra.day > dia_corte:
+                fecha_inicio = fecha_compra + relativedelta(months=1)
+
+            # Generar flujo
+            for i in range(plazo):
+                fecha_pago = fecha_inicio + relativedelta(months=i)
+                desc_extra = f" ({i+1}/{plazo})" if plazo > 1 else ""
+
+                # Signo: Si es Gasto es negativo, si es Ingreso es positivo
+                es_gasto = 'GASTO' in str(row.get('TIPO', 'Gasto')).upper()
+                importe_real = -pago_mensual if es_gasto else pago_mensual
+
+                pagos_proyectados.append({
+                    'FECHA': fecha_pago,
+                    'DESCRIPCION': f"{row['DESCRIPCION']}{desc_extra}",
+                    'IMPORTE': pago_mensual,
+                    'IMPORTE_REAL': importe_real,
+                    'CATEGORIA': str(row['DESCRIPCION']).split()[0],
+                    'TIPO_FLUJO': 'Diferido' if plazo > 1 else 'Contado'
+                })
+        except: continue
+
+    return pd.DataFrame(pagos_proyectados)
+
+
+def ordenado(df):
+    df = df[COLUMNAS].copy()
+    df['FECHA'] = pd.to_datetime(df['FECHA']).astype('datetime64[ns]')
+    return df.sort_values(COLUMNAS, kind='stable', ignore_index=True)
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--filas", type=int, default=50_000)
+    args = p.parse_args()
+    warnings.simplefilter("ignore", UserWarning)  # dayfirst=True sobre fechas ISO
+
+    cols = ENCABEZADOS["Hoja 1"]
+    df = pd.DataFrame([dict(zip(cols, numericise_all(f))) for f in movimientos(args.filas)])
+
+    # Fechas: las dd/mm/aaaa deben coincidir; las ISO que el ciclo volteaba se cuentan
+    fechas = parsear_fechas(df['FECHA'])
+    antes = pd.Series([pd.to_datetime(f, dayfirst=True) for f in df['FECHA']], index=df.index)
+    iso = df['FECHA'].astype(str).str.match(r'\d{4}-')
+    assert (antes[~iso] == fechas[~iso]).all(), "fechas dd/mm/aaaa distintas"
+    print(f"fechas ISO que el ciclo leía con día y mes invertidos: {int((antes[iso] != fechas[iso]).sum()):,} de {int(iso.sum()):,}")
+    df['FECHA'] = fechas
+
+    t = time.perf_counter(); viejo = fila_a_fila(df.copy()); t_viejo = time.perf_counter() - t
+    t = time.perf_counter(); nuevo = generar_flujo_real(df.copy()); t_nuevo = time.perf_counter() - t
+    print(f"{args.filas:,} movimientos -> {len(viejo):,} pagos (fila a fila) / {len(nuevo):,} (vectorizado)")
+    print(f"fila a fila {t_viejo:8.2f} s · vectorizado {t_nuevo:8.3f} s · x{t_viejo / t_nuevo:,.0f}")
+
+    a, b = ordenado(viejo), ordenado(nuevo)
+    assert len(a) == len(b), "distinto número de pagos"
+    for c in COLUMNAS:
+        if c in ('IMPORTE', 'IMPORTE_REAL'): iguales = np.isclose(a[c], b[c], rtol=1e-12, atol=1e-9)
+        else: iguales = (a[c] == b[c]).to_numpy()
+        if not iguales.all():
+            i = int(np.argmin(iguales))
+            raise AssertionError(f"{c} difiere en {int((~iguales).sum())} filas, p. ej.:\n{a.iloc[i]}\n{b.iloc[i]}")
+    print("paridad OK")
@@ -0,0 +1,33 @@
+"""Reglas de categoría: gana la primera de la hoja, con palabras y regex mezcladas.
+
+Las regex sin grupos van juntas en una sola expresión; las que tienen grupos de
+captura o referencias (\\1) se prueban sueltas, porque la unión renumera los
+grupos y la referencia apuntaría a otro (antes la regla nunca coincidía).
+
+Uso: python benchmarks/prueba_categorias.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from finanzas.categorias import Categorizador  # noqa: E402
+
+
+def regla(patron, categoria, tipo="regex"):
+    return {"PATRON": patron, "CATEGORIA": categoria, "TIPO": tipo}
+
+
+if __name__ == "__main__":
+    c = Categorizador([regla("^zz", "Z"), regla(r"(\d)\1", "Repetido")])
+    assert c.categoria("compra 11 algo") == "Repetido", c.categoria("compra 11 algo")
+    assert c.categoria("zz 11") == "Z"
+    assert c.categoria("compra 12 algo") is None
+
+    c = Categorizador([regla("uber eats", "Comida", "palabra"), regla(r"(uber)\s+\1", "Doble"),
+                       regla("^uber", "Transporte"), regla(r"(?i)oxxo", "Tienda"), regla("oxxo", "Otra")])
+    assert c.categoria("Uber Eats CDMX") == "Comida"
+    assert c.categoria("uber uber") == "Doble"
+    assert c.categoria("uber viaje") == "Transporte"
+    assert c.categoria("OXXO centro") == "Tienda"
+    assert not c.errores
+    print("reglas de categoría OK")
@@ -0,0 +1,63 @@
+"""Importes con coma decimal y con punto decimal en estados de cuenta CSV.
+
+Un banco europeo / latino exporta con ";" y "1.234,50"; uno de EE. UU. con ","
+y "1,234.50". Los dos archivos deben dar los mismos importes, también cuando el
+primer trozo sólo trae enteros y la coma decimal aparece en uno posterior.
+Una importación de antes de detectar el separador leía "50,00" como 5000.
+
+Uso: python benchmarks/prueba_decimales.py
+"""
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from finanzas.importador import importar, leer_csv, separador_decimal  # noqa: E402
+
+ESPERADOS = [50.0, 1234.5, 7.0, 0.99, 12000.0]
+
+COMA = """Fecha;Concepto;Cargo;Abono
+01/03/2024;tacos;50,00;
+02/03/2024;pantalla;1.234,50;
+03/03/2024;reembolso;;7
+04/03/2024;chicle;0,99;
+05/03/2024;sueldo;;12.000,00
+"""
+PUNTO = """Date,Description,Amount
+2024-03-01,tacos,-50.00
+2024-03-02,pantalla,"-1,234.50"
+2024-03-03,reembolso,7
+2024-03-04,chicle,-0.99
+2024-03-05,sueldo,"12,000.00"
+"""
+# El primer trozo (tamano=2) no trae decimales: lo delata el punto de miles
+TARDIO = """Fecha;Concepto;Importe
+01/03/2024;a;-50
+02/03/2024;b;-1.234
+03/03/2024;c;7
+04/03/2024;d;-0,99
+05/03/2024;e;12.000,00
+"""
+
+
+class Destino:
+    def __init__(self):
+        self.filas = []
+
+    def anexar(self, hoja, filas):
+        self.filas.extend(filas)
+
+
+def importes(texto, tamano=5000):
+    destino = Destino()
+    importar(io.StringIO(texto), destino, banco="BBVA", tamano=tamano)
+    return [f[3] for f in destino.filas]
+
+
+if __name__ == "__main__":
+    assert separador_decimal(next(leer_csv(io.StringIO(COMA)))) == ","
+    assert separador_decimal(next(leer_csv(io.StringIO(PUNTO)))) == "."
+    assert importes(COMA) == ESPERADOS, importes(COMA)
+    assert importes(PUNTO) == ESPERADOS, importes(PUNTO)
+    assert importes(TARDIO, tamano=2) == [50.0, 1234.0, 7.0, 0.99, 12000.0], importes(TARDIO, tamano=2)
+    print("coma y punto decimal OK")
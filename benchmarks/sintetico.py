@@ -0,0 +1,88 @@
+"""Libro sintético ("Hoja 1", "Deudas", "Inversiones") con la mezcla de datos real.
+
+- Gastos hormiga por Telegram (montos chicos, efectivo / débito) como la mayoría
+- Compras con tarjeta: parte a MSI (3-18 meses), algunas con interés, y el
+  DIA_CORTE fijo de cada tarjeta
+- Sueldo quincenal, pagos de tarjeta, cobros y devoluciones ocasionales
+- ~5% de fechas dd/mm/aaaa y montos con separador de miles, como llegan de la hoja
+"""
+import numpy as np
+import pandas as pd
+
+from finanzas.almacen import ENCABEZADOS
+
+TARJETAS = {"BBVA": (15, 5, 60_000), "Nu": (28, 18, 25_000), "Amex": (3, 23, 90_000), "Santander": (20, 10, 40_000)}
+DEBITO = ["Efectivo", "BBVA Débito", "Nu Débito"]
+GASTOS = ["tacos", "cafe", "uber", "super mercado", "gasolina", "farmacia", "oxxo", "netflix", "renta", "luz", "internet", "cine"]
+COMPRAS = ["Liverpool pantalla", "Amazon audifonos", "Coppel refrigerador", "Palacio ropa", "Mercado Libre laptop", "vuelo CDMX"]
+
+
+def movimientos(n, semilla=0, desde="2019-01-01"):
+    """`n` filas de "Hoja 1" en el orden del encabezado (valores como texto de la hoja)"""
+    rng = np.random.default_rng(semilla)
+    # ~40 movimientos por día: a 1M filas son casi 70 años, a 1k menos de un mes
+    dias = np.sort(rng.integers(0, max(n // 40, 30), n))
+    fechas = pd.Timestamp(desde) + pd.to_timedelta(dias, unit="D")
+
+    clase = rng.choice(["hormiga", "tarjeta", "ingreso", "pago", "devolucion"], n, p=[0.62, 0.25, 0.07, 0.04, 0.02])
+    tarjeta = rng.choice(list(TARJETAS), n)
+    es_tarjeta = clase == "tarjeta"
+    msi = es_tarjeta & (rng.random(n) < 0.3)
+
+    importe = np.where(clase == "hormiga", rng.gamma(2.0, 60, n), rng.gamma(2.0, 1200, n))
+    importe = np.where(msi, rng.gamma(3.0, 4000, n), importe)
+    importe = np.where(clase == "ingreso", rng.choice([15_000, 18_500, 32_000], n), importe).round(2)
+
+    desc = np.where(clase == "hormiga", rng.choice(GASTOS, n), "")
+    desc = np.where(es_tarjeta, rng.choice(GASTOS + COMPRAS, n), desc)
+    desc = np.where(msi, rng.choice(COMPRAS, n), desc)
+    desc = np.where(clase == "ingreso", "Sueldo quincena", desc)
+    desc = np.where(clase == "pago", np.char.add("Pago ", tarjeta), desc)
+    desc = np.where(clase == "devolucion", np.char.add("Devolucion ", rng.choice(COMPRAS, n)), desc)
+
+    tipo = np.select([clase == "ingreso", clase == "pago", clase == "devolucion"], ["Ingreso", "Pago", "Devolucion"], "Gasto")
+    banco = np.where(es_tarjeta | (clase == "pago"), tarjeta, rng.choice(DEBITO, n))
+    plazo = np.where(msi, rng.choice([3, 6, 9, 12, 18], n), 1)
+    interes = np.where(msi & (rng.random(n) < 0.25), rng.choice([10, 15, 30], n), 0)
+    corte = np.where(es_tarjeta, [TARJETAS[t][0] for t in tarjeta], 0)
+    origen = np.where(clase == "hormiga", "Telegram", np.where(clase == "pago", "Auto", "Manual"))
+
+    fecha_txt = fechas.strftime("%Y-%m-%d").to_numpy(dtype=object)
+    raras = rng.random(n) < 0.05
+    fecha_txt[raras] = fechas[raras].strftime("%d/%m/%Y")
+    importe_txt = importe.astype(str).astype(object)
+    importe_txt[raras] = [f"{v:,.2f}" for v in importe[raras]]
+
+    columnas = [origen, fecha_txt, desc, importe_txt, np.full(n, "-"), np.full(n, "-"), tipo, banco,
+                plazo.astype(str), interes.astype(str), corte.astype(str)]
+    return [list(f) for f in zip(*(c.tolist() for c in columnas))]
+
+
+def deudas(n_mov, semilla=0):
+    """Una fila por tarjeta + préstamos y cuentas por cobrar (crece poco con el historial)"""
+    rng = np.random.default_rng(semilla + 1)
+    filas = [[t, "Tarjeta Crédito", 0, 1, c, p, 0, "Activo", 0, lim] for t, (c, p, lim) in TARJETAS.items()]
+    for i in range(max(2, min(n_mov // 2_000, 500))):
+        por_cobrar = i % 3 == 0
+        total = float(rng.choice([2_000, 8_000, 50_000, 180_000]))
+        plazo = int(rng.choice([3, 6, 12, 24, 48]))
+        filas.append([f"{'Amigo' if por_cobrar else 'Credito'} {i}", "Por Cobrar" if por_cobrar else "Préstamo Fijo", total, plazo,
+                      0, int(rng.integers(1, 29)), round(total * rng.uniform(0, 0.9), 2),
+                      "Activo" if rng.random() < 0.8 else "Pagado", int(rng.choice([0, 12, 24]))])
+    return filas
+
+
+def inversiones(n_mov, semilla=0):
+    rng = np.random.default_rng(semilla + 2)
+    k = max(3, n_mov // 1_000)
+    fechas = (pd.Timestamp("2019-01-01") + pd.to_timedelta(rng.integers(0, 2_000, k), unit="D")).strftime("%Y-%m-%d")
+    return [[f, str(rng.choice(["CETES", "GBM", "Nu Cajita", "Afore"])), float(rng.integers(1, 200) * 500)] for f in fechas]
+
+
+def libro_sintetico(n, semilla=0):
+    """{hoja: [encabezado, filas...]} listo para LibroFalso o AlmacenLocal"""
+    return {
+        "Hoja 1": [ENCABEZADOS["Hoja 1"]] + movimientos(n, semilla),
+        "Deudas": [ENCABEZADOS["Deudas"]] + deudas(n, semilla),
+        "Inversiones": [ENCABEZADOS["Inversiones"]] + inversiones(n, semilla),
+    }
@@ -0,0 +1,98 @@
+"""Bot API de Telegram en memoria sobre HTTP local (sólo getUpdates y sendMessage).
+
+getUpdates hace long-polling de verdad: la petición espera hasta que llega un
+mensaje o vence su `timeout`, y `offset` confirma (borra) lo anterior, igual que
+la API. `fallar(estado, descripcion, veces)` hace que las siguientes peticiones
+respondan ok:false con ese estado HTTP (409 por otro sondeo, 401, 502, ...).
+`llamadas` cuenta las peticiones por método.
+"""
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class TelegramFalso:
+    def __init__(self, token="falso"):
+        self.token = token
+        self.llamadas = Counter()
+        self.enviados = []  # (chat_id, texto) de sendMessage
+        self._updates = []
+        self._siguiente = 1
+        self._fallas = []  # (estado, descripcion) por consumir, una por petición
+        self._cond = threading.Condition()
+        servidor = self
+
+        class Manejador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                servidor._atender(self, {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()})
+
+            def do_POST(self):
+                largo = int(self.headers.get("Content-Length") or 0)
+                servidor._atender(self, json.loads(self.rfile.read(largo) or b"{}"))
+
+            def log_message(self, *args):
+                pass
+
+        self.http = ThreadingHTTPServer(("127.0.0.1", 0), Manejador)
+        self.http.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.http.server_address[1]}"
+
+    def iniciar(self):
+        threading.Thread(target=self.http.serve_forever, name="telegram-falso", daemon=True).start()
+        return self
+
+    def detener(self):
+        self.http.shutdown()
+        self.http.server_close()
+
+    # ---------- escenario ----------
+    def mensaje(self, chat_id, texto):
+        """Un mensaje entrante del chat; despierta a quien esté en long-polling"""
+        with self._cond:
+            self._updates.append({"update_id": self._siguiente,
+                                  "message": {"chat": {"id": chat_id}, "text": texto, "date": int(time.time())}})
+            self._siguiente += 1
+            self._cond.notify_all()
+
+    def fallar(self, estado, descripcion, veces=1):
+        with self._cond:
+            self._fallas.extend([(estado, descripcion)] * veces)
+
+    # ---------- API ----------
+    def _responder(self, manejador, estado, cuerpo):
+        datos = json.dumps(cuerpo).encode("utf-8")
+        manejador.send_response(estado)
+        manejador.send_header("Content-Type", "application/json")
+        manejador.send_header("Content-Length", str(len(datos)))
+        manejador.end_headers()
+        manejador.wfile.write(datos)
+
+    def _atender(self, manejador, params):
+        partes = urlparse(manejador.path).path.strip("/").split("/")
+        metodo = partes[-1]
+        self.llamadas[metodo] += 1
+        if len(partes) != 2 or partes[0] != f"bot{self.token}":
+            return self._responder(manejador, 401, {"ok": False, "error_code": 401, "description": "Unauthorized"})
+        with self._cond:
+            falla = self._fallas.pop(0) if self._fallas else None
+        if falla:
+            return self._responder(manejador, falla[0], {"ok": False, "error_code": falla[0], "description": falla[1]})
+
+        if metodo == "sendMessage":
+            self.enviados.append((params.get("chat_id"), params.get("text")))
+            return self._responder(manejador, 200, {"ok": True, "result": {}})
+        if metodo != "getUpdates":
+            return self._responder(manejador, 404, {"ok": False, "error_code": 404, "description": "Not Found"})
+
+        offset, espera = int(params.get("offset", 0)), float(params.get("timeout", 0))
+        limite = time.time() + espera
+        with self._cond:
+            # offset confirma todo lo anterior
+            self._updates = [u for u in self._updates if u["update_id"] >= offset]
+            while not self._updates and time.time() < limite:
+                self._cond.wait(limite - time.time())
+            res = list(self._updates)
+        self._responder(manejador, 200, {"ok": True, "result": res})
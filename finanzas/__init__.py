@@ -0,0 +1 @@
+"""Núcleo de cálculo de Control Total (sin dependencias de Streamlit)."""
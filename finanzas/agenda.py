@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+from finanzas.motor import sumar_meses
+
+# ================= AGENDA: RECURRENCIAS A VARIOS MESES =================
+# Todas las fechas de pago (DIA_PAGO), corte (DIA_CORTE) y mensualidades MSI de
+# las deudas activas entre `hoy` y `hoy + meses`, en una sola pasada: una matriz
+# cuenta × mes con numpy (datetime64) en lugar de un ciclo por deuda y por mes.
+#   - Pagar / Cobrar: tarjetas, el primer pago es la deuda actual menos las
+#     mensualidades MSI posteriores a él (la compra diferida ya está completa en la
+#     deuda) y los siguientes las mensualidades MSI que caen en ese ciclo; préstamos
+#     y cuentas por cobrar,
+#     la cuota (MONTO_TOTAL / PLAZO_MESES) hasta cubrir lo que resta
+#   - Corte: sólo tarjetas, sin monto
+#   - Mensualidad: cada pago diferido del flujo proyectado (detalle, no se suma
+#     a Pagar para no contarlo dos veces)
+COLUMNAS = ["FECHA", "EVENTO", "TIPO", "CUENTA", "MONTO", "DIAS"]
+PAGOS = ("Pagar", "Cobrar")
+MESES = 12
+
+
+def ocurrencias(dias, hoy, meses):
+    """(fila, fecha, número de ocurrencia) de cada día del mes `dias[i]` en [hoy, hoy + meses).
+    El día se recorta al fin de mes como en finanzas.alertas.fecha_en_mes; 0 no genera fechas."""
+    dias = np.clip(np.nan_to_num(np.asarray(dias, dtype=float)), 0, 31).astype(np.int64)
+    hoy = np.datetime64(hoy, "D")
+    mes = hoy.astype("datetime64[M]") + np.arange(meses + 1)
+    inicio = mes.astype("datetime64[D]")
+    largo = ((mes + 1).astype("datetime64[D]") - inicio).astype(np.int64)
+    fechas = inicio[None, :] + (np.minimum(dias[:, None], largo[None, :]) - 1)
+    fin = sumar_meses(np.array([hoy]), meses)[0].astype("datetime64[D]")
+    validas = (fechas >= hoy) & (fechas < fin) & (dias[:, None] > 0)
+    fila, col = np.nonzero(validas)
+    numero = np.cumsum(validas, axis=1)[fila, col] - 1
+    return fila, fechas[fila, col], numero
+
+
+def _vacia():
+    return pd.DataFrame({c: pd.Series(dtype="datetime64[ns]" if c == "FECHA" else object) for c in COLUMNAS})
+
+
+def _mensualidades(df_flujo, hoy, meses=None):
+    """Pagos diferidos (gastos) del flujo proyectado dentro del horizonte (sin límite si `meses` es None)"""
+    if df_flujo is None or df_flujo.empty: return pd.DataFrame(columns=["FECHA", "EVENTO", "CUENTA", "MONTO"])
+    hoy = pd.Timestamp(hoy)
+    dif = df_flujo[(df_flujo["TIPO_FLUJO"] == "Diferido") & (df_flujo["IMPORTE_REAL"] < 0) & (df_flujo["FECHA"] >= hoy)]
+    if meses is not None: dif = dif[dif["FECHA"] < hoy + pd.DateOffset(months=meses)]
+    return pd.DataFrame({"FECHA": dif["FECHA"].dt.normalize().astype("datetime64[ns]"), "EVENTO": dif["DESCRIPCION"].astype(str),
+                         "CUENTA": dif["BANCO"].astype(str), "MONTO": dif["IMPORTE"].astype(float)})
+
+
+def generar(df_deudas, df_cuentas, df_flujo, hoy, meses=MESES):
+    """DataFrame COLUMNAS ordenado por fecha con todos los eventos del horizonte"""
+    if df_deudas is None or df_deudas.empty or "ESTADO" not in df_deudas.columns: activas = pd.DataFrame()
+    else: activas = df_deudas[df_deudas["ESTADO"] == "Activo"]
+    partes = []
+    msi = _mensualidades(df_flujo, hoy, meses)
+
+    if not activas.empty:
+        nombre = activas["NOMBRE"].astype(str).to_numpy()
+        tipo = activas["TIPO"].astype(str)
+        tarjeta = tipo.str.contains("Tarjeta", regex=False).to_numpy()
+        cobrar = tipo.str.contains("Por Cobrar", regex=False).to_numpy()
+        total = activas["MONTO_TOTAL"].to_numpy(dtype=float)
+        restante = total - activas["ABONADO"].to_numpy(dtype=float)
+        cuota = np.minimum(total / np.maximum(activas["PLAZO_MESES"].to_numpy(dtype=float), 1), restante)
+        deuda = pd.Series(nombre).map(df_cuentas["DEUDA"] if "DEUDA" in df_cuentas.columns else {}).fillna(0).to_numpy(dtype=float)
+
+        # Pagos / cobros
+        fila, fecha, numero = ocurrencias(activas["DIA_PAGO"].to_numpy(dtype=float), hoy, meses)
+        pagos = pd.DataFrame({
+            "FECHA": fecha.astype("datetime64[ns]"), "CUENTA": nombre[fila],
+            "TIPO": np.where(cobrar[fila], "Cobrar", "Pagar").astype(object),
+            # Préstamos: la cuota mientras alcance lo que resta; la última, el remanente
+            "MONTO": np.where(tarjeta[fila], np.where(numero == 0, deuda[fila], 0.0),
+                              np.minimum(cuota[fila], restante[fila] - numero * cuota[fila])),
+        })
+        # Tarjetas: las mensualidades MSI posteriores al primer pago (aun fuera del
+        # horizonte) se descuentan de la deuda; van en los pagos de su ciclo
+        primeros = pagos[tarjeta[fila] & (numero == 0)].drop_duplicates("CUENTA")
+        futuras = _mensualidades(df_flujo, hoy)
+        if not primeros.empty and not futuras.empty:
+            primer_pago = futuras["CUENTA"].map(pd.Series(primeros["FECHA"].to_numpy(), index=primeros["CUENTA"]))
+            por_cuenta = futuras[futuras["FECHA"] > primer_pago].groupby("CUENTA")["MONTO"].sum()
+            pagos.loc[primeros.index, "MONTO"] = (primeros["MONTO"] - primeros["CUENTA"].map(por_cuenta).fillna(0)).clip(lower=0)
+        # Cada mensualidad MSI se suma al primer pago de la tarjeta en o después de su fecha
+        siguientes = pagos[tarjeta[fila] & (numero > 0)].sort_values("FECHA")
+        if not msi.empty and not siguientes.empty:
+            asignadas = pd.merge_asof(msi.sort_values("FECHA").rename(columns={"FECHA": "MSI"}),
+                                      siguientes[["FECHA", "CUENTA"]].assign(PAGO=siguientes["FECHA"]),
+                                      left_on="MSI", right_on="FECHA", by="CUENTA", direction="forward")
+            por_pago = asignadas.dropna(subset=["PAGO"]).groupby(["CUENTA", "PAGO"])["MONTO"].sum()
+            clave = pd.MultiIndex.from_arrays([pagos["CUENTA"], pagos["FECHA"]])
+            pagos["MONTO"] += por_pago.reindex(clave).fillna(0).to_numpy()
+        pagos = pagos[pagos["MONTO"] > 1]
+        pagos["EVENTO"] = pagos["TIPO"] + " " + pagos["CUENTA"]
+        partes.append(pagos)
+
+        # Cortes (sólo tarjetas)
+        fila, fecha, _ = ocurrencias(np.where(tarjeta, activas["DIA_CORTE"].to_numpy(dtype=float), 0), hoy, meses)
+        partes.append(pd.DataFrame({"FECHA": fecha.astype("datetime64[ns]"), "EVENTO": "Corte " + pd.Series(nombre[fila], dtype=object),
+                                    "TIPO": "Corte", "CUENTA": nombre[fila], "MONTO": np.nan}))
+
+    if not msi.empty: partes.append(msi.assign(TIPO="Mensualidad"))
+    partes = [p for p in partes if not p.empty]
+    if not partes: return _vacia()
+    res = pd.concat(partes, ignore_index=True)
+    res["DIAS"] = (res["FECHA"] - pd.Timestamp(hoy)).dt.days
+    return res.sort_values(["FECHA", "TIPO"], kind="stable", ignore_index=True)[COLUMNAS]
+
+
+def alertas(agenda, dias=5):
+    """Avisos de pagos / cobros que vencen en los próximos `dias`"""
+    prox = agenda[agenda["TIPO"].isin(PAGOS) & (agenda["DIAS"] >= 0) & (agenda["DIAS"] <= dias)]
+    return [f"⚠️ {t} **{c}** (${m:,.2f}) vence el {f.strftime('%d/%m')}"
+            for t, c, m, f in zip(prox["TIPO"], prox["CUENTA"], prox["MONTO"], prox["FECHA"])]
+
+
+def matriz(agenda):
+    """Cuenta × mes con el neto de pagos (negativo) y cobros (positivo), para el mapa de calor"""
+    pagos = agenda[agenda["TIPO"].isin(PAGOS)]
+    if pagos.empty: return pd.DataFrame()
+    neto = pagos["MONTO"].where(pagos["TIPO"] == "Cobrar", -pagos["MONTO"])
+    return neto.groupby([pagos["CUENTA"], pagos["FECHA"].dt.strftime("%Y-%m").rename("MES")]).sum().unstack(fill_value=0)
@@ -0,0 +1,112 @@
+import calendar
+import heapq
+import itertools
+import json
+import os
+import threading
+from datetime import date, timedelta
+
+# ================= FECHAS =================
+def fecha_en_mes(anio, mes, dia):
+    """Día `dia` del mes, recortado al último día si el mes es más corto"""
+    _, ultimo = calendar.monthrange(anio, mes)
+    return date(anio, mes, min(int(dia), ultimo))
+
+
+def proxima_fecha(dia_objetivo, hoy):
+    """Próxima fecha (>= hoy) con ese día del mes, ajustando meses y años"""
+    if not dia_objetivo or dia_objetivo == 0: return None
+    try: fecha = fecha_en_mes(hoy.year, hoy.month, dia_objetivo)
+    except: return hoy
+    if fecha < hoy:
+        return siguiente_fecha(dia_objetivo, fecha)
+    return fecha
+
+
+def siguiente_fecha(dia_objetivo, fecha):
+    """La misma fecha de corte/pago en el mes siguiente a `fecha`"""
+    anio, mes = (fecha.year + 1, 1) if fecha.month == 12 else (fecha.year, fecha.month + 1)
+    return fecha_en_mes(anio, mes, dia_objetivo)
+
+
+# ================= PROGRAMADOR DE ALERTAS =================
+RUTA_ENVIADAS = os.path.join(".cache", "alertas_enviadas.json")
+
+
+def _entero(v):
+    try: return int(float(v))
+    except: return 0
+
+
+class ProgramadorAlertas:
+    """Índice de próximos pagos/cortes en un heap ordenado por apertura de aviso
+
+    Se reconstruye sólo cuando cambia la versión de los datos. Cada `pendientes`
+    saca del heap lo que ya abrió ventana (O(log n) por evento), reprograma la
+    siguiente ocurrencia y descarta lo que ya se envió antes.
+    """
+
+    def __init__(self, dias_aviso=3, ruta=RUTA_ENVIADAS):
+        self.dias_aviso = dias_aviso
+        self.ruta = ruta
+        self.version = None
+        self._heap = []
+        self._turno = itertools.count()  # desempate estable dentro del heap
+        self._lock = threading.Lock()
+        self.enviadas = {}
+        if ruta and os.path.exists(ruta):
+            try:
+                with open(ruta, encoding="utf-8") as f: self.enviadas = json.load(f)
+            except Exception: pass
+
+    def _programar(self, fecha, tipo, nombre, dia):
+        heapq.heappush(self._heap, (fecha - timedelta(days=self.dias_aviso), next(self._turno), fecha, tipo, nombre, dia))
+
+    def actualizar(self, df_deudas, version, hoy):
+        """Reconstruye el índice si `version` cambió"""
+        with self._lock:
+            if version == self.version: return
+            self.version, self._heap = version, []
+            if df_deudas.empty: return
+            activos = df_deudas[df_deudas['ESTADO'] == 'Activo']
+            ceros = [0] * len(activos)
+            for nombre, tipo, dia_pago, dia_corte in zip(
+                activos['NOMBRE'], activos['TIPO'].astype(str),
+                activos['DIA_PAGO'] if 'DIA_PAGO' in activos else ceros,
+                activos['DIA_CORTE'] if 'DIA_CORTE' in activos else ceros,
+            ):
+                # A) Fecha de Pago
+                dia_pago = _entero(dia_pago)
+                if dia_pago > 0: self._programar(proxima_fecha(dia_pago, hoy), "pago", nombre, dia_pago)
+                # B) Corte (Solo Tarjetas)
+                dia_corte = _entero(dia_corte)
+                if dia_corte > 0 and "Tarjeta" in tipo: self._programar(proxima_fecha(dia_corte, hoy), "corte", nombre, dia_corte)
+
+    def pendientes(self, hoy):
+        """Mensajes cuya ventana de aviso ya abrió y que no se han enviado"""
+        mensajes = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= hoy:
+                _, _, fecha, tipo, nombre, dia = heapq.heappop(self._heap)
+                self._programar(siguiente_fecha(dia, fecha), tipo, nombre, dia)
+                clave = f"{tipo}:{nombre}:{fecha.isoformat()}"
+                if fecha < hoy or clave in self.enviadas: continue
+                dias_rest = (fecha - hoy).days
+                if tipo == "pago":
+                    mensajes.append(f"🔔 AVISO DE PAGO: '{nombre}' vence en {dias_rest} días ({fecha.strftime('%d/%m')}).")
+                else:
+                    mensajes.append(f"✂️ AVISO DE CORTE: Tarjeta '{nombre}' corta en {dias_rest} días.")
+                self.enviadas[clave] = fecha.isoformat()
+            if mensajes: self._persistir(hoy)
+        return mensajes
+
+    def _persistir(self, hoy):
+        # Sólo hace falta recordar avisos de fechas recientes
+        limite = (hoy - timedelta(days=40)).isoformat()
+        self.enviadas = {k: f for k, f in self.enviadas.items() if f >= limite}
+        if not self.ruta: return
+        carpeta = os.path.dirname(self.ruta)
+        if carpeta: os.makedirs(carpeta, exist_ok=True)
+        tmp = self.ruta + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f: json.dump(self.enviadas, f)
+        os.replace(tmp, self.ruta)
@@ -0,0 +1,240 @@
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+from finanzas.cuentas import resumen_cuentas, sumar_movimientos
+from finanzas.metricas import metricas
+
+# ================= ALMACENAMIENTO =================
+# Interfaz común para movimientos ("Hoja 1"), deudas e inversiones:
+#   leer(hoja)                          -> lista de dicts (como get_all_records)
+#   leer_todo(hojas)                    -> {hoja: lista de dicts}
+#   anexar(hoja, filas)                 -> agrega filas (listas en el orden del encabezado)
+#   buscar(hoja, texto)                 -> número de fila (1 = encabezado) o None
+#   actualizar_celda(hoja, fila, col, valor)
+#   actualizar_celdas(hoja, [(fila, col, valor), ...])
+#   resumen_cuentas()                   -> índice por BANCO (ver finanzas.cuentas)
+#   leer_con_indice(hojas)              -> ({hoja: lista de dicts}, índice de "Hoja 1") de una misma lectura
+# gspread sólo se importa al crear un AlmacenSheets (el motor local no lo necesita).
+HOJAS = ["Hoja 1", "Deudas", "Inversiones"]
+# Hojas que un libro anterior puede no tener. En Sheets, además, cualquier hoja salvo
+# "Hoja 1" puede faltar: se lee vacía y se crea al primer anexar
+OPCIONALES = ["Categorias"]
+
+# Encabezados por defecto para una base local nueva (mismo orden que escribe la app)
+ENCABEZADOS = {
+    "Hoja 1": ["ORIGEN", "FECHA", "DESCRIPCION", "IMPORTE", "NOTA", "REFERENCIA", "TIPO", "BANCO", "PLAZO_MESES", "INTERES", "DIA_CORTE"],
+    "Deudas": ["NOMBRE", "TIPO", "MONTO_TOTAL", "PLAZO_MESES", "DIA_CORTE", "DIA_PAGO", "ABONADO", "ESTADO", "INTERES_ORIGINAL", "LIMITE_CREDITO"],
+    "Inversiones": ["FECHA", "NOMBRE", "MONTO_INICIAL"],
+    "Categorias": ["PATRON", "CATEGORIA", "TIPO"],
+}
+
+
+# ---------- Google Sheets ----------
+class AlmacenSheets:
+    """Backend actual: Google Sheets vía gspread, con snapshot local para lecturas"""
+
+    def __init__(self, cliente, snapshot=None):
+        from finanzas.cliente_sheets import ClienteSheets
+        from finanzas.snapshot import SnapshotLocal
+        # Acepta el Spreadsheet de gspread directamente o un ClienteSheets ya compartido
+        self.cliente = cliente if isinstance(cliente, ClienteSheets) else ClienteSheets(cliente)
+        self.snapshot = snapshot or SnapshotLocal()
+        self.ultimo_error = None
+        self._indice = (0, None, None)  # (filas sumadas, última fila sumada, índice)
+
+    def hoja(self, nombre):
+        return self.cliente.hoja(nombre)
+
+    def leer(self, hoja):
+        return self.leer_todo([hoja])[hoja]
+
+    def leer_todo(self, hojas):
+        """Sincroniza todas las hojas en un solo values_batch_get (dos si hubo ediciones).
+        Si la API falla se sirve la última copia local. Una hoja que el libro no
+        tiene (salvo "Hoja 1") se devuelve vacía en vez de tumbar todo el lote."""
+        presentes = list(hojas)
+        try:
+            existentes = self.cliente.hojas()
+            presentes = [h for h in hojas if h == "Hoja 1" or h in existentes]
+            self.snapshot.sincronizar_lote(presentes, self.cliente.leer_rangos)
+            self.ultimo_error = None
+        except Exception as e:
+            metricas.contar("sheets.error")
+            self.ultimo_error = str(e)
+        return {h: self.snapshot.registros(h) if h in presentes else [] for h in hojas}
+
+    def encabezado(self, hoja):
+        return self.hoja(hoja).row_values(1)
+
+    def anexar(self, hoja, filas):
+        if hoja != "Hoja 1" and hoja not in self.cliente.hojas():
+            self.cliente.crear_hoja(hoja, ENCABEZADOS[hoja])
+        self.hoja(hoja).append_rows([list(f) for f in filas])
+
+    def buscar(self, hoja, texto):
+        cell = self.hoja(hoja).find(str(texto))
+        return cell.row if cell else None
+
+    def actualizar_celda(self, hoja, fila, col, valor):
+        self.hoja(hoja).update_cell(fila, col, valor)
+
+    def actualizar_celdas(self, hoja, celdas):
+        from gspread.utils import rowcol_to_a1
+        datos = [{"range": rowcol_to_a1(fila, col), "values": [[valor]]} for fila, col, valor in celdas]
+        if datos: self.hoja(hoja).batch_update(datos, raw=False)
+
+    def resumen_cuentas(self, registros=None):
+        """Sobre la última sincronización (no vuelve a llamar a la API) o sobre los
+        `registros` de "Hoja 1" ya leídos. Si la última fila sumada sigue siendo el
+        mismo dict (el snapshot sólo anexó) se suman sólo las filas nuevas."""
+        if registros is None: registros = self.snapshot.registros("Hoja 1")
+        n, ultima, indice = self._indice
+        if 0 < n <= len(registros) and registros[n - 1] is ultima:
+            indice = sumar_movimientos(indice, pd.DataFrame(registros[n:]))
+        else:
+            indice = resumen_cuentas(pd.DataFrame(registros))
+        self._indice = (len(registros), registros[-1] if registros else None, indice)
+        return indice
+
+    def leer_con_indice(self, hojas):
+        registros = self.leer_todo(hojas)
+        return registros, self.resumen_cuentas(registros.get("Hoja 1", []))
+
+
+# ---------- SQLite local ----------
+TABLAS = {"Hoja 1": "movimientos", "Deudas": "deudas", "Inversiones": "inversiones", "Categorias": "categorias"}
+INDICES = {"movimientos": ["FECHA", "BANCO"], "deudas": ["NOMBRE"]}
+
+
+def _col(nombre):
+    return '"' + str(nombre).replace('"', '""') + '"'
+
+
+def _valor(v):
+    """Las celdas de texto numéricas se devuelven como números (igual que numericise de gspread)"""
+    if not isinstance(v, str) or "_" in v: return v
+    limpio = v.replace(",", "")
+    try: return int(limpio)
+    except ValueError: pass
+    try: return float(limpio)
+    except ValueError: return v
+
+
+class AlmacenLocal:
+    """Motor embebido en SQLite con espejo opcional hacia Google Sheets.
+    Las escrituras al espejo van por su propia ColaEscritura (`cola_espejo`): se
+    reintentan si Sheets falla y lo que rechaza queda a la vista en la barra lateral."""
+
+    def __init__(self, ruta=os.path.join(".cache", "finanzas.sqlite"), espejo=None, ruta_cola_espejo=None):
+        carpeta = os.path.dirname(ruta)
+        if carpeta: os.makedirs(carpeta, exist_ok=True)
+        self.con = sqlite3.connect(ruta, check_same_thread=False)
+        # La conexión se comparte con el hilo de la cola: escrituras y lecturas
+        # que deben ser consistentes entre sí la toman con este candado
+        self._lock = threading.RLock()
+        self.espejo = espejo
+        self.cola_espejo = None
+        if espejo is not None:
+            from finanzas.cola import ColaEscritura
+            self.cola_espejo = ColaEscritura(espejo, ruta_cola_espejo or os.path.splitext(ruta)[0] + "_espejo.json")
+        self.con.execute("CREATE TABLE IF NOT EXISTS encabezados (hoja TEXT PRIMARY KEY, columnas TEXT NOT NULL)")
+        self._encabezados = {h: c.split("\x1f") for h, c in self.con.execute("SELECT hoja, columnas FROM encabezados")}
+        for hoja in HOJAS + OPCIONALES:
+            if hoja not in self._encabezados:
+                cols, filas = ENCABEZADOS[hoja], []
+                if espejo is not None:
+                    try:
+                        cols = espejo.encabezado(hoja) or cols
+                        filas = [[r.get(c, "") for c in cols] for r in espejo.leer(hoja)]
+                    except Exception:
+                        if hoja == "Hoja 1": raise
+                self._crear(hoja, cols)
+                self._insertar(hoja, filas)
+
+    def _crear(self, hoja, columnas):
+        tabla = TABLAS[hoja]
+        with self.con:
+            # Columnas sin tipo declarado: SQLite guarda números como números y texto como texto
+            self.con.execute(f"CREATE TABLE IF NOT EXISTS {tabla} (_fila INTEGER PRIMARY KEY, {', '.join(_col(c) for c in columnas)})")
+            for c in INDICES.get(tabla, []):
+                if c in columnas:
+                    self.con.execute(f"CREATE INDEX IF NOT EXISTS idx_{tabla}_{c.lower()} ON {tabla} ({_col(c)})")
+            self.con.execute("INSERT OR REPLACE INTO encabezados VALUES (?, ?)", (hoja, "\x1f".join(columnas)))
+        self._encabezados[hoja] = list(columnas)
+
+    def _insertar(self, hoja, filas):
+        cols = self._encabezados[hoja]
+        filas = [(list(f) + [""] * len(cols))[:len(cols)] for f in filas]
+        if not filas: return
+        with self._lock, self.con:
+            # _fila reproduce el número de fila de la hoja (la 1 es el encabezado)
+            siguiente = self.con.execute(f"SELECT COALESCE(MAX(_fila), 1) + 1 FROM {TABLAS[hoja]}").fetchone()[0]
+            self.con.executemany(
+                f"INSERT INTO {TABLAS[hoja]} (_fila, {', '.join(_col(c) for c in cols)}) VALUES ({', '.join('?' * (len(cols) + 1))})",
+                [[siguiente + i] + f for i, f in enumerate(filas)],
+            )
+
+    def encabezado(self, hoja):
+        return list(self._encabezados[hoja])
+
+    def leer(self, hoja):
+        cols = self._encabezados[hoja]
+        cur = self.con.execute(f"SELECT {', '.join(_col(c) for c in cols)} FROM {TABLAS[hoja]} ORDER BY _fila")
+        return [dict(zip(cols, map(_valor, f))) for f in cur]
+
+    def leer_todo(self, hojas):
+        return {h: self.leer(h) for h in hojas}
+
+    def anexar(self, hoja, filas):
+        # Texto numérico se guarda como número, igual que lo leería gspread
+        filas = [[_valor(v) for v in f] for f in filas]
+        self._insertar(hoja, filas)
+        if self.cola_espejo is not None: self.cola_espejo.anexar(hoja, filas)
+
+    def buscar(self, hoja, texto):
+        cols = self._encabezados[hoja]
+        cond = " OR ".join(f"CAST({_col(c)} AS TEXT) = ?" for c in cols)
+        r = self.con.execute(f"SELECT _fila FROM {TABLAS[hoja]} WHERE {cond} ORDER BY _fila LIMIT 1", [str(texto)] * len(cols)).fetchone()
+        return r[0] if r else None
+
+    def actualizar_celda(self, hoja, fila, col, valor):
+        self.actualizar_celdas(hoja, [(fila, col, valor)])
+
+    def actualizar_celdas(self, hoja, celdas):
+        cols = self._encabezados[hoja]
+        celdas = [(f, c, v) for f, c, v in celdas if 1 <= c <= len(cols)]
+        with self._lock, self.con:
+            for fila, col, valor in celdas:
+                self.con.execute(f"UPDATE {TABLAS[hoja]} SET {_col(cols[col - 1])} = ? WHERE _fila = ?", (valor, fila))
+        if self.cola_espejo is not None: self.cola_espejo.actualizar_celdas(hoja, celdas)
+
+    def leer_con_indice(self, hojas):
+        """Hojas e índice en una sola transacción: una fila que la cola guarde entre
+        las dos lecturas no queda en el índice sin estar en "Hoja 1" (la cola la
+        volvería a sumar encima)"""
+        with self._lock, self.con:
+            self.con.execute("BEGIN")
+            return self.leer_todo(hojas), self.resumen_cuentas()
+
+    def resumen_cuentas(self):
+        # Las fechas dd/mm/aaaa se llevan a ISO para que MAX() ordene bien
+        sql = """
+            SELECT CAST(BANCO AS TEXT) AS BANCO,
+                   SUM(CASE WHEN es_gasto THEN -imp ELSE imp END) AS SALDO,
+                   SUM(CASE WHEN es_gasto THEN imp ELSE 0 END) AS CARGOS,
+                   SUM(CASE WHEN es_gasto THEN 0 ELSE imp END) AS ABONOS,
+                   COUNT(*) AS MOVIMIENTOS,
+                   MAX(CASE WHEN FECHA LIKE '__/__/____' THEN substr(FECHA, 7, 4) || '-' || substr(FECHA, 4, 2) || '-' || substr(FECHA, 1, 2)
+                            ELSE substr(CAST(FECHA AS TEXT), 1, 10) END) AS ULTIMO_MOV
+            FROM (SELECT BANCO, FECHA,
+                         UPPER(CAST(TIPO AS TEXT)) LIKE '%GASTO%' AS es_gasto,
+                         CASE WHEN typeof(IMPORTE) IN ('integer', 'real') THEN ABS(IMPORTE) ELSE 0 END AS imp
+                  FROM movimientos)
+            GROUP BY CAST(BANCO AS TEXT)
+        """
+        df = pd.read_sql_query(sql, self.con, index_col='BANCO')
+        df['ULTIMO_MOV'] = pd.to_datetime(df['ULTIMO_MOV'], errors='coerce', format='%Y-%m-%d')
+        return df
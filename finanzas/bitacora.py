@@ -0,0 +1,138 @@
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+# ================= ÍNDICE DE LA BITÁCORA =================
+# Movimientos ordenados una sola vez por (FECHA, posición) descendente. Cada
+# filtro se resuelve sobre arreglos de "rangos" (posición dentro de ese orden):
+#   - fechas: intervalo contiguo con searchsorted
+#   - BANCO / TIPO / palabras de DESCRIPCION: listas invertidas ya ordenadas
+# La paginación es por llave (keyset): el cursor es la (FECHA, posición) de la
+# última fila mostrada, así que una página cuesta lo mismo sin importar cuánta
+# historia haya detrás.
+_NO_ALFANUM = re.compile(r"[^a-z0-9ñ]+")
+
+
+def normalizar(texto):
+    """minúsculas y sin acentos (conserva la ñ)"""
+    texto = str(texto).lower().replace("ñ", "\0")
+    texto = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+    return texto.replace("\0", "ñ")
+
+
+def palabras(texto):
+    return [p for p in _NO_ALFANUM.split(normalizar(texto)) if p]
+
+
+def _invertido(claves, rangos):
+    """{clave: rangos ordenados} a partir de dos arreglos paralelos"""
+    if len(claves) == 0: return {}
+    orden = np.lexsort((rangos, claves))
+    claves, rangos = claves[orden], rangos[orden]
+    cortes = np.flatnonzero(claves[1:] != claves[:-1]) + 1
+    inicios = np.r_[0, cortes]
+    return {claves[i]: r for i, r in zip(inicios, np.split(rangos, cortes))}
+
+
+class IndiceBitacora:
+    def __init__(self, df_movs):
+        self.df = df_movs
+        n = len(df_movs)
+        fechas = df_movs['FECHA'].to_numpy(dtype='datetime64[ns]') if n else np.array([], dtype='datetime64[ns]')
+        # Llave negada para ordenar ascendente; NaT queda al final, como en sort_values
+        neg = np.where(np.isnat(fechas), np.iinfo(np.int64).max, -fechas.astype(np.int64))
+        pos = np.arange(n)
+        self.orden = np.lexsort((-pos, neg)) if n else pos
+        self._neg_fecha = neg[self.orden]
+        self._neg_pos = -self.orden
+        self.importe = df_movs['IMPORTE'].to_numpy(dtype=float)[self.orden] if n else np.array([])
+
+        rangos = np.arange(n)
+        self.por_banco = _invertido(df_movs['BANCO'].astype(str).to_numpy()[self.orden], rangos) if n else {}
+        self.por_tipo = _invertido(df_movs['TIPO'].astype(str).to_numpy()[self.orden], rangos) if n else {}
+
+        # Palabras: se tokeniza cada descripción distinta una sola vez
+        self.por_palabra = {}
+        if n:
+            codigos, unicas = pd.factorize(df_movs['DESCRIPCION'].astype(str).to_numpy()[self.orden])
+            pares = pd.Series([palabras(u) for u in unicas]).explode().dropna()
+            if not pares.empty:
+                filas = pd.DataFrame({'cod': codigos, 'rango': rangos})
+                tokens = pd.DataFrame({'cod': pares.index.to_numpy(), 'tok': pares.to_numpy()}).drop_duplicates()
+                unidos = filas.merge(tokens, on='cod')
+                self.por_palabra = _invertido(unidos['tok'].to_numpy(dtype=object), unidos['rango'].to_numpy())
+        self.vocabulario = np.array(sorted(self.por_palabra), dtype=object)
+
+    def __len__(self):
+        return len(self.orden)
+
+    # ---------- piezas de la consulta ----------
+    def _rango_fechas(self, desde, hasta):
+        lo, hi = 0, len(self)
+        if hasta is not None:
+            lo = np.searchsorted(self._neg_fecha, -(pd.Timestamp(hasta) + pd.Timedelta(days=1)).value, side='right')
+        if desde is not None:
+            hi = np.searchsorted(self._neg_fecha, -pd.Timestamp(desde).value, side='right')
+        return lo, hi
+
+    def _despues_de(self, cursor):
+        """Primer rango estrictamente después del cursor (-fecha_ns, posición)"""
+        neg_fecha, pos = cursor
+        a = np.searchsorted(self._neg_fecha, neg_fecha, side='left')
+        b = np.searchsorted(self._neg_fecha, neg_fecha, side='right')
+        return a + np.searchsorted(self._neg_pos[a:b], -pos, side='right')
+
+    def _buscar_palabra(self, prefijo):
+        """Rangos con alguna palabra que empiece con `prefijo`"""
+        i = np.searchsorted(self.vocabulario, prefijo, side='left')
+        j = np.searchsorted(self.vocabulario, prefijo + "\uffff", side='left')
+        if j - i == 1: return self.por_palabra[self.vocabulario[i]]
+        return self._unir([self.por_palabra[t] for t in self.vocabulario[i:j]])
+
+    def _unir(self, partes):
+        """Unión de listas de rangos ordenadas (marcando una máscara, sin re-ordenar)"""
+        if not partes: return np.array([], dtype=np.int64)
+        if len(partes) == 1: return partes[0]
+        marca = np.zeros(len(self), dtype=bool)
+        for p in partes: marca[p] = True
+        return np.flatnonzero(marca)
+
+    def _union(self, indice, claves):
+        return self._unir([indice[str(c)] for c in claves if str(c) in indice])
+
+    # ---------- consulta ----------
+    def consultar(self, desde=None, hasta=None, cuentas=None, tipos=None, texto=None,
+                  monto_min=None, monto_max=None, cursor=None, limite=50):
+        """Página de movimientos (más recientes primero) y el cursor de la siguiente"""
+        lo, hi = self._rango_fechas(desde, hasta)
+        if cursor is not None: lo = max(lo, self._despues_de(cursor))
+
+        candidatos = None
+        conjuntos = []
+        if cuentas: conjuntos.append(self._union(self.por_banco, cuentas))
+        if tipos: conjuntos.append(self._union(self.por_tipo, tipos))
+        for p in palabras(texto or ""): conjuntos.append(self._buscar_palabra(p))
+        for c in sorted(conjuntos, key=len):
+            candidatos = c if candidatos is None else np.intersect1d(candidatos, c, assume_unique=True)
+
+        filtra_monto = monto_min is not None or monto_max is not None
+        if candidatos is None:
+            # Sin filtros de conjunto basta con recorrer el intervalo desde `lo`
+            seleccion = np.arange(lo, hi if filtra_monto else min(hi, lo + limite + 1))
+        else:
+            seleccion = candidatos[np.searchsorted(candidatos, lo):np.searchsorted(candidatos, hi)]
+        if filtra_monto:
+            imp = self.importe[seleccion]
+            ok = np.ones(len(seleccion), dtype=bool)
+            if monto_min is not None: ok &= imp >= monto_min
+            if monto_max is not None: ok &= imp <= monto_max
+            seleccion = seleccion[ok]
+
+        pagina = seleccion[:limite]
+        siguiente = None
+        if len(seleccion) > limite:
+            ultimo = pagina[-1]
+            siguiente = (int(self._neg_fecha[ultimo]), int(-self._neg_pos[ultimo]))
+        return self.df.iloc[self.orden[pagina]], siguiente
@@ -0,0 +1,137 @@
+import functools
+import re
+
+import numpy as np
+import pandas as pd
+
+from finanzas.bitacora import normalizar
+
+# ================= CATEGORIZADOR POR REGLAS =================
+# Reglas de la hoja "Categorias": PATRON, CATEGORIA, TIPO ("palabra" o "regex").
+# Todas se compilan en dos expresiones:
+#   - palabras: un trie convertido en una sola regex (prefijos comunes
+#     factorizados, como un autómata), que encuentra en una pasada todas las
+#     palabras / frases de las reglas que aparecen completas en la descripción
+#   - regex: una alternancia ordenada de lookaheads; la primera que cumple es la
+#     regla con menor posición en la hoja (las que tienen grupos de captura se
+#     prueban una por una: la unión renumeraría sus referencias)
+# Gana la regla que aparece primero en la hoja; entre palabras que empiezan en el
+# mismo lugar, la más larga. La descripción se compara en minúsculas y sin
+# acentos (como normalizar de finanzas.bitacora) y cada descripción se resuelve
+# una sola vez: memo por texto original y por texto normalizado.
+TIPOS = ("palabra", "regex")
+_NO_ALFANUM = re.compile(r"[^a-z0-9ñ]+")
+
+
+def _palabras(texto):
+    return " ".join(p for p in _NO_ALFANUM.split(texto) if p)
+
+
+def _trie(claves):
+    """Regex equivalente a la alternancia de `claves`, factorizada por prefijos"""
+    raiz = {}
+    for clave in claves:
+        nodo = raiz
+        for ch in clave: nodo = nodo.setdefault(ch, {})
+        nodo[""] = {}
+
+    def armar(nodo):
+        ramas = [re.escape(ch) + armar(hijo) for ch, hijo in sorted(nodo.items()) if ch]
+        if not ramas: return ""
+        grupo = ramas[0] if len(ramas) == 1 else "(?:" + "|".join(ramas) + ")"
+        # Opcional (y codicioso) si una clave termina aquí: primero la más larga
+        return f"(?:{grupo})?" if "" in nodo else grupo
+    return armar(raiz)
+
+
+class Categorizador:
+    def __init__(self, reglas):
+        """`reglas`: dicts con PATRON, CATEGORIA y TIPO, en el orden de la hoja"""
+        self.categorias = []
+        self.errores = []  # (PATRON, mensaje) de las reglas que no compilan
+        palabras, regex = {}, []
+        for r in reglas:
+            patron, categoria = str(r.get("PATRON", "")).strip(), str(r.get("CATEGORIA", "")).strip()
+            tipo = str(r.get("TIPO", "") or "palabra").strip().lower()
+            if not patron or not categoria: continue
+            i = len(self.categorias)
+            if tipo == "regex":
+                try: re.compile(patron)
+                except re.error as e:
+                    self.errores.append((patron, str(e)))
+                    continue
+                regex.append((i, patron))
+            else:
+                clave = _palabras(normalizar(patron))
+                if not clave: continue
+                palabras.setdefault(clave, i)
+            self.categorias.append(categoria)
+        self._indice_palabra = palabras
+        self._palabras = re.compile(rf"(?<![^ ])(?=({_trie(palabras)})(?![^ ]))") if palabras else None
+        # Con grupos de captura la unión los renumera y \1 apuntaría a otro grupo
+        unidas = [(i, p) for i, p in regex if not re.compile(p).groups]
+        self._regex_sueltas = [(i, re.compile(p, re.IGNORECASE)) for i, p in regex if re.compile(p).groups]
+        self._regex = None
+        if unidas:
+            alternativas = "|".join(rf"(?=[\s\S]*?(?:{p}))(?P<r{i}>)" for i, p in unidas)
+            try: self._regex = re.compile(rf"^(?:{alternativas})", re.IGNORECASE)
+            except re.error:
+                # Banderas en línea no sobreviven a la unión
+                self._regex_sueltas = sorted(self._regex_sueltas + [(i, re.compile(p, re.IGNORECASE)) for i, p in unidas])
+        self._memo = {}  # descripción original -> categoría
+        self._memo_normal = {}  # descripción normalizada -> categoría
+
+    def __len__(self):
+        return len(self.categorias)
+
+    def _regla(self, texto):
+        """Posición de la primera regla que coincide con `texto` normalizado, o None"""
+        mejor = None
+        if self._palabras is not None:
+            for m in self._palabras.finditer(_palabras(texto)):
+                i = self._indice_palabra[m.group(1)]
+                if mejor is None or i < mejor: mejor = i
+        if self._regex is not None:
+            m = self._regex.match(texto)
+            if m and (mejor is None or int(m.lastgroup[1:]) < mejor): mejor = int(m.lastgroup[1:])
+        for i, rx in self._regex_sueltas:
+            if mejor is not None and i > mejor: break
+            if rx.search(texto):
+                mejor = i
+                break
+        return mejor
+
+    def _categoria_normal(self, texto):
+        if texto not in self._memo_normal:
+            i = self._regla(texto)
+            self._memo_normal[texto] = None if i is None else self.categorias[i]
+        return self._memo_normal[texto]
+
+    def categoria(self, descripcion):
+        """Categoría de una descripción (None si ninguna regla coincide)"""
+        descripcion = str(descripcion)
+        if descripcion not in self._memo:
+            # ASCII (casi todo) sólo necesita minúsculas; lo demás pasa por unicodedata
+            texto = descripcion.lower() if descripcion.isascii() else normalizar(descripcion)
+            self._memo[descripcion] = self._categoria_normal(texto)
+        return self._memo[descripcion]
+
+    def aplicar(self, descripciones, defecto=None):
+        """Series de categorías; las descripciones repetidas se resuelven una vez.
+        Sin regla: `defecto` (Series alineada o escalar)"""
+        descripciones = pd.Series(descripciones)
+        codigos, unicos = pd.factorize(descripciones.astype(str))
+        memo, categoria = self._memo, self.categoria
+        por_unico = np.array([memo[u] if u in memo else categoria(u) for u in unicos.tolist()] + [None], dtype=object)
+        res = pd.Series(por_unico[codigos], index=descripciones.index, dtype=object)
+        return res if defecto is None else res.fillna(defecto)
+
+
+@functools.lru_cache(maxsize=4)
+def _compilar(reglas):
+    return Categorizador([dict(zip(("PATRON", "CATEGORIA", "TIPO"), r)) for r in reglas])
+
+
+def compilar(reglas):
+    """Categorizador compartido para un mismo juego de reglas (conserva el memo entre reruns)"""
+    return _compilar(tuple((str(r.get("PATRON", "")), str(r.get("CATEGORIA", "")), str(r.get("TIPO", ""))) for r in reglas))
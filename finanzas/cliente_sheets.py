@@ -0,0 +1,134 @@
+import random
+import threading
+import time
+
+import requests
+from gspread.exceptions import APIError
+from gspread.utils import absolute_range_name
+
+from finanzas.metricas import CUOTA_ESCRITURA, CUOTA_LECTURA, metricas
+
+# ================= CLIENTE DE GOOGLE SHEETS =================
+# Toda llamada a la API pasa por aquí:
+#   - cubeta de fichas por tipo (lectura / escritura) para no rebasar la cuota
+#     por minuto, con una ráfaga corta permitida
+#   - reintentos con espera exponencial (+ azar) ante 429 y errores 5xx / red
+#   - worksheets pedidos una sola vez (una llamada de metadatos para todas)
+#   - lectura de varios rangos de varias hojas en un solo values_batch_get
+LECTURAS = {"get_all_values", "get_all_records", "batch_get", "row_values", "col_values", "find", "get"}
+ESCRITURAS = {"append_row", "append_rows", "update_cell", "batch_update", "update"}
+RAFAGA = 6
+REINTENTABLES = {429, 500, 502, 503, 504}
+
+
+class CubetaFichas:
+    """Token bucket: `capacidad` fichas, se repone a `por_segundo`"""
+
+    def __init__(self, capacidad, por_segundo):
+        self.capacidad = capacidad
+        self.por_segundo = por_segundo
+        self.fichas = float(capacidad)
+        self.t = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reponer(self):
+        ahora = time.monotonic()
+        self.fichas = min(self.capacidad, self.fichas + (ahora - self.t) * self.por_segundo)
+        self.t = ahora
+
+    def tomar(self):
+        """Bloquea hasta que haya una ficha; devuelve los segundos esperados"""
+        esperado = 0.0
+        while True:
+            with self._lock:
+                self._reponer()
+                if self.fichas >= 1:
+                    self.fichas -= 1
+                    return esperado
+                falta = (1 - self.fichas) / self.por_segundo
+            time.sleep(falta)
+            esperado += falta
+
+
+def cubeta_por_cuota(cuota, rafaga=RAFAGA):
+    """En cualquier ventana de 60 s entran a lo más `cuota` llamadas"""
+    return CubetaFichas(rafaga, (cuota - rafaga) / 60)
+
+
+def _codigo(error):
+    if isinstance(error, APIError): return error.code if error.code != -1 else getattr(error.response, "status_code", None)
+    return None
+
+
+class ClienteSheets:
+    def __init__(self, sh, lectura=None, escritura=None, reintentos=5, espera_base=1.0, espera_max=32.0):
+        self.sh = sh
+        self.cubetas = {"lectura": lectura or cubeta_por_cuota(CUOTA_LECTURA),
+                        "escritura": escritura or cubeta_por_cuota(CUOTA_ESCRITURA)}
+        self.reintentos = reintentos
+        self.espera_base = espera_base
+        self.espera_max = espera_max
+        self._hojas = None
+        self._lock = threading.Lock()
+
+    def llamar(self, tipo, fn, *args, **kwargs):
+        """fn(*args) respetando la cuota de `tipo` y reintentando 429 / 5xx"""
+        for intento in range(self.reintentos + 1):
+            espera = self.cubetas[tipo].tomar()
+            if espera: metricas.contar("sheets.espera_cuota")
+            metricas.contar(f"sheets.{tipo}")
+            try:
+                with metricas.tramo(f"sheets.{getattr(fn, '__name__', tipo)}"):
+                    return fn(*args, **kwargs)
+            except (APIError, requests.ConnectionError, requests.Timeout) as e:
+                codigo = _codigo(e)
+                if (isinstance(e, APIError) and codigo not in REINTENTABLES) or intento == self.reintentos: raise
+                metricas.contar(f"sheets.reintento.{codigo or 'red'}")
+                time.sleep(min(self.espera_max, self.espera_base * 2 ** intento) * (1 + random.random() / 2))
+
+    # ---------- worksheets ----------
+    def hojas(self):
+        """{titulo: Worksheet}; la primera también queda como "Hoja 1" (sheet1)"""
+        with self._lock:
+            if self._hojas is None:
+                lista = self.llamar("lectura", self.sh.worksheets)
+                self._hojas = {ws.title: HojaLimitada(ws, self) for ws in lista}
+                if lista: self._hojas.setdefault("Hoja 1", self._hojas[lista[0].title])
+            return self._hojas
+
+    def hoja(self, nombre):
+        return self.hojas()[nombre]
+
+    def titulo(self, nombre):
+        return self.hoja(nombre).title
+
+    def crear_hoja(self, nombre, encabezado):
+        """Agrega la worksheet con su encabezado (sin volver a pedir la lista)"""
+        ws = self.llamar("escritura", self.sh.add_worksheet, title=nombre, rows=100, cols=len(encabezado))
+        self.llamar("escritura", ws.append_row, list(encabezado))
+        hojas = self.hojas()
+        with self._lock: hojas[nombre] = HojaLimitada(ws, self)
+        return hojas[nombre]
+
+    # ---------- lectura por lotes ----------
+    def leer_rangos(self, pedidos):
+        """[(hoja, rango A1 o None = hoja completa)] -> lista de valores, en una sola llamada"""
+        if not pedidos: return []
+        rangos = [absolute_range_name(self.titulo(h), r) for h, r in pedidos]
+        res = self.llamar("lectura", self.sh.values_batch_get, rangos)
+        return [v.get("values", []) for v in res.get("valueRanges", [])]
+
+
+class HojaLimitada:
+    """Worksheet cuyas llamadas a la API pasan por ClienteSheets.llamar"""
+
+    def __init__(self, ws, cliente):
+        self._ws = ws
+        self._cliente = cliente
+
+    def __getattr__(self, nombre):
+        attr = getattr(self._ws, nombre)
+        if nombre in LECTURAS: tipo = "lectura"
+        elif nombre in ESCRITURAS: tipo = "escritura"
+        else: return attr
+        return lambda *args, **kwargs: self._cliente.llamar(tipo, attr, *args, **kwargs)
@@ -0,0 +1,211 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from finanzas.almacen import ENCABEZADOS
+from finanzas.metricas import metricas
+
+# ================= COLA DE ESCRITURA (WRITE-BEHIND) =================
+# Las escrituras se encolan y se reflejan al instante sobre los datos en memoria
+# (ver `aplicar`). Un hilo de fondo las envía al almacén en lotes: operaciones del
+# mismo tipo y hoja se agrupan en un solo anexar/actualizar_celdas aunque haya
+# escrituras a otras hojas entre ellas (p. ej. cobro -> ABONADO en Deudas + fila en
+# "Hoja 1", varias veces). Dentro de una misma hoja el orden se respeta siempre.
+# Si un lote falla:
+#   - error transitorio (429 / 5xx / red / base ocupada): esa hoja espera al
+#     siguiente intento (espera exponencial) y las demás siguen enviándose
+#   - error permanente (400, 403, datos inválidos, ...): se reintenta operación por
+#     operación y las que vuelven a fallar pasan a `rechazadas`, que la barra
+#     lateral muestra para reintentarlas o descartarlas; la hoja no se bloquea
+# Lo pendiente y lo rechazado se guardan en disco.
+RUTA_COLA = os.path.join(".cache", "cola_escritura.json")
+MAX_LOTE = 5000  # filas / celdas por llamada (una importación grande va en varios lotes)
+REINTENTABLES = {429, 500, 502, 503, 504}  # los mismos que finanzas.cliente_sheets
+
+
+def reintentable(error):
+    """True si vale la pena reintentar la misma escritura más tarde"""
+    codigo = getattr(error, "code", None)  # gspread APIError
+    if not isinstance(codigo, int) or codigo < 100: codigo = getattr(getattr(error, "response", None), "status_code", None)
+    if codigo is not None: return codigo in REINTENTABLES
+    if isinstance(error, sqlite3.OperationalError): return "locked" in str(error) or "busy" in str(error)
+    # Red y disco (requests.RequestException también es OSError)
+    return isinstance(error, (OSError, TimeoutError))
+
+
+class ColaEscritura:
+    """Cola ordenada de escrituras pendientes hacia un almacén"""
+
+    def __init__(self, almacen, ruta=RUTA_COLA, demora=1.0, espera_max=60):
+        self.almacen = almacen
+        self.ruta = ruta
+        self.demora = demora
+        self.espera_max = espera_max
+        self.version = 0
+        self.fallos = 0
+        self.ultimo_error = None
+        self._pendientes = []
+        self._aplicadas = []  # (op, momento) ya enviadas, hasta que una lectura las incluya
+        self._rechazadas = []  # {"op", "error", "momento"} que el almacén no acepta
+        self._cond = threading.Condition()
+        self.ruta_rechazadas = os.path.splitext(ruta)[0] + "_rechazadas.json" if ruta else None
+        for destino, archivo in (("_pendientes", ruta), ("_rechazadas", self.ruta_rechazadas)):
+            if archivo and os.path.exists(archivo):
+                try:
+                    with open(archivo, encoding="utf-8") as f: setattr(self, destino, json.load(f))
+                except Exception: pass
+        self._hilo = threading.Thread(target=self._bucle, name="cola-escritura", daemon=True)
+        self._hilo.start()
+
+    # ---------- encolar ----------
+    def _encolar(self, op):
+        with self._cond:
+            self._pendientes.append(op)
+            self.version += 1
+            self._persistir()
+            self._cond.notify()
+
+    def anexar(self, hoja, filas):
+        self._encolar({"tipo": "anexar", "hoja": hoja, "filas": [list(f) for f in filas]})
+
+    def actualizar_celda(self, hoja, fila, col, valor):
+        self.actualizar_celdas(hoja, [(fila, col, valor)])
+
+    def actualizar_celdas(self, hoja, celdas):
+        celdas = [list(c) for c in celdas if c]
+        if celdas: self._encolar({"tipo": "actualizar", "hoja": hoja, "celdas": celdas})
+
+    def pendientes(self):
+        with self._cond: return len(self._pendientes)
+
+    def rechazadas(self):
+        with self._cond: return list(self._rechazadas)
+
+    def reintentar_rechazadas(self):
+        """Vuelve a encolar lo rechazado (p. ej. después de corregir permisos o la hoja)"""
+        with self._cond:
+            self._pendientes.extend(r["op"] for r in self._rechazadas)
+            self._rechazadas = []
+            self.version += 1
+            self._persistir(rechazadas=True)
+            self._cond.notify()
+
+    def descartar_rechazadas(self):
+        with self._cond:
+            self._rechazadas = []
+            self._persistir(rechazadas=True)
+
+    def _persistir(self, rechazadas=False):
+        archivos = [(self._pendientes, self.ruta)]
+        if rechazadas: archivos.append((self._rechazadas, self.ruta_rechazadas))
+        for datos, ruta in archivos:
+            if not ruta: continue
+            carpeta = os.path.dirname(ruta)
+            if carpeta: os.makedirs(carpeta, exist_ok=True)
+            tmp = ruta + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f: json.dump(datos, f, default=str)
+            os.replace(tmp, ruta)
+
+    # ---------- vista local ----------
+    def aplicar(self, registros, leido_en):
+        """Superpone a `registros` ({hoja: [dicts]}) lo que aún no trae una lectura hecha en `leido_en`"""
+        with self._cond:
+            self._aplicadas = [(op, t) for op, t in self._aplicadas if t >= leido_en]
+            ops = [op for op, _ in self._aplicadas] + list(self._pendientes)
+        if not ops: return registros
+        res = {h: list(r) for h, r in registros.items()}
+        for op in ops:
+            filas = res.setdefault(op["hoja"], [])
+            # Hoja aún vacía: el encabezado con el que se crea
+            encabezado = list(filas[0].keys()) if filas else list(ENCABEZADOS.get(op["hoja"], []))
+            if op["tipo"] == "anexar":
+                if not encabezado: continue
+                filas.extend(dict(zip(encabezado, (list(f) + [""] * len(encabezado))[:len(encabezado)])) for f in op["filas"])
+            else:
+                for fila, col, valor in op["celdas"]:
+                    i = fila - 2  # la fila 1 de la hoja es el encabezado
+                    if 0 <= i < len(filas) and 1 <= col <= len(encabezado):
+                        filas[i] = {**filas[i], encabezado[col - 1]: valor}
+        return res
+
+    # ---------- envío ----------
+    def _lote(self, omitir=()):
+        """Operaciones con el mismo tipo y hoja que la primera de una hoja fuera de
+        `omitir`, hasta que esa hoja reciba una operación de otro tipo (las de otras
+        hojas no la afectan) o se junten MAX_LOTE filas / celdas"""
+        primera = next((op for op in self._pendientes if op["hoja"] not in omitir), None)
+        if primera is None: return []
+        lote, n = [], 0
+        for op in self._pendientes:
+            if (op["tipo"], op["hoja"]) == (primera["tipo"], primera["hoja"]):
+                tam = len(op.get("filas") or op.get("celdas") or ())
+                if lote and n + tam > MAX_LOTE: break
+                lote.append(op)
+                n += tam
+            elif op["hoja"] == primera["hoja"]: break
+        return lote
+
+    def _enviar(self, lote):
+        if lote[0]["tipo"] == "anexar":
+            self.almacen.anexar(lote[0]["hoja"], [f for op in lote for f in op["filas"]])
+        else:
+            self.almacen.actualizar_celdas(lote[0]["hoja"], [c for op in lote for c in op["celdas"]])
+
+    def _uno_a_uno(self, lote, error):
+        """El lote falló por un error permanente: se aísla la operación culpable.
+        Devuelve (enviadas, rechazadas [(op, error)], error transitorio o None)"""
+        if len(lote) == 1: return [], [(lote[0], str(error))], None
+        enviadas, rechazadas = [], []
+        for op in lote:
+            try: self._enviar([op])
+            except Exception as e:
+                if reintentable(e): return enviadas, rechazadas, e
+                rechazadas.append((op, str(e)))
+                continue
+            enviadas.append(op)
+        return enviadas, rechazadas, None
+
+    def vaciar(self):
+        """Envía todo lo que se pueda; devuelve False si alguna hoja quedó esperando
+        por un error transitorio"""
+        bloqueadas, error = set(), None
+        while True:
+            with self._cond:
+                lote = self._lote(bloqueadas)
+            if not lote: break
+            try:
+                self._enviar(lote)
+                enviadas, rechazadas, transitorio = lote, [], None
+            except Exception as e:
+                if reintentable(e): enviadas, rechazadas, transitorio = [], [], e
+                else: enviadas, rechazadas, transitorio = self._uno_a_uno(lote, e)
+            if transitorio is not None:
+                # Esta hoja espera al siguiente intento; las demás siguen
+                bloqueadas.add(lote[0]["hoja"])
+                error = transitorio
+            with self._cond:
+                ahora = time.time()
+                listas = {id(op) for op in enviadas} | {id(op) for op, _ in rechazadas}
+                self._pendientes = [op for op in self._pendientes if id(op) not in listas]
+                self._aplicadas.extend((op, ahora) for op in enviadas)
+                self._rechazadas.extend({"op": op, "error": e, "momento": ahora} for op, e in rechazadas)
+                if rechazadas: metricas.contar("cola.rechazadas", len(rechazadas))
+                if listas: self._persistir(rechazadas=bool(rechazadas))
+        with self._cond:
+            if bloqueadas:
+                self.fallos += 1
+                self.ultimo_error = str(error)
+            else:
+                self.fallos = 0
+                self.ultimo_error = None
+        return not bloqueadas
+
+    def _bucle(self):
+        while True:
+            with self._cond:
+                while not self._pendientes: self._cond.wait()
+            time.sleep(self.demora)  # junta las escrituras de una misma acción
+            if not self.vaciar():
+                time.sleep(min(self.espera_max, 2 ** self.fallos))
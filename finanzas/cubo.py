@@ -0,0 +1,56 @@
+import pandas as pd
+
+# ================= CUBO MENSUAL =================
+# Flujo proyectado agregado por MES × CATEGORIA × BANCO × TIPO_FLUJO, con
+# SALIDAS (gasto, en positivo), ENTRADAS y N. Se arma una vez por versión de
+# datos y los widgets del dashboard consultan este cubo (cientos de filas) en
+# lugar del flujo completo.
+DIMENSIONES = ['MES', 'CATEGORIA', 'BANCO', 'TIPO_FLUJO']
+
+
+def construir_cubo(df_flujo):
+    if df_flujo.empty:
+        return pd.DataFrame(columns=DIMENSIONES + ['SALIDAS', 'ENTRADAS', 'N'])
+    imp = df_flujo['IMPORTE_REAL']
+    tmp = pd.DataFrame({
+        'MES': df_flujo['FECHA'].dt.to_period('M').dt.to_timestamp(),
+        'CATEGORIA': df_flujo['CATEGORIA'],
+        'BANCO': df_flujo['BANCO'] if 'BANCO' in df_flujo.columns else '',
+        'TIPO_FLUJO': df_flujo['TIPO_FLUJO'],
+        'SALIDAS': (-imp).clip(lower=0),
+        'ENTRADAS': imp.clip(lower=0),
+        'N': 1,
+    })
+    return tmp.groupby(DIMENSIONES, as_index=False, sort=True).sum()
+
+
+def _mes(fecha):
+    return pd.Timestamp(fecha).to_period('M').to_timestamp()
+
+
+def gasto_mes(cubo, fecha):
+    """Total de salidas del mes de `fecha`"""
+    if cubo.empty: return 0.0
+    return float(cubo.loc[cubo['MES'] == _mes(fecha), 'SALIDAS'].sum())
+
+
+def gastos_por_categoria(cubo, fecha):
+    """Salidas del mes por CATEGORIA (para la gráfica de pastel)"""
+    sel = cubo[(cubo['MES'] == _mes(fecha)) & (cubo['SALIDAS'] > 0)]
+    return sel.groupby('CATEGORIA', as_index=False)['SALIDAS'].sum()
+
+
+def comparativo_mensual(cubo, hasta, meses=12):
+    """Entradas/salidas por mes y variación de gasto contra el mes anterior"""
+    fin = _mes(hasta)
+    sel = cubo[(cubo['MES'] <= fin) & (cubo['MES'] > fin - pd.DateOffset(months=meses))]
+    res = sel.groupby('MES', as_index=False)[['SALIDAS', 'ENTRADAS']].sum()
+    res['VAR_SALIDAS'] = res['SALIDAS'].pct_change()
+    return res
+
+
+def carga_diferida(cubo, desde, meses=24):
+    """Mensualidades (MSI / intereses) ya comprometidas por mes a partir de `desde`"""
+    inicio = _mes(desde)
+    sel = cubo[(cubo['TIPO_FLUJO'] == 'Diferido') & (cubo['MES'] >= inicio) & (cubo['MES'] < inicio + pd.DateOffset(months=meses))]
+    return sel.groupby('MES', as_index=False)['SALIDAS'].sum()
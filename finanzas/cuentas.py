@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+from finanzas.esquema import es_gasto as _es_gasto, parsear_fechas, parsear_numeros
+
+# ================= ÍNDICE POR CUENTA =================
+# Un renglón por BANCO con lo que piden el calendario, la pestaña de deudas y los
+# selectores: SALDO, CARGOS (gastos), ABONOS (todo lo demás), MOVIMIENTOS,
+# ULTIMO_MOV y, una vez cruzado con Deudas, LIMITE / DEUDA / UTILIZACION.
+
+
+def indice_vacio():
+    return pd.DataFrame(
+        {'SALDO': [], 'CARGOS': [], 'ABONOS': [], 'MOVIMIENTOS': pd.Series([], dtype='int64'), 'ULTIMO_MOV': pd.Series([], dtype='datetime64[ns]')},
+        index=pd.Index([], name='BANCO', dtype=object),
+    )
+
+
+def resumen_cuentas(df):
+    """Agrega movimientos (con BANCO, TIPO, IMPORTE y FECHA) por cuenta con un solo groupby"""
+    if df is None or df.empty or 'BANCO' not in df.columns: return indice_vacio()
+    imp = parsear_numeros(df['IMPORTE']).fillna(0).abs().to_numpy()
+    es_gasto = _es_gasto(df['TIPO'])
+    fechas = parsear_fechas(df['FECHA'])
+    tmp = pd.DataFrame({
+        'BANCO': df['BANCO'].astype(str).to_numpy(),
+        'SALDO': np.where(es_gasto, -imp, imp),
+        'CARGOS': np.where(es_gasto, imp, 0.0),
+        'ABONOS': np.where(es_gasto, 0.0, imp),
+        'MOVIMIENTOS': 1,
+        'ULTIMO_MOV': fechas.to_numpy(),
+    })
+    return tmp.groupby('BANCO').agg(
+        SALDO=('SALDO', 'sum'), CARGOS=('CARGOS', 'sum'), ABONOS=('ABONOS', 'sum'),
+        MOVIMIENTOS=('MOVIMIENTOS', 'sum'), ULTIMO_MOV=('ULTIMO_MOV', 'max'),
+    )
+
+
+def sumar_movimientos(indice, df_nuevos):
+    """Actualiza el índice con movimientos recién guardados sin recalcular todo"""
+    nuevo = resumen_cuentas(df_nuevos)
+    if nuevo.empty: return indice
+    if indice.empty: return nuevo
+    suma = indice[['SALDO', 'CARGOS', 'ABONOS', 'MOVIMIENTOS']].add(nuevo[['SALDO', 'CARGOS', 'ABONOS', 'MOVIMIENTOS']], fill_value=0)
+    ultimo = pd.concat([indice['ULTIMO_MOV'], nuevo['ULTIMO_MOV']], axis=1).max(axis=1)
+    return suma.assign(MOVIMIENTOS=suma['MOVIMIENTOS'].astype('int64'), ULTIMO_MOV=ultimo)
+
+
+def con_limites(indice, df_deudas):
+    """Cruza con Deudas: límite de crédito, deuda de tarjeta y % de utilización"""
+    indice = indice.copy()
+    limites = {}
+    if not df_deudas.empty and 'LIMITE_CREDITO' in df_deudas.columns:
+        limites = dict(zip(df_deudas['NOMBRE'].astype(str), pd.to_numeric(df_deudas['LIMITE_CREDITO'], errors='coerce').fillna(0)))
+    indice['LIMITE'] = [float(limites.get(b, 0)) for b in indice.index]
+    indice['DEUDA'] = (-indice['SALDO']).clip(lower=0)
+    indice['UTILIZACION'] = np.where(indice['LIMITE'] > 0, indice['DEUDA'] / indice['LIMITE'].where(indice['LIMITE'] > 0, 1), np.nan)
+    return indice
+
+
+def resumen_deudas(df_deudas, indice):
+    """(cobros, pasivos) activos con los montos de la pestaña de deudas ya calculados:
+    PENDIENTE, AVANCE y SUGERIDO por cobrar; DEUDA, LIMITE, DISPONIBLE, SUGERIDO y
+    la actividad de la cuenta (tarjetas) por pagar"""
+    if df_deudas.empty: return pd.DataFrame(), pd.DataFrame()
+    activas = df_deudas[df_deudas['ESTADO'] == 'Activo']
+    tot, abo = activas['MONTO_TOTAL'].astype(float), activas['ABONADO'].astype(float)
+    plazo = np.maximum(activas['PLAZO_MESES'].fillna(1).astype(int), 1)
+    pendiente = tot - abo
+    con_total = tot > 0
+    # Cuotas que ya cubre lo abonado; el resto se reparte en las que faltan
+    cubiertas = (abo / (tot / plazo).where(con_total, 1)).where(con_total, 0)
+
+    cobrar = (activas['TIPO'] == 'Por Cobrar').to_numpy()
+    cobros = activas[cobrar].assign(
+        PENDIENTE=pendiente[cobrar],
+        AVANCE=(abo / tot.where(con_total, 1)).clip(upper=1).where(con_total, 0)[cobrar],
+        SUGERIDO=np.minimum(pendiente / np.maximum(plazo - cubiertas, 1), pendiente)[cobrar])
+
+    pasivos = activas[~cobrar]
+    tarjeta = pasivos['TIPO'].astype(str).str.contains('Tarjeta', regex=False)
+    cta = indice.reindex(pasivos['NOMBRE'].astype(str)).set_axis(pasivos.index)
+    deuda = cta['DEUDA'].fillna(0).where(tarjeta, pendiente[~cobrar]) if 'DEUDA' in cta.columns else pendiente[~cobrar]
+    limite = pasivos['LIMITE_CREDITO'].astype(float).fillna(0) if 'LIMITE_CREDITO' in pasivos.columns else 0.0
+    pasivos = pasivos.assign(
+        ES_TARJETA=tarjeta, DEUDA=deuda, LIMITE=limite, DISPONIBLE=limite - deuda,
+        SUGERIDO=deuda.where(tarjeta, deuda / plazo[~cobrar]),
+        ULTIMO_MOV=cta['ULTIMO_MOV'], MOVIMIENTOS=cta['MOVIMIENTOS'])
+    return cobros, pasivos
@@ -0,0 +1,165 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from finanzas.metricas import metricas
+
+# ================= DERIVADOS: ARTEFACTOS POR HUELLA DE DATOS =================
+# Cada hoja leída tiene una huella (filas, suma de hashes fila a fila con su
+# posición). Anexar suma términos y editar una celda cambia sólo el de su fila,
+# así que se actualiza en O(filas cambiadas) y la hoja con la cola encima tiene
+# la misma huella que la lectura que ya incluye esas escrituras.
+# Cada artefacto (flujo, cuentas, agenda, índice de la bitácora, ...) declara de
+# qué hojas u otros artefactos depende; su clave es la de sus dependencias más
+# sus parámetros:
+#   - un rerun por un widget no recalcula nada (todas las claves se repiten)
+#   - guardar un movimiento recalcula sólo lo que cuelga de "Hoja 1"
+# Los valores viven en un memo LRU con tope de memoria, compartido por todas las
+# sesiones y sin copias al leerlos: no deben modificarse.
+MASCARA = (1 << 64) - 1
+LIMITE_MB = 512
+MAX_ARTEFACTOS = 256
+MUESTRA = 10_000  # filas en las que se mide el contenido de columnas de objetos
+
+
+# ---------- huellas ----------
+def _hash_fila(i, fila):
+    return hash((i, *fila.values()))
+
+
+def huella(filas):
+    """(filas, suma de hashes por posición) de una hoja como lista de dicts"""
+    return len(filas), sum(_hash_fila(i, f) for i, f in enumerate(filas)) & MASCARA
+
+
+def huella_vigente(leida, original, vigente):
+    """Huella de `vigente` (la hoja con la cola encima) a partir de la de `original`;
+    sólo se hashean las filas que la cola agregó o reemplazó"""
+    if vigente is original: return leida
+    suma = leida[1]
+    for i, (antes, ahora) in enumerate(zip(original, vigente)):
+        if antes is not ahora: suma += _hash_fila(i, ahora) - _hash_fila(i, antes)
+    for i in range(len(original), len(vigente)): suma += _hash_fila(i, vigente[i])
+    return len(vigente), suma & MASCARA
+
+
+def _memoria(valor, hondo):
+    m = valor.memory_usage(index=True, deep=hondo)
+    return int(m.sum()) if isinstance(m, pd.Series) else int(m)
+
+
+def _memoria_pandas(valor):
+    """Bytes de un DataFrame / Series contando el texto y objetos de sus columnas.
+    Con más de MUESTRA filas ese contenido se mide en filas espaciadas y se extrapola."""
+    n = len(valor)
+    if n <= MUESTRA: return _memoria(valor, True)
+    muestra = valor.iloc[::n // MUESTRA]
+    objetos = (_memoria(muestra, True) - _memoria(muestra, False)) * n / len(muestra)
+    return _memoria(valor, False) + int(objetos)
+
+
+def tamano(valor, _nivel=0):
+    """Bytes aproximados de un artefacto"""
+    if isinstance(valor, (pd.DataFrame, pd.Series)): return _memoria_pandas(valor)
+    if isinstance(valor, pd.Index): return int(valor.memory_usage(deep=True))
+    if isinstance(valor, np.ndarray): return valor.nbytes
+    if _nivel < 3:
+        if isinstance(valor, dict): return sys.getsizeof(valor) + sum(tamano(v, _nivel + 1) for v in valor.values())
+        if isinstance(valor, (list, tuple)): return sys.getsizeof(valor) + sum(tamano(v, _nivel + 1) for v in valor)
+        if hasattr(valor, "__dict__"): return tamano(vars(valor), _nivel + 1)
+    return sys.getsizeof(valor)
+
+
+# ---------- memo compartido ----------
+class MemoLRU:
+    """clave -> artefacto; desaloja el menos usado al pasar de `limite_mb` o `max_artefactos`"""
+
+    def __init__(self, limite_mb=LIMITE_MB, max_artefactos=MAX_ARTEFACTOS):
+        self.limite = limite_mb * 1e6
+        self.max_artefactos = max_artefactos
+        self.bytes = 0
+        self.desalojos = 0
+        self._datos = OrderedDict()  # clave -> (valor, bytes)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._datos)
+
+    def obtener(self, clave):
+        """(True, valor) si está; (False, None) si no"""
+        with self._lock:
+            if clave not in self._datos: return False, None
+            self._datos.move_to_end(clave)
+            return True, self._datos[clave][0]
+
+    def guardar(self, clave, valor):
+        b = tamano(valor)
+        with self._lock:
+            if clave in self._datos: self.bytes -= self._datos.pop(clave)[1]
+            self._datos[clave] = (valor, b)
+            self.bytes += b
+            # El recién guardado se queda aunque por sí solo pase del tope
+            while len(self._datos) > 1 and (self.bytes > self.limite or len(self._datos) > self.max_artefactos):
+                _, (_, viejo) = self._datos.popitem(last=False)
+                self.bytes -= viejo
+                self.desalojos += 1
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+            self.bytes = 0
+
+    def estado(self):
+        return {"artefactos": len(self._datos), "mb": round(self.bytes / 1e6, 1),
+                "limite_mb": round(self.limite / 1e6), "desalojos": self.desalojos}
+
+
+# ---------- grafo ----------
+class Grafo:
+    """Definición de los artefactos: nombre -> (función, dependencias)"""
+
+    def __init__(self):
+        self.nodos = {}
+
+    def nodo(self, nombre, *dependencias):
+        """Decorador: fn(*valores de las dependencias, *parámetros)"""
+        def registrar(fn):
+            self.nodos[nombre] = (fn, dependencias)
+            return fn
+        return registrar
+
+    def vista(self, memo, fuentes, huellas):
+        return Vista(self, memo, fuentes, huellas)
+
+
+class Vista:
+    """Los datos de un rerun: hojas (`fuentes`) con su huella sobre el memo compartido"""
+
+    def __init__(self, grafo, memo, fuentes, huellas):
+        self.grafo, self.memo = grafo, memo
+        self._valores = dict(fuentes)
+        self._claves = {nombre: (nombre, huellas[nombre]) for nombre in fuentes}
+
+    def clave(self, nombre):
+        """Identidad del artefacto: sus dependencias hasta las huellas de las hojas"""
+        if nombre not in self._claves:
+            _, deps = self.grafo.nodos[nombre]
+            self._claves[nombre] = (nombre, tuple(self.clave(d) for d in deps))
+        return self._claves[nombre]
+
+    def __call__(self, nombre, *parametros):
+        if not parametros and nombre in self._valores: return self._valores[nombre]
+        clave = (self.clave(nombre), parametros)
+        metricas.contar(f"cache.{nombre}.llamadas")
+        hay, valor = self.memo.obtener(clave)
+        if not hay:
+            fn, deps = self.grafo.nodos[nombre]
+            args = [self(d) for d in deps]
+            metricas.contar(f"cache.{nombre}.fallos")
+            with metricas.tramo(nombre): valor = fn(*args, *parametros)
+            self.memo.guardar(clave, valor)
+        if not parametros: self._valores[nombre] = valor
+        return valor
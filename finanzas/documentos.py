@@ -0,0 +1,146 @@
+import io
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from fpdf import FPDF
+
+# ================= DOCUMENTOS PDF =================
+# Recibos sueltos y estados de cuenta mensuales. Para el cierre de mes se
+# reparten en un pool de procesos: cada trabajador arma su plantilla y carga las
+# métricas de las fuentes una sola vez (ver _iniciar_trabajador) y devuelve los
+# bytes de cada PDF. La app crea un solo pool (crear_pool) y lo reutiliza; sus
+# procesos se inician con "spawn": hacer fork del servidor, que tiene hilos, puede
+# dejar candados tomados en el hijo.
+_PLANTILLA = None
+FUENTES = [("Arial", ""), ("Arial", "B"), ("Arial", "I")]
+
+
+def _latin1(texto):
+    """FPDF 1.x sólo maneja latin-1: lo demás (emojis, etc.) se reemplaza"""
+    return str(texto).encode('latin-1', 'replace').decode('latin-1')
+
+
+class Documento(FPDF):
+    def __init__(self, titulo):
+        super().__init__()
+        self.titulo = titulo
+        self.set_auto_page_break(True, margin=15)
+
+    def header(self):
+        self.set_font("Arial", 'B', 16)
+        self.cell(0, 10, self.titulo, ln=1, align='C')
+        self.ln(4)
+
+    def footer(self):
+        self.set_y(-12)
+        self.set_font("Arial", 'I', 8)
+        self.cell(0, 8, f"Página {self.page_no()}", align='C')
+
+
+def _iniciar_trabajador():
+    """Se ejecuta una vez por proceso: plantilla de la tabla del estado de cuenta y
+    métricas de las fuentes (FPDF las lee de disco la primera vez que se usa cada una)"""
+    global _PLANTILLA
+    if _PLANTILLA is not None: return
+    columnas = [("Fecha", 24), ("Descripción", 96), ("Cargo", 35), ("Abono", 35)]
+    _PLANTILLA = {"columnas": columnas, "encabezado": [(_latin1(n), a) for n, a in columnas]}
+    pdf = FPDF()
+    for familia, estilo in FUENTES: pdf.set_font(familia, estilo, 10)
+
+
+def generar_pdf(fecha, cuenta, monto, concepto):
+    """Recibo de un solo movimiento"""
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", 'B', 16)
+    pdf.cell(0, 10, "COMPROBANTE", ln=1, align='C')
+    pdf.ln(10)
+    pdf.set_font("Arial", size=12)
+    pdf.cell(0, 10, _latin1(f"Fecha: {fecha}"), ln=1); pdf.cell(0, 10, _latin1(f"Cuenta: {cuenta}"), ln=1)
+    pdf.cell(0, 10, f"Monto: ${monto:,.2f}", ln=1); pdf.cell(0, 10, _latin1(f"Concepto: {concepto}"), ln=1)
+    return pdf.output(dest='S').encode('latin-1')
+
+
+def estado_de_cuenta(cuenta, periodo, saldo_inicial, filas):
+    """Estado mensual multipágina; `filas` = [(fecha_str, descripcion, importe_real), ...]"""
+    if _PLANTILLA is None: _iniciar_trabajador()
+    pdf = Documento("ESTADO DE CUENTA")
+    pdf.add_page()
+    pdf.set_font("Arial", size=11)
+    pdf.cell(0, 7, _latin1(f"Cuenta: {cuenta}"), ln=1)
+    pdf.cell(0, 7, f"Periodo: {periodo}", ln=1)
+    pdf.cell(0, 7, f"Saldo inicial: ${saldo_inicial:,.2f}", ln=1)
+    pdf.ln(3)
+
+    columnas = _PLANTILLA["columnas"]
+    pdf.set_font("Arial", 'B', 9)
+    for nombre, ancho in _PLANTILLA["encabezado"]: pdf.cell(ancho, 7, nombre, border=1)
+    pdf.ln()
+    pdf.set_font("Arial", size=9)
+    cargos = abonos = 0.0
+    for fecha, desc, importe in filas:
+        cargo, abono = (-importe, 0.0) if importe < 0 else (0.0, importe)
+        cargos += cargo; abonos += abono
+        valores = [fecha, _latin1(desc)[:60], f"{cargo:,.2f}" if cargo else "", f"{abono:,.2f}" if abono else ""]
+        for (_, ancho), v in zip(columnas, valores): pdf.cell(ancho, 6, v, border=1)
+        pdf.ln()
+
+    pdf.ln(3)
+    pdf.set_font("Arial", 'B', 10)
+    pdf.cell(0, 7, f"Cargos: ${cargos:,.2f}    Abonos: ${abonos:,.2f}", ln=1)
+    pdf.cell(0, 7, f"Saldo final: ${saldo_inicial + abonos - cargos:,.2f}", ln=1)
+    return pdf.output(dest='S').encode('latin-1')
+
+
+def _renderizar(trabajo):
+    tipo, nombre, args = trabajo
+    return nombre, (generar_pdf if tipo == "recibo" else estado_de_cuenta)(*args)
+
+
+# ---------- lotes ----------
+def trabajos_cierre(df_movs, mes):
+    """Estados de cuenta de todas las cuentas + recibos de cada cobro del mes"""
+    inicio = pd.Timestamp(mes).to_period('M').to_timestamp()
+    fin = inicio + pd.DateOffset(months=1)
+    periodo = inicio.strftime('%Y-%m')
+    trabajos = []
+    if df_movs.empty: return trabajos
+    antes = df_movs[df_movs['FECHA'] < inicio].groupby(df_movs['BANCO'].astype(str), observed=True)['IMPORTE_REAL'].sum()
+    del_mes = df_movs[(df_movs['FECHA'] >= inicio) & (df_movs['FECHA'] < fin)].sort_values('FECHA', kind='stable')
+    for cuenta, g in del_mes.groupby(del_mes['BANCO'].astype(str), observed=True):
+        filas = list(zip(g['FECHA'].dt.strftime('%d/%m/%Y'), g['DESCRIPCION'].astype(str), g['IMPORTE_REAL'].astype(float)))
+        trabajos.append(("estado", f"estado_{periodo}_{cuenta}.pdf", (cuenta, periodo, float(antes.get(cuenta, 0.0)), filas)))
+    cobros = del_mes[del_mes['DESCRIPCION'].astype(str).str.startswith("Cobro ")]
+    for i, r in enumerate(cobros.itertuples(index=False), 1):
+        trabajos.append(("recibo", f"recibo_{periodo}_{i:04d}.pdf", (r.FECHA.strftime('%Y-%m-%d'), str(r.BANCO), float(r.IMPORTE), str(r.DESCRIPCION))))
+    return trabajos
+
+
+def crear_pool(procesos=None):
+    """Pool de procesos "spawn" para generar_lote, pensado para vivir todo el proceso"""
+    return ProcessPoolExecutor(procesos or os.cpu_count() or 1, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=_iniciar_trabajador)
+
+
+def generar_lote(trabajos, procesos=None, pool=None):
+    """Renderiza en paralelo y devuelve un ZIP (bytes) con todos los PDF.
+    Sin `pool` se crea uno para este lote y se cierra al terminar."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
+        if len(trabajos) < 4 or procesos == 1:
+            _iniciar_trabajador()
+            resultados = map(_renderizar, trabajos)
+            for nombre, datos in resultados: zf.writestr(nombre, datos)
+        else:
+            procesos = procesos or os.cpu_count() or 1
+            chunk = max(1, len(trabajos) // (procesos * 4))
+            propio = pool is None
+            pool = pool or crear_pool(procesos)
+            try:
+                for nombre, datos in pool.map(_renderizar, trabajos, chunksize=chunk): zf.writestr(nombre, datos)
+            finally:
+                if propio: pool.shutdown()
+    return buf.getvalue()
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+# ================= ESQUEMA DE LAS HOJAS =================
+# Tipo declarado por columna: (clase, valor si falta la columna, relleno de NaN).
+#   fecha      -> datetime64 (ISO primero, luego dd/mm/aaaa, luego inferencia día/mes)
+#   importe    -> float64 en valor absoluto (acepta "1,234.50")
+#   numero     -> float64 (acepta "5%")
+#   categoria  -> category (pocas cuentas / tipos repetidos miles de veces)
+#   texto      -> str
+ESQUEMAS = {
+    "Hoja 1": {
+        "FECHA": ("fecha", None, None),
+        "IMPORTE": ("importe", None, 0),
+        "PLAZO_MESES": ("numero", 0, None),
+        "INTERES": ("numero", 0, None),
+        "DIA_CORTE": ("numero", 0, None),
+        "ORIGEN": ("categoria", None, None),
+        "TIPO": ("categoria", None, None),
+        "BANCO": ("categoria", None, None),
+        "DESCRIPCION": ("texto", None, None),
+    },
+    "Deudas": {c: ("numero", None, 0) for c in ['MONTO_TOTAL', 'ABONADO', 'PLAZO_MESES', 'DIA_CORTE', 'DIA_PAGO', 'INTERES_ORIGINAL', 'LIMITE_CREDITO']},
+    "Inversiones": {"MONTO_INICIAL": ("numero", None, 0)},
+}
+FORMATOS_FECHA = ['%Y-%m-%d', '%d/%m/%Y']
+
+
+def parsear_fechas(serie):
+    """Formatos explícitos (rápidos) primero; lo que sobre, como día/mes/año"""
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie
+    texto = serie.astype(str).str.strip()
+    fechas = pd.to_datetime(texto.str[:10], errors='coerce', format=FORMATOS_FECHA[0])
+    for fmt in FORMATOS_FECHA[1:]:
+        resto = fechas.isna()
+        if not resto.any(): return fechas
+        fechas[resto] = pd.to_datetime(texto[resto], errors='coerce', format=fmt)
+    resto = fechas.isna() & serie.notna() & (texto != '')
+    if resto.any():
+        fechas[resto] = pd.to_datetime(texto[resto], errors='coerce', dayfirst=True, format='mixed')
+    return fechas
+
+
+def parsear_numeros(serie, quitar=',%'):
+    """float64; texto no numérico -> NaN"""
+    if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+        return serie.astype(float)
+    # gspread ya entrega casi todo como número: sólo se limpia lo que vino como texto
+    num = pd.to_numeric(serie, errors='coerce')
+    texto = num.isna() & serie.notna()
+    if texto.any():
+        s = serie[texto].astype(str).str.strip()
+        for ch in quitar:
+            s = s.str.replace(ch, '', regex=False)
+        num[texto] = pd.to_numeric(s, errors='coerce')
+    return num.astype(float)
+
+
+def tipar(df, hoja):
+    """Aplica el esquema declarado de `hoja` columna por columna (sin apply por fila)"""
+    if df.empty: return df
+    for col, (clase, faltante, relleno) in ESQUEMAS.get(hoja, {}).items():
+        if col not in df.columns:
+            if faltante is not None: df[col] = faltante
+            continue
+        if clase == "fecha":
+            df[col] = parsear_fechas(df[col])
+        elif clase in ("numero", "importe"):
+            v = parsear_numeros(df[col])
+            if clase == "importe": v = v.abs()
+            df[col] = v if relleno is None else v.fillna(relleno)
+        elif clase == "categoria":
+            df[col] = df[col].astype(str).astype('category')
+        elif clase == "texto":
+            df[col] = df[col].astype(str)
+    return df
+
+
+def es_gasto(tipo):
+    """True donde TIPO contiene 'GASTO' (se evalúa sobre las categorías, no fila por fila)"""
+    if isinstance(tipo.dtype, pd.CategoricalDtype):
+        cats = tipo.cat.categories.astype(str).str.upper().str.contains('GASTO', regex=False)
+        return np.asarray(cats, dtype=bool)[tipo.cat.codes.to_numpy()] & (tipo.cat.codes.to_numpy() >= 0)
+    return tipo.astype(str).str.upper().str.contains('GASTO', regex=False).to_numpy()
+
+
+def importe_real(df):
+    """GASTO es negativo, lo demás positivo ('Devolucion' suma)"""
+    imp = df['IMPORTE'].to_numpy()
+    return pd.Series(np.where(es_gasto(df['TIPO']), -imp, imp), index=df.index)
@@ -0,0 +1,92 @@
+import hashlib
+import os
+import threading
+import time
+
+import pandas as pd
+
+# ================= EXPORTACIÓN (EXCEL / CSV) =================
+# Los archivos se generan sólo cuando el usuario los pide, por bloques para que
+# la memoria no crezca con el historial, y se guardan en disco con una clave
+# (versión de datos + filtro + formato) para no regenerar lo mismo dos veces.
+RUTA_EXPORTS = os.path.join(".cache", "exports")
+BLOQUE = 20_000
+# Un .tmp puede ser el export en curso de otra sesión: sólo se borra si quedó
+# abandonado (más viejo que esto)
+MAX_TMP = 6 * 3600  # segundos
+
+
+def filtrar_movimientos(df, desde=None, hasta=None, cuentas=None):
+    """Rango de fechas (inclusive) y cuentas; None = sin filtro"""
+    if df.empty: return df
+    mask = pd.Series(True, index=df.index)
+    if desde is not None: mask &= df['FECHA'] >= pd.Timestamp(desde)
+    if hasta is not None: mask &= df['FECHA'] < pd.Timestamp(hasta) + pd.Timedelta(days=1)
+    if cuentas: mask &= df['BANCO'].astype(str).isin([str(c) for c in cuentas])
+    return df[mask].sort_values('FECHA', kind='stable')
+
+
+def _bloques(df, tam=BLOQUE):
+    for a in range(0, len(df), tam):
+        yield df.iloc[a:a + tam]
+
+
+def escribir_csv(df, ruta, tam=BLOQUE):
+    for i, b in enumerate(_bloques(df, tam)):
+        b.to_csv(ruta, mode='w' if i == 0 else 'a', header=i == 0, index=False, encoding='utf-8-sig' if i == 0 else 'utf-8')
+    if df.empty: df.to_csv(ruta, index=False, encoding='utf-8-sig')
+
+
+def escribir_excel(df, ruta, tam=BLOQUE):
+    """xlsxwriter en modo constant_memory: cada fila se escribe y se libera"""
+    import xlsxwriter
+    wb = xlsxwriter.Workbook(ruta, {'constant_memory': True, 'nan_inf_to_errors': True})
+    fmt_fecha = wb.add_format({'num_format': 'yyyy-mm-dd'})
+    ws = wb.add_worksheet("Bitácora")
+    ws.write_row(0, 0, [str(c) for c in df.columns])
+    fechas = [i for i, c in enumerate(df.columns) if pd.api.types.is_datetime64_any_dtype(df[c])]
+    for c in fechas: ws.set_column(c, c, 12, fmt_fecha)
+    fila = 1
+    for b in _bloques(df, tam):
+        b = b.astype(object).where(b.notna(), None)
+        for valores in b.itertuples(index=False, name=None):
+            ws.write_row(fila, 0, valores)
+            fila += 1
+    wb.close()
+
+
+def clave_export(version, desde, hasta, cuentas, formato):
+    crudo = repr((version, str(desde), str(hasta), sorted(map(str, cuentas or [])), formato))
+    return hashlib.sha1(crudo.encode('utf-8')).hexdigest()[:16]
+
+
+def exportar(df, version, desde=None, hasta=None, cuentas=None, formato="xlsx", carpeta=RUTA_EXPORTS, conservar=8):
+    """Devuelve la ruta del archivo; si ya existe para esa clave no se regenera"""
+    os.makedirs(carpeta, exist_ok=True)
+    ruta = os.path.join(carpeta, f"bitacora_{clave_export(version, desde, hasta, cuentas, formato)}.{formato}")
+    if not os.path.exists(ruta):
+        sel = filtrar_movimientos(df, desde, hasta, cuentas)
+        tmp = f"{ruta}.{os.getpid()}-{threading.get_ident()}.tmp"  # propio de esta sesión
+        (escribir_excel if formato == "xlsx" else escribir_csv)(sel, tmp)
+        os.replace(tmp, ruta)
+    limpiar(carpeta, conservar, ruta)
+    return ruta
+
+
+def limpiar(carpeta, conservar=8, actual=None):
+    """Deja los `conservar` exports más recientes y los .tmp que aún pueden estar en curso"""
+    terminados, ahora = [], time.time()
+    for f in os.listdir(carpeta):
+        if not f.startswith("bitacora_"): continue
+        ruta = os.path.join(carpeta, f)
+        try: mtime = os.path.getmtime(ruta)
+        except OSError: continue  # otra sesión lo acaba de mover o borrar
+        if not f.endswith(".tmp"): terminados.append((mtime, ruta))
+        elif ahora - mtime > MAX_TMP: _borrar(ruta)
+    for _, viejo in sorted(terminados)[:-conservar]:
+        if viejo != actual: _borrar(viejo)
+
+
+def _borrar(ruta):
+    try: os.remove(ruta)
+    except OSError: pass
@@ -0,0 +1,268 @@
+import codecs
+import os
+import re
+
+import pandas as pd
+
+from finanzas.almacen import ENCABEZADOS
+from finanzas.bitacora import palabras
+from finanzas.esquema import parsear_fechas, parsear_numeros
+
+# ================= IMPORTADOR DE ESTADOS DE CUENTA =================
+# CSV y OFX/QFX se leen por trozos de `tamano` movimientos (nunca el archivo
+# completo en memoria). Cada trozo:
+#   1. se mapea al esquema de "Hoja 1" (columnas por alias del encabezado); el
+#      separador decimal de los importes (1,234.50 o 1.234,50) se detecta en el
+#      primer trozo que lo deje ver y se mantiene para el resto del archivo
+#   2. se deduplica contra lo ya guardado por huella: fecha + importe +
+#      cuenta + descripción normalizada (hash vectorizado, sin ciclos por fila)
+#   3. lo que sobrevive se anexa en una sola llamada (append_rows por trozo)
+TAMANO = 5000
+COLUMNAS = ENCABEZADOS["Hoja 1"]
+ORIGEN = "Importado"
+
+# Encabezado normalizado (minúsculas, sin acentos ni signos) -> campo
+ALIAS = {
+    "FECHA": ["fecha", "date", "fechaoperacion", "fechadeoperacion", "fechamovimiento", "fechavalor", "posteddate", "transactiondate"],
+    "DESCRIPCION": ["descripcion", "concepto", "description", "detalle", "movimiento", "nombre", "name", "payee", "memo"],
+    "IMPORTE": ["importe", "monto", "amount", "cantidad", "valor"],
+    "CARGO": ["cargo", "cargos", "retiro", "retiros", "debito", "debit", "withdrawal"],
+    "ABONO": ["abono", "abonos", "deposito", "depositos", "credito", "credit", "deposit"],
+    "TIPO": ["tipo", "type"],
+    "BANCO": ["banco", "bank"],
+    "REFERENCIA": ["referencia", "reference", "folio", "fitid"],
+}
+# Valores de TIPO en el archivo -> TIPO de la app (lo demás se decide por el signo)
+TIPOS = {"gasto": "Gasto", "ingreso": "Ingreso", "pago": "Pago", "devolucion": "Devolucion",
+         "cargo": "Gasto", "retiro": "Gasto", "debito": "Gasto", "debit": "Gasto",
+         "abono": "Ingreso", "deposito": "Ingreso", "credito": "Ingreso", "credit": "Ingreso"}
+_SIGNOS = re.compile(r"[^a-z0-9]+")
+CAMPOS_IMPORTE = ("IMPORTE", "CARGO", "ABONO")
+
+# OFX: hojas de cada <STMTTRN> que se usan
+CAMPOS_OFX = {"DTPOSTED": "FECHA", "TRNAMT": "IMPORTE", "NAME": "DESCRIPCION", "MEMO": "MEMO", "FITID": "REFERENCIA"}
+_ETIQUETA = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+# ---------- lectura por trozos ----------
+def _separador(origen):
+    """El más frecuente en el encabezado entre , ; tabulador y |"""
+    if isinstance(origen, (str, os.PathLike)):
+        with open(origen, "rb") as f: linea = f.readline()
+    else:
+        pos = origen.tell()
+        linea = origen.readline()
+        origen.seek(pos)
+    if isinstance(linea, bytes): linea = linea.decode("utf-8", "replace")
+    return max([",", ";", "\t", "|"], key=linea.count)
+
+
+def leer_csv(origen, tamano=TAMANO, **opciones):
+    """DataFrames de texto de hasta `tamano` filas (ruta o archivo abierto)"""
+    opciones = {"encoding": "utf-8-sig", "skipinitialspace": True, **opciones}
+    if "sep" not in opciones: opciones["sep"] = _separador(origen)
+    yield from pd.read_csv(origen, chunksize=tamano, dtype=str, keep_default_na=False, **opciones)
+
+
+def _textos(origen, encoding, bloque=1 << 16):
+    """El archivo como texto, `bloque` bytes a la vez"""
+    decodificar = codecs.getincrementaldecoder(encoding)(errors="replace")
+    archivo = open(origen, "rb") if isinstance(origen, (str, os.PathLike)) else origen
+    try:
+        while True:
+            datos = archivo.read(bloque)
+            if not datos: break
+            yield datos if isinstance(datos, str) else decodificar.decode(datos)
+        yield decodificar.decode(b"", final=True)
+    finally:
+        if archivo is not origen: archivo.close()
+
+
+def _etiquetas_ofx(origen, encoding):
+    """(es_cierre, ETIQUETA, valor) en orden; SGML (hojas sin cierre) o XML"""
+    resto = ""
+    for texto in _textos(origen, encoding):
+        texto = resto + texto
+        # La última etiqueta puede venir cortada: se completa con el siguiente bloque
+        corte = texto.rfind("<")
+        if corte <= 0:
+            resto = texto
+            continue
+        texto, resto = texto[:corte], texto[corte:]
+        for m in _ETIQUETA.finditer(texto): yield m.group(1) == "/", m.group(2).upper(), m.group(3).strip()
+    for m in _ETIQUETA.finditer(resto): yield m.group(1) == "/", m.group(2).upper(), m.group(3).strip()
+
+
+def _trozo_ofx(movs):
+    df = pd.DataFrame(movs, columns=list(dict.fromkeys(CAMPOS_OFX.values())))
+    df["FECHA"] = pd.to_datetime(df["FECHA"].str[:8], format="%Y%m%d", errors="coerce").dt.strftime("%Y-%m-%d")
+    # NAME suele venir truncado a 32 caracteres; MEMO completa el concepto
+    memo = df.pop("MEMO").fillna("")
+    nombre = df["DESCRIPCION"].fillna("")
+    df["DESCRIPCION"] = nombre.where((memo == "") | (memo == nombre), (nombre + " " + memo).str.strip())
+    return df
+
+
+def leer_ofx(origen, tamano=TAMANO, encoding="utf-8"):
+    """DataFrames (FECHA, IMPORTE con signo, DESCRIPCION, REFERENCIA) de hasta `tamano` <STMTTRN>"""
+    movs, actual = [], None
+    for cierre, etiqueta, valor in _etiquetas_ofx(origen, encoding):
+        if etiqueta == "STMTTRN":
+            if actual: movs.append(actual)
+            actual = None if cierre else {}
+            if len(movs) >= tamano:
+                yield _trozo_ofx(movs)
+                movs = []
+        elif actual is not None and not cierre and etiqueta in CAMPOS_OFX:
+            actual[CAMPOS_OFX[etiqueta]] = valor
+    if actual: movs.append(actual)
+    if movs: yield _trozo_ofx(movs)
+
+
+def leer(origen, formato=None, tamano=TAMANO):
+    """Según `formato` ('csv' / 'ofx' / 'qfx') o la extensión del nombre del archivo"""
+    if formato is None:
+        nombre = origen if isinstance(origen, (str, os.PathLike)) else getattr(origen, "name", "")
+        formato = os.path.splitext(str(nombre))[1].lstrip(".")
+    if formato.lower() in ("ofx", "qfx"): return leer_ofx(origen, tamano)
+    return leer_csv(origen, tamano)
+
+
+# ---------- mapeo a "Hoja 1" ----------
+def _clave(texto):
+    return _SIGNOS.sub("", " ".join(palabras(texto)))
+
+
+def columnas(encabezado):
+    """{campo: columna del archivo}, la primera que coincida con algún alias"""
+    claves = {c: _clave(c) for c in encabezado}
+    res = {}
+    for campo, alias in ALIAS.items():
+        for c in encabezado:
+            if claves[c] in alias:
+                res[campo] = c
+                break
+    return res
+
+
+def separador_decimal(df):
+    """"," si los importes del trozo usan coma decimal (50,00 / 1.234,50 / 1.234), "."
+    si usan punto (1,234.50 / 1,234) y None si no se puede saber (2500, o ambos)"""
+    cols = columnas(list(df.columns))
+    partes = [df[cols[c]] for c in CAMPOS_IMPORTE if c in cols]
+    if not partes: return None
+    texto = pd.concat(partes).astype(str).str.strip()
+    # Decimales: 1 o 2 cifras al final; miles: grupos de 3 sin decimales
+    coma = texto.str.contains(r"\d,\d{1,2}$|\d\.\d{3}$").any()
+    punto = texto.str.contains(r"\d\.\d{1,2}$|\d,\d{3}$").any()
+    if coma != punto: return "," if coma else "."
+    return None
+
+
+def _importe(serie, decimal):
+    if decimal == ",":
+        # 1.234,50 -> 1234.50: el punto es de miles y la coma pasa a punto decimal
+        serie = serie.astype(str).str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+        return parsear_numeros(serie, quitar="$ ")
+    return parsear_numeros(serie, quitar=",$ ")
+
+
+def mapear(df, banco=None, dia_corte=0, decimal=None):
+    """Trozo leído -> filas de "Hoja 1" (en el orden de COLUMNAS); descarta sin fecha o sin importe.
+    `decimal` ("," o "."); si es None se detecta en el trozo (punto si no se nota)."""
+    cols = columnas(list(df.columns))
+    if "FECHA" not in cols or not (set(CAMPOS_IMPORTE) & set(cols)):
+        raise ValueError(f"No se reconocen las columnas de fecha e importe: {list(df.columns)}")
+
+    def col(campo, defecto=""):
+        return df[cols[campo]] if campo in cols else pd.Series(defecto, index=df.index)
+
+    decimal = decimal or separador_decimal(df)
+    if "IMPORTE" in cols:
+        importe = _importe(col("IMPORTE"), decimal)
+    else:
+        importe = (_importe(col("ABONO"), decimal).fillna(0)
+                   - _importe(col("CARGO"), decimal).fillna(0).abs())
+    # TIPO reconocido (exportación propia, "Cargo"/"Abono") se respeta; si no, el signo decide
+    tipo = _normalizados(col("TIPO")).map(TIPOS)
+    tipo = tipo.fillna(pd.Series("Gasto", index=df.index).where(importe < 0, "Ingreso"))
+    fecha = parsear_fechas(col("FECHA"))
+    cuenta = col("BANCO").astype(str).str.strip()
+    cuenta = cuenta.where(cuenta != "", banco or "Efectivo")
+
+    res = pd.DataFrame({
+        "ORIGEN": ORIGEN,
+        "FECHA": fecha.dt.strftime("%Y-%m-%d"),
+        "DESCRIPCION": col("DESCRIPCION").astype(str).str.strip(),
+        "IMPORTE": importe.abs().round(2),
+        "NOTA": "-",
+        "REFERENCIA": col("REFERENCIA", "-").astype(str).str.strip().replace("", "-"),
+        "TIPO": tipo,
+        "BANCO": cuenta,
+        "PLAZO_MESES": 1,
+        "INTERES": 0,
+        "DIA_CORTE": int(dia_corte or 0),
+    }, index=df.index)[COLUMNAS]
+    return res[fecha.notna() & importe.notna() & (importe != 0)]
+
+
+# ---------- deduplicación ----------
+def _normalizados(serie):
+    """palabras normalizadas (ver finanzas.bitacora), calculadas una vez por valor distinto"""
+    texto = serie.astype(str)
+    return texto.map({v: " ".join(palabras(v)) for v in pd.unique(texto)})
+
+
+def huellas(df):
+    """uint64 por fila a partir de fecha, importe en centavos, cuenta y descripción"""
+    if df.empty: return pd.Series([], dtype="uint64")
+    clave = pd.DataFrame({
+        "FECHA": parsear_fechas(df["FECHA"]).dt.strftime("%Y-%m-%d").fillna(""),
+        "CENTAVOS": (parsear_numeros(df["IMPORTE"]).abs() * 100).round().fillna(-1).astype("int64"),
+        "BANCO": _normalizados(df["BANCO"]),
+        "DESCRIPCION": _normalizados(df["DESCRIPCION"]),
+    })
+    return pd.util.hash_pandas_object(clave, index=False)
+
+
+class Deduplicador:
+    """Multiconjunto de huellas ya guardadas. Un movimiento que el estado trae
+    n veces (dos cafés iguales el mismo día) sólo se omite hasta las veces que
+    ya existe, así que reimportar el mismo archivo no agrega nada."""
+
+    def __init__(self, existentes=None):
+        vacio = existentes is None or existentes.empty
+        self.existentes = pd.Series(dtype="int64") if vacio else huellas(existentes).value_counts()
+        self.vistos = pd.Series(dtype="int64")
+
+    def filtrar(self, df):
+        h = huellas(df).set_axis(df.index)
+        # Número de aparición de cada huella contando los trozos anteriores del mismo archivo
+        aparicion = h.groupby(h).cumcount() + h.map(self.vistos).fillna(0).astype("int64")
+        ya = h.map(self.existentes).fillna(0).astype("int64")
+        self.vistos = self.vistos.add(h.value_counts(), fill_value=0).astype("int64")
+        return df[(aparicion >= ya).to_numpy()]
+
+
+# ---------- importación ----------
+def importar(origen, destino, banco=None, existentes=None, formato=None, tamano=TAMANO, dia_corte=0):
+    """Lee, mapea, deduplica y anexa a "Hoja 1" trozo por trozo.
+
+    `destino` es una ColaEscritura o un almacén (cualquier objeto con anexar);
+    `existentes` los movimientos ya guardados (df_movs). Devuelve el resumen.
+    """
+    resumen = {"leidas": 0, "invalidas": 0, "duplicadas": 0, "nuevas": 0, "lotes": 0}
+    dedup = Deduplicador(existentes)
+    decimal = None
+    for trozo in leer(origen, formato, tamano):
+        decimal = decimal or separador_decimal(trozo)
+        filas = mapear(trozo, banco, dia_corte, decimal)
+        nuevas = dedup.filtrar(filas)
+        resumen["leidas"] += len(trozo)
+        resumen["invalidas"] += len(trozo) - len(filas)
+        resumen["duplicadas"] += len(filas) - len(nuevas)
+        if nuevas.empty: continue
+        destino.anexar("Hoja 1", nuevas.astype(object).to_numpy().tolist())
+        resumen["nuevas"] += len(nuevas)
+        resumen["lotes"] += 1
+    return resumen
@@ -0,0 +1,32 @@
+from finanzas.almacen import ENCABEZADOS
+
+# ================= LOCALIZADOR DE FILAS =================
+# Mapa clave -> número de fila de la hoja y encabezado -> número de columna,
+# armado con los mismos registros que se muestran (lectura + cola de escritura),
+# así que ya incluye las filas anexadas que aún no llegan a Sheets. Con él una
+# actualización es una escritura directa a (fila, columna) sin find() en el
+# servidor ni índices de columna fijos.
+
+
+class Localizador:
+    def __init__(self, registros, hoja="Deudas", clave="NOMBRE"):
+        encabezado = list(registros[0].keys()) if registros else list(ENCABEZADOS.get(hoja, []))
+        self.hoja = hoja
+        self.clave = clave
+        self.columnas = {c: i for i, c in enumerate(encabezado, 1)}
+        self.filas = {}
+        for i, r in enumerate(registros):
+            self._registrar(r.get(clave, ""), i + 2)
+
+    def _registrar(self, valor, fila):
+        # Si el nombre se repite gana la primera fila, igual que find()
+        self.filas.setdefault(str(valor).strip(), fila)
+
+    def fila(self, valor):
+        return self.filas.get(str(valor).strip())
+
+    def celdas(self, valor, **cambios):
+        """[(fila, columna, valor)] para `cambios` = {COLUMNA: valor}; KeyError si no se encuentra"""
+        fila = self.fila(valor)
+        if fila is None: raise KeyError(f"'{valor}' no está en la columna {self.clave} de {self.hoja}")
+        return [(fila, self.columnas[c], v) for c, v in cambios.items() if c in self.columnas]
@@ -0,0 +1,138 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+
+# ================= MÉTRICAS =================
+# Un solo registro por proceso (lo comparten los reruns de Streamlit y los hilos
+# de fondo: cola de escritura, lector de Telegram).
+#   tramo(nombre)        -> tiempo de una etapa (agregado + lista del rerun actual)
+#   contar(evento, n)    -> contadores acumulados + marcas de tiempo para "por minuto"
+#   cacheado(nombre, d)  -> envuelve un st.cache_data/resource y cuenta aciertos/fallos
+# Las llamadas a Sheets se cuentan en finanzas.cliente_sheets.
+# Al final de cada rerun se puede escribir una línea JSON con sus tramos y
+# contadores: sólo si se configura una ruta (secrets "metricas_path") o con la
+# variable de entorno FINANZAS_TRAZA=1 (va a RUTA_METRICAS). Al pasar de
+# MAX_TRAZA bytes el archivo se rota a <ruta>.1 (se conserva uno anterior).
+RUTA_METRICAS = os.path.join(".cache", "metricas.jsonl")
+MAX_TRAZA = 5_000_000
+
+# Cuota por usuario de la API de Sheets (peticiones por minuto)
+CUOTA_LECTURA = 60
+CUOTA_ESCRITURA = 60
+
+
+def ruta_traza(ruta=None):
+    """Archivo de la traza por rerun: `ruta` si se configuró ("" la apaga); si no,
+    RUTA_METRICAS sólo con FINANZAS_TRAZA en el entorno"""
+    if ruta is not None: return ruta or None
+    return RUTA_METRICAS if os.environ.get("FINANZAS_TRAZA", "") not in ("", "0") else None
+
+
+class Metricas:
+    def __init__(self, ventana=60):
+        self.ventana = ventana
+        self.contadores = Counter()
+        self.tramos = defaultdict(lambda: {"n": 0, "total": 0.0, "max": 0.0, "ultimo": 0.0})
+        self._marcas = defaultdict(deque)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # ---------- registro ----------
+    @contextmanager
+    def tramo(self, nombre):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            seg = time.perf_counter() - t
+            with self._lock:
+                s = self.tramos[nombre]
+                s["n"] += 1; s["total"] += seg; s["ultimo"] = seg
+                s["max"] = max(s["max"], seg)
+            rerun = getattr(self._local, "rerun", None)
+            if rerun is not None: rerun["tramos"].append((nombre, seg))
+
+    def contar(self, evento, n=1):
+        ahora = time.time()
+        with self._lock:
+            self.contadores[evento] += n
+            marcas = self._marcas[evento]
+            marcas.extend([ahora] * n)
+            while marcas and marcas[0] < ahora - self.ventana: marcas.popleft()
+
+    def por_minuto(self, evento):
+        """Eventos en la última ventana (60 s por defecto)"""
+        limite = time.time() - self.ventana
+        with self._lock:
+            return sum(1 for t in self._marcas.get(evento, ()) if t >= limite)
+
+    # ---------- caches de Streamlit ----------
+    def cacheado(self, nombre, decorador):
+        """decorador(fn) con conteo: el cuerpo sólo corre en un fallo de cache"""
+        def envolver(fn):
+            @functools.wraps(fn)
+            def calculo(*args, **kwargs):
+                self.contar(f"cache.{nombre}.fallos")
+                return fn(*args, **kwargs)
+            en_cache = decorador(calculo)
+
+            @functools.wraps(fn)
+            def llamada(*args, **kwargs):
+                self.contar(f"cache.{nombre}.llamadas")
+                with self.tramo(nombre):
+                    return en_cache(*args, **kwargs)
+            llamada.clear = en_cache.clear
+            return llamada
+        return envolver
+
+    def caches(self):
+        """{nombre: (llamadas, fallos, tasa de acierto)}"""
+        res = {}
+        for evento, n in list(self.contadores.items()):
+            if evento.startswith("cache.") and evento.endswith(".llamadas"):
+                nombre = evento[6:-9]
+                fallos = self.contadores[f"cache.{nombre}.fallos"]
+                res[nombre] = (n, fallos, 1 - fallos / n if n else 0.0)
+        return res
+
+    # ---------- rerun ----------
+    def iniciar_rerun(self):
+        self._local.rerun = {"inicio": time.perf_counter(), "tramos": [], "contadores": Counter(self.contadores)}
+
+    def cerrar_rerun(self, ruta=None):
+        """Resumen del rerun actual; se anexa como línea JSON si hay `ruta`"""
+        rerun = getattr(self._local, "rerun", None)
+        if rerun is None: return None
+        self._local.rerun = None
+        with self._lock:
+            delta = {k: v - rerun["contadores"].get(k, 0) for k, v in self.contadores.items() if v != rerun["contadores"].get(k, 0)}
+        registro = {
+            "ts": time.time(),
+            "total_ms": round(1000 * (time.perf_counter() - rerun["inicio"]), 2),
+            "tramos": {n: round(1000 * s, 2) for n, s in _sumar(rerun["tramos"]).items()},
+            "contadores": delta,
+            "sheets_lecturas_min": self.por_minuto("sheets.lectura"),
+            "sheets_escrituras_min": self.por_minuto("sheets.escritura"),
+        }
+        if ruta:
+            try:
+                carpeta = os.path.dirname(ruta)
+                if carpeta: os.makedirs(carpeta, exist_ok=True)
+                if os.path.exists(ruta) and os.path.getsize(ruta) > MAX_TRAZA: os.replace(ruta, ruta + ".1")
+                with open(ruta, "a", encoding="utf-8") as f: f.write(json.dumps(registro) + "\n")
+            except OSError: pass
+        return registro
+
+
+def _sumar(tramos):
+    total = defaultdict(float)
+    for nombre, seg in tramos: total[nombre] += seg
+    return total
+
+
+metricas = Metricas()
+
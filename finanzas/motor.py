@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+from finanzas.esquema import es_gasto as _es_gasto, parsear_fechas, parsear_numeros
+
+# ================= MOTOR: PROYECCIÓN FINANCIERA (MSI & INTERESES) =================
+COLUMNAS_FLUJO = ['FECHA', 'DESCRIPCION', 'IMPORTE', 'IMPORTE_REAL', 'CATEGORIA', 'TIPO_FLUJO', 'BANCO']
+
+
+def _a_numero(serie, quitar=''):
+    """Convierte una columna a float (NaN si no es numérica), quitando caracteres sueltos"""
+    return parsear_numeros(serie, quitar)
+
+
+def _a_entero(serie, defecto):
+    """Equivalente vectorizado de int(float(str(x))) con valor por defecto"""
+    v = _a_numero(serie).to_numpy()
+    v = np.where(np.isfinite(v), np.trunc(v), defecto)
+    return v.astype(np.int64)
+
+
+def sumar_meses(fechas, meses):
+    """Suma meses a un arreglo datetime64 recortando al fin de mes (como relativedelta)"""
+    fechas = np.asarray(fechas, dtype='datetime64[ns]')
+    dias = fechas.astype('datetime64[D]')
+    hora = fechas - dias
+    mes_base = dias.astype('datetime64[M]')
+    dia = (dias - mes_base).astype(np.int64)
+    mes_dest = mes_base + np.asarray(meses, dtype=np.int64)
+    largo_mes = ((mes_dest + 1).astype('datetime64[D]') - mes_dest.astype('datetime64[D]')).astype(np.int64)
+    return mes_dest.astype('datetime64[D]') + np.minimum(dia, largo_mes - 1) + hora
+
+
+def generar_flujo_real(df_bruto, categorizador=None):
+    """Desglosa compras a meses e intereses en pagos mensuales.
+    CATEGORIA sale de las reglas de `categorizador` (finanzas.categorias); sin
+    regla que coincida, la primera palabra de la descripción."""
+    # Garantizar columnas mínimas
+    for c in ['PLAZO_MESES', 'INTERES', 'DIA_CORTE']:
+        if c not in df_bruto.columns: df_bruto[c] = 0
+    if df_bruto.empty:
+        return pd.DataFrame()
+
+    # 1. Parseo columnar (una sola vez por columna)
+    fecha = parsear_fechas(df_bruto['FECHA'])
+    monto = _a_numero(df_bruto['IMPORTE'], quitar=',').abs().to_numpy()
+    plazo = np.maximum(_a_entero(df_bruto['PLAZO_MESES'], 1), 1)
+    interes = np.nan_to_num(_a_numero(df_bruto['INTERES'], quitar='%').to_numpy(), nan=0.0, posinf=0.0, neginf=0.0)
+    dia_corte = _a_entero(df_bruto['DIA_CORTE'], 0)
+
+    desc = df_bruto['DESCRIPCION'].astype(str)
+    primera = desc.str.split().str[0]
+    categoria = primera if categorizador is None or not len(categorizador) else categorizador.aplicar(desc, primera)
+    es_gasto = _es_gasto(df_bruto['TIPO']) if 'TIPO' in df_bruto.columns else np.ones(len(df_bruto), dtype=bool)
+    banco = df_bruto['BANCO'].astype(str).to_numpy() if 'BANCO' in df_bruto.columns else np.full(len(df_bruto), '', dtype=object)
+
+    # Filas sin fecha, sin monto o sin descripción no generan flujo
+    validas = fecha.notna().to_numpy() & ~np.isnan(monto) & primera.notna().to_numpy()
+    if not validas.any():
+        return pd.DataFrame()
+
+    fecha = fecha.to_numpy(dtype='datetime64[ns]')[validas]
+    monto, plazo, interes, dia_corte = monto[validas], plazo[validas], interes[validas], dia_corte[validas]
+    desc, categoria = desc.to_numpy()[validas], categoria.to_numpy()[validas]
+    es_gasto, banco = es_gasto[validas], banco[validas]
+
+    # 2. Lógica Financiera
+    pago_mensual = monto * (1 + (interes / 100)) / plazo
+
+    # Lógica de Corte de Tarjeta: si la compra cae después del corte, inicia el mes siguiente
+    dia_compra = (fecha.astype('datetime64[D]') - fecha.astype('datetime64[M]').astype('datetime64[D]')).astype(np.int64) + 1
+    fecha_inicio = sumar_meses(fecha, ((dia_corte > 0) & (dia_compra > dia_corte)).astype(np.int64))
+
+    # 3. Expansión de mensualidades
+    idx = np.repeat(np.arange(len(plazo)), plazo)
+    inicio_bloque = np.cumsum(plazo) - plazo
+    num_pago = np.arange(len(idx)) - np.repeat(inicio_bloque, plazo)
+    fechas_pago = sumar_meses(fecha_inicio[idx], num_pago)
+
+    plazo_x = plazo[idx]
+    diferido = plazo_x > 1
+    sufijo = (' (' + pd.Series(num_pago + 1).astype(str) + '/' + pd.Series(plazo_x).astype(str) + ')').where(diferido, '')
+    pago_x = pago_mensual[idx]
+
+    return pd.DataFrame({
+        'FECHA': pd.to_datetime(fechas_pago),
+        'DESCRIPCION': pd.Series(desc[idx]).astype(str) + sufijo,
+        'IMPORTE': pago_x,
+        'IMPORTE_REAL': np.where(es_gasto[idx], -pago_x, pago_x),
+        'CATEGORIA': categoria[idx],
+        'TIPO_FLUJO': np.where(diferido, 'Diferido', 'Contado').astype(object),
+        'BANCO': banco[idx],
+    }, columns=COLUMNAS_FLUJO)
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+# ================= PRONÓSTICO DE LIQUIDEZ (MONTE CARLO) =================
+# Saldo mes a mes = saldo de arranque + comprometido + neto aleatorio.
+#   comprometido: mensualidades futuras del flujo proyectado (MSI / intereses),
+#                 pagos de préstamos y cobros pendientes de df_deudas
+#   aleatorio:    meses históricos de contado (entradas - salidas) re-muestreados
+#                 con reemplazo; se toma el mes completo para no romper la
+#                 relación entre lo que entra y lo que sale
+# Todos los escenarios se simulan juntos como una matriz escenarios × meses.
+PERCENTILES = [5, 25, 50, 75, 95]
+
+
+def _mes(fecha):
+    return pd.Timestamp(fecha).to_period('M').to_timestamp()
+
+
+def _meses_entre(fechas, inicio):
+    """Meses completos desde `inicio` (0 = mismo mes)"""
+    p = fechas.dt.to_period('M')
+    ini = pd.Timestamp(inicio).to_period('M')
+    return (p.dt.year - ini.year) * 12 + (p.dt.month - ini.month)
+
+
+def cuotas(restante, cuota, meses):
+    """Matriz deudas × meses: cuota fija hasta agotar el restante (la última, parcial)"""
+    restante = np.maximum(np.asarray(restante, dtype=float), 0)
+    cuota = np.maximum(np.asarray(cuota, dtype=float), 0)
+    pagado = cuota[:, None] * np.arange(meses)[None, :]
+    return np.clip(restante[:, None] - pagado, 0, cuota[:, None])
+
+
+def comprometido(df_flujo, df_deudas, inicio, meses):
+    """Vector de `meses` con el flujo ya pactado a partir del mes de `inicio`"""
+    total = np.zeros(meses)
+    if not df_flujo.empty:
+        dif = df_flujo[df_flujo['TIPO_FLUJO'] == 'Diferido']
+        k = _meses_entre(dif['FECHA'], inicio).to_numpy()
+        ok = (k >= 0) & (k < meses)
+        np.add.at(total, k[ok], dif['IMPORTE_REAL'].to_numpy()[ok])
+    if not df_deudas.empty and 'ESTADO' in df_deudas.columns:
+        activos = df_deudas[(df_deudas['ESTADO'] == 'Activo') & ~df_deudas['TIPO'].astype(str).str.contains('Tarjeta')]
+        if not activos.empty:
+            monto = activos['MONTO_TOTAL'].to_numpy(dtype=float)
+            plazo = np.maximum(activos['PLAZO_MESES'].to_numpy(dtype=float), 1)
+            signo = np.where(activos['TIPO'].astype(str).str.contains('Por Cobrar'), 1.0, -1.0)
+            total += (signo[:, None] * cuotas(monto - activos['ABONADO'].to_numpy(dtype=float), monto / plazo, meses)).sum(axis=0)
+    return total
+
+
+def historico_mensual(df_flujo, antes_de):
+    """Neto de contado por mes calendario cerrado (sin pagos/cobros de deudas)"""
+    if df_flujo.empty: return np.array([])
+    sel = df_flujo[(df_flujo['TIPO_FLUJO'] == 'Contado') & (df_flujo['FECHA'] < _mes(antes_de))]
+    sel = sel[~sel['DESCRIPCION'].astype(str).str.match(r'(Pago|Cobro) ')]
+    if sel.empty: return np.array([])
+    neto = sel.groupby(sel['FECHA'].dt.to_period('M'))['IMPORTE_REAL'].sum()
+    # Los meses sin movimientos también cuentan (neto 0)
+    neto = neto.reindex(pd.period_range(neto.index.min(), neto.index.max(), freq='M'), fill_value=0.0)
+    return neto.to_numpy(dtype=float)
+
+
+def simular(saldo_inicial, comprometidos, historico, escenarios=10_000, semilla=None):
+    """Matriz escenarios × meses con el saldo al cierre de cada mes"""
+    meses = len(comprometidos)
+    if len(historico):
+        rng = np.random.default_rng(semilla)
+        neto = historico[rng.integers(0, len(historico), size=(escenarios, meses))]
+    else:
+        neto = np.zeros((escenarios, meses))
+    neto += comprometidos
+    return saldo_inicial + np.cumsum(neto, axis=1, out=neto)
+
+
+def pronosticar(df_flujo, df_deudas, hoy=None, meses=24, escenarios=10_000, semilla=None):
+    """(bandas de percentiles y probabilidad de saldo negativo por mes, probabilidad en todo el horizonte)"""
+    actual = _mes(hoy or pd.Timestamp.now())
+    inicio = actual + pd.DateOffset(months=1)
+    saldo = float(df_flujo.loc[df_flujo['FECHA'] < inicio, 'IMPORTE_REAL'].sum()) if not df_flujo.empty else 0.0
+    # El mes en curso sigue abierto: el histórico sólo toma meses ya cerrados
+    tray = simular(saldo, comprometido(df_flujo, df_deudas, inicio, meses), historico_mensual(df_flujo, actual), escenarios, semilla)
+    bandas = np.percentile(tray, PERCENTILES, axis=0)
+    res = pd.DataFrame({f"P{p}": b for p, b in zip(PERCENTILES, bandas)})
+    res.insert(0, 'MES', pd.date_range(inicio, periods=meses, freq='MS'))
+    negativo = tray < 0
+    res['PROB_NEGATIVO'] = negativo.mean(axis=0)
+    return res, float(negativo.any(axis=1).mean())
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+# ================= SERIE DE SALDO =================
+# Saldo acumulado movimiento a movimiento, guardado como dos arreglos (fecha en
+# ns, saldo). La gráfica nunca recibe la serie completa: se recorta a la ventana
+# visible y se remuestrea (día / semana / mes, último saldo del periodo) o se
+# reduce con LTTB hasta un presupuesto fijo de puntos.
+PUNTOS = 1500
+REGLAS = {"Diario": "D", "Semanal": "W", "Mensual": "MS"}
+
+
+def lttb(x, y, puntos):
+    """Largest-Triangle-Three-Buckets: índices de los puntos que conservan la forma"""
+    n = len(x)
+    if puntos >= n or puntos < 3: return np.arange(n)
+    cortes = np.linspace(1, n - 1, puntos - 1).astype(np.int64)
+    elegidos = np.empty(puntos, dtype=np.int64)
+    elegidos[0], elegidos[-1] = 0, n - 1
+    a = 0
+    for i in range(puntos - 2):
+        ini, fin = cortes[i], cortes[i + 1]
+        sig_fin = cortes[i + 2] if i + 2 < len(cortes) else n
+        px, py = x[fin:sig_fin].mean(), y[fin:sig_fin].mean()
+        area = np.abs((x[a] - px) * (y[ini:fin] - y[a]) - (x[a] - x[ini:fin]) * (py - y[a]))
+        a = ini + int(np.argmax(area)) if fin > ini else ini
+        elegidos[i + 1] = a
+    return elegidos
+
+
+class SerieSaldo:
+    def __init__(self, df_movs):
+        if df_movs.empty:
+            self.fechas, self.saldo = np.array([], dtype='datetime64[ns]'), np.array([])
+            return
+        d = df_movs[['FECHA', 'IMPORTE_REAL']].dropna(subset=['FECHA']).sort_values('FECHA', kind='stable')
+        self.fechas = d['FECHA'].to_numpy(dtype='datetime64[ns]')
+        self.saldo = d['IMPORTE_REAL'].to_numpy(dtype=float).cumsum()
+
+    def __len__(self):
+        return len(self.fechas)
+
+    def limites(self):
+        if not len(self): return None, None
+        return pd.Timestamp(self.fechas[0]), pd.Timestamp(self.fechas[-1])
+
+    def _ventana(self, desde, hasta):
+        """Recorte [desde, hasta] más el último punto anterior (saldo de arranque)"""
+        lo, hi = 0, len(self)
+        if desde is not None: lo = max(0, np.searchsorted(self.fechas, np.datetime64(pd.Timestamp(desde)), side='left') - 1)
+        if hasta is not None: hi = np.searchsorted(self.fechas, np.datetime64(pd.Timestamp(hasta) + pd.Timedelta(days=1)), side='left')
+        return self.fechas[lo:hi], self.saldo[lo:hi]
+
+    def vista(self, desde=None, hasta=None, modo="Auto", puntos=PUNTOS):
+        """DataFrame FECHA/SALDO de a lo más `puntos` filas para la ventana pedida"""
+        fechas, saldo = self._ventana(desde, hasta)
+        if modo in REGLAS and len(fechas):
+            s = pd.Series(saldo, index=fechas).resample(REGLAS[modo]).last().ffill()
+            fechas, saldo = s.index.to_numpy(dtype='datetime64[ns]'), s.to_numpy()
+        idx = lttb(fechas.astype(np.int64) / 1e9, saldo, puntos)
+        return pd.DataFrame({'FECHA': fechas[idx], 'SALDO': saldo[idx]})
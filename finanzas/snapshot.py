@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from gspread.utils import numericise_all, rowcol_to_a1
+
+# ================= SNAPSHOT LOCAL (SQLite) =================
+# Copia persistente de cada hoja: encabezado, filas crudas y una huella por fila.
+# En cada sincronización sólo se lee la "cola" de la hoja (las últimas `ventana`
+# filas conocidas + las nuevas). Si la parte ya conocida coincide con las huellas
+# guardadas, se anexan las filas nuevas; si no (edición en sitio, filas borradas,
+# encabezado distinto) se hace una resincronización completa.
+# Los registros ya decodificados se quedan en memoria por hoja, con la huella de
+# su última fila: si sigue igual sólo se decodifican las filas anexadas después.
+RUTA_SNAPSHOT = os.path.join(".cache", "snapshot.sqlite")
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS hojas (
+    nombre TEXT PRIMARY KEY,
+    encabezado TEXT NOT NULL,
+    filas INTEGER NOT NULL,
+    verificado REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS filas (
+    hoja TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    datos TEXT NOT NULL,
+    huella TEXT NOT NULL,
+    PRIMARY KEY (hoja, n)
+);
+"""
+
+
+def _huella(datos):
+    return hashlib.sha1(datos.encode("utf-8")).hexdigest()
+
+
+def _recortar(fila):
+    """Quita celdas vacías al final (la API no siempre las devuelve)"""
+    fila = list(fila)
+    while fila and fila[-1] == "":
+        fila.pop()
+    return fila
+
+
+class SnapshotLocal:
+    """Espejo local e incremental de las hojas de Google Sheets"""
+
+    def __init__(self, ruta=RUTA_SNAPSHOT, ventana=200, verificacion_completa=3600):
+        self.ruta = ruta
+        self.ventana = ventana
+        self.verificacion_completa = verificacion_completa
+        carpeta = os.path.dirname(ruta)
+        if carpeta: os.makedirs(carpeta, exist_ok=True)
+        self.con = sqlite3.connect(ruta, check_same_thread=False)
+        self.con.executescript(ESQUEMA)
+        self._decodificadas = {}  # hoja -> (encabezado, huella de la última fila, registros)
+
+    # ---------- lectura local ----------
+    def _estado(self, nombre):
+        r = self.con.execute("SELECT encabezado, filas, verificado FROM hojas WHERE nombre = ?", (nombre,)).fetchone()
+        if r is None: return None
+        return json.loads(r[0]), r[1], r[2]
+
+    def filas(self, nombre, desde=0):
+        cur = self.con.execute("SELECT datos FROM filas WHERE hoja = ? AND n >= ? ORDER BY n", (nombre, desde))
+        return [json.loads(d) for (d,) in cur]
+
+    def _huella_en(self, nombre, n):
+        r = self.con.execute("SELECT huella FROM filas WHERE hoja = ? AND n = ?", (nombre, n)).fetchone()
+        return r and r[0]
+
+    def registros(self, nombre):
+        """Devuelve la hoja como lista de dicts (igual que get_all_records).
+        La lista es nueva en cada llamada pero reutiliza los dicts ya decodificados:
+        no deben modificarse."""
+        estado = self._estado(nombre)
+        if estado is None: return []
+        encabezado, total, _ = estado
+        previos = []
+        memo = self._decodificadas.get(nombre)
+        if memo and memo[0] == encabezado and len(memo[2]) <= total \
+                and self._huella_en(nombre, len(memo[2]) - 1) == memo[1]:
+            previos = memo[2]
+        ancho = len(encabezado)
+        nuevos = [dict(zip(encabezado, numericise_all((f + [""] * ancho)[:ancho])))
+                  for f in self.filas(nombre, len(previos))]
+        res = previos + nuevos if nuevos else previos
+        if res: self._decodificadas[nombre] = (encabezado, self._huella_en(nombre, len(res) - 1), res)
+        return res
+
+    # ---------- escritura local ----------
+    def _guardar(self, nombre, encabezado, filas, desde, verificado):
+        """Reemplaza las filas >= desde y actualiza el estado de la hoja"""
+        memo = self._decodificadas.get(nombre)
+        if memo and (desde < len(memo[2]) or memo[0] != encabezado): del self._decodificadas[nombre]
+        with self.con:
+            self.con.execute("DELETE FROM filas WHERE hoja = ? AND n >= ?", (nombre, desde))
+            self.con.executemany(
+                "INSERT INTO filas (hoja, n, datos, huella) VALUES (?, ?, ?, ?)",
+                [(nombre, desde + i, d, _huella(d)) for i, d in enumerate(json.dumps(_recortar(f)) for f in filas)],
+            )
+            total = self.con.execute("SELECT COUNT(*) FROM filas WHERE hoja = ?", (nombre,)).fetchone()[0]
+            self.con.execute(
+                "INSERT OR REPLACE INTO hojas (nombre, encabezado, filas, verificado) VALUES (?, ?, ?, ?)",
+                (nombre, json.dumps(encabezado), total, verificado),
+            )
+
+    # ---------- sincronización ----------
+    # Se hace en dos pasos para poder pedir varias hojas en una sola llamada:
+    # _plan dice qué rangos hacen falta (None = hoja completa) y _aplicar procesa
+    # lo que llegó; si detecta ediciones devuelve None y la hoja se pide completa.
+    def _plan(self, nombre):
+        estado = self._estado(nombre)
+        if estado is None or time.time() - estado[2] > self.verificacion_completa or estado[1] <= self.ventana:
+            return [None]
+        encabezado, conocidas, _ = estado
+        # Filas de datos indexadas desde 0; la fila 0 vive en la fila 2 de la hoja
+        ultima_col = rowcol_to_a1(1, max(len(encabezado), 1)).rstrip("0123456789")
+        return ["1:1", f"A{conocidas - self.ventana + 2}:{ultima_col}"]
+
+    def _aplicar(self, nombre, plan, valores):
+        if plan == [None]:
+            valores = valores[0]
+            encabezado = _recortar(valores[0]) if valores else []
+            self._guardar(nombre, encabezado, valores[1:], 0, time.time())
+            return "completa"
+
+        encabezado, conocidas, verificado = self._estado(nombre)
+        desde = conocidas - self.ventana
+        cabeza, cola = valores
+        if _recortar(cabeza[0] if cabeza else []) != encabezado or len(cola) < self.ventana:
+            return None
+
+        guardadas = self.con.execute(
+            "SELECT huella FROM filas WHERE hoja = ? AND n >= ? ORDER BY n", (nombre, desde)
+        ).fetchall()
+        recientes = [_huella(json.dumps(_recortar(f))) for f in cola[:self.ventana]]
+        if recientes != [h for (h,) in guardadas]:
+            return None
+
+        nuevas = cola[self.ventana:]
+        if not nuevas: return "sin cambios"
+        self._guardar(nombre, encabezado, nuevas, conocidas, verificado)
+        return "incremental"
+
+    def sincronizar_lote(self, nombres, leer_rangos):
+        """Sincroniza varias hojas; `leer_rangos([(hoja, rango)])` hace una sola petición.
+        Devuelve {hoja: "completa" | "incremental" | "sin cambios"}"""
+        planes = {n: self._plan(n) for n in nombres}
+        valores = leer_rangos([(n, r) for n in nombres for r in planes[n]])
+        res, completas, i = {}, [], 0
+        for n in nombres:
+            k = len(planes[n])
+            r = self._aplicar(n, planes[n], valores[i:i + k])
+            i += k
+            if r is None: completas.append(n)
+            else: res[n] = r
+        # Segunda vuelta sólo para las hojas con ediciones en sitio
+        if completas:
+            for n, v in zip(completas, leer_rangos([(n, None) for n in completas])):
+                res[n] = self._aplicar(n, [None], [v])
+        return res
+
+    def resincronizar(self, nombre, ws):
+        """Descarga la hoja completa y reemplaza el snapshot"""
+        return self._aplicar(nombre, [None], [ws.get_all_values()])
+
+    def sincronizar(self, nombre, ws):
+        """Una sola hoja a través de su Worksheet"""
+        def leer(pedidos):
+            if pedidos[0][1] is None: return [ws.get_all_values()]
+            return ws.batch_get([r for _, r in pedidos])
+        return self.sincronizar_lote([nombre], leer)[nombre]
+
+    def cargar(self, nombre, ws):
+        """Sincroniza y devuelve los registros de la hoja"""
+        self.sincronizar(nombre, ws)
+        return self.registros(nombre)
@@ -0,0 +1,137 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+from finanzas.metricas import metricas
+
+# ================= TELEGRAM =================
+API_TELEGRAM = "https://api.telegram.org"
+RUTA_OFFSET = os.path.join(".cache", "telegram_offset.json")
+
+
+class ClienteTelegram:
+    """Bot API con una sola sesión HTTP reutilizada"""
+
+    def __init__(self, token, base_url=API_TELEGRAM):
+        self.url = f"{base_url.rstrip('/')}/bot{token}"
+        self.sesion = requests.Session()
+
+    def actualizaciones(self, offset=None, timeout=30):
+        """getUpdates con long-polling; `offset` confirma todo lo anterior"""
+        params = {"timeout": timeout, "allowed_updates": json.dumps(["message"])}
+        if offset is not None: params["offset"] = offset
+        metricas.contar("telegram.peticion")
+        with metricas.tramo("telegram.getUpdates"):
+            resp = self.sesion.get(f"{self.url}/getUpdates", params=params, timeout=(5, timeout + 10))
+        try: r = resp.json()
+        except ValueError: r = {}
+        # 409 (otro proceso sondea el mismo bot), 401 (token), 5xx: que el trabajador espere
+        if not resp.ok or not r.get("ok"):
+            metricas.contar("telegram.error")
+            raise RuntimeError(f"getUpdates {resp.status_code}: {r.get('description', resp.reason)}")
+        return r.get("result", [])
+
+    def enviar(self, chat_id, texto):
+        metricas.contar("telegram.peticion")
+        with metricas.tramo("telegram.sendMessage"):
+            self.sesion.post(f"{self.url}/sendMessage", json={"chat_id": chat_id, "text": texto}, timeout=10)
+
+
+def interpretar_mensaje(texto):
+    """'50 tacos' / 'gasto 50 tacos' / 'pago 200 x' -> (monto, desc, tipo) o None"""
+    txt = (texto or "").lower().split()
+    if len(txt) < 2: return None
+    try:
+        if txt[0].replace('.', '', 1).isdigit():
+            return float(txt[0]), " ".join(txt[1:]), "Gasto"
+        return float(txt[1]), " ".join(txt[2:]), "Pago" if "pago" in txt[0] else "Gasto"
+    except ValueError:
+        return None
+
+
+class TrabajadorTelegram:
+    """Lee mensajes del bot en segundo plano y los anota en lote en "Hoja 1"
+
+    El offset se guarda en disco junto con los update_id ya anotados, así que
+    reiniciar la app o repetir una lectura nunca duplica movimientos.
+    """
+
+    def __init__(self, cliente, cola, chat_id, ruta=RUTA_OFFSET, timeout=30, recordar=1000, espera_max=300):
+        self.cliente = cliente
+        self.cola = cola
+        self.chat_id = str(chat_id).strip()
+        self.ruta = ruta
+        self.timeout = timeout
+        self.recordar = recordar
+        self.espera_max = espera_max
+        self.offset, self.vistos = None, []
+        self.fallos = 0
+        self.ultimo_error = None
+        self._lock = threading.Lock()
+        self._hilo = None
+        if ruta and os.path.exists(ruta):
+            try:
+                with open(ruta, encoding="utf-8") as f: estado = json.load(f)
+                self.offset, self.vistos = estado.get("offset"), estado.get("vistos", [])
+            except Exception: pass
+
+    def _persistir(self):
+        if not self.ruta: return
+        carpeta = os.path.dirname(self.ruta)
+        if carpeta: os.makedirs(carpeta, exist_ok=True)
+        tmp = self.ruta + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"offset": self.offset, "vistos": self.vistos[-self.recordar:]}, f)
+        os.replace(tmp, self.ruta)
+
+    def sondear(self, timeout=None):
+        """Una vuelta de getUpdates; devuelve cuántos movimientos se anotaron"""
+        with self._lock:
+            updates = self.cliente.actualizaciones(self.offset, self.timeout if timeout is None else timeout)
+            if not updates: return 0
+
+            vistos = set(self.vistos)
+            filas, avisos = [], []
+            hoy_str = datetime.now().strftime("%Y-%m-%d")
+            for u in updates:
+                uid, msg = u["update_id"], u.get("message") or {}
+                if uid in vistos or str(msg.get("chat", {}).get("id")) != self.chat_id: continue
+                datos = interpretar_mensaje(msg.get("text", ""))
+                if datos is None: continue
+                monto, desc, tipo = datos
+                # Se guarda como Gasto en efectivo por defecto
+                filas.append(["Telegram", hoy_str, desc, monto, "-", "-", tipo, "Efectivo", 1, 0, 0])
+                avisos.append(f"✅ Anotado: {tipo} ${monto}")
+                self.vistos.append(uid)
+
+            if filas: self.cola.anexar("Hoja 1", filas)
+            # El siguiente getUpdates con este offset confirma todo el lote
+            self.offset = max(u["update_id"] for u in updates) + 1
+            self._persistir()
+
+        if avisos:
+            try: self.cliente.enviar(self.chat_id, "\n".join(avisos))
+            except Exception: pass
+        return len(filas)
+
+    def _bucle(self):
+        while True:
+            try:
+                self.sondear()
+                self.fallos = 0
+                self.ultimo_error = None
+            except Exception as e:
+                self.fallos += 1
+                self.ultimo_error = str(e)
+                # Espera exponencial: 5 s, 10 s, 20 s, ... hasta espera_max
+                time.sleep(min(self.espera_max, 5 * 2 ** (self.fallos - 1)))
+
+    def iniciar(self):
+        if self._hilo is None:
+            self._hilo = threading.Thread(target=self._bucle, name="telegram", daemon=True)
+            self._hilo.start()
+        return self
@@ -0,0 +1,6 @@
+"""Interfaz de Streamlit de Control Total, una página por módulo.
+
+Cada módulo importa sus dependencias pesadas (plotly, fpdf, gspread,
+requests) hasta que la función que las usa corre, así el formulario de
+acceso se dibuja sólo con streamlit cargado.
+"""
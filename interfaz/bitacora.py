@@ -0,0 +1,84 @@
+import os
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from finanzas.exportar import exportar
+from interfaz.recursos import obtener_pool_pdf
+
+
+# TAB 3: BITÁCORA DETALLADA
+def mostrar(d):
+    df_movs, df_cuentas = d.df_movs, d.df_cuentas
+    # Cambia sólo cuando cambian los movimientos
+    version = d.derivados.clave("movs")
+    if not df_movs.empty:
+        indice = d.derivados("bitacora")
+
+        # Filtros: se resuelven sobre el índice, sin reordenar el historial
+        with st.expander("🔎 Filtros"):
+            c1, c2, c3 = st.columns(3)
+            b_rango = c1.date_input("Rango", [], key="bit_rango")
+            b_ctas = c2.multiselect("Cuentas", sorted(df_cuentas.index), key="bit_ctas")
+            b_tipos = c3.multiselect("Tipo", sorted(df_movs['TIPO'].astype(str).unique()), key="bit_tipos")
+            c1, c2, c3 = st.columns(3)
+            b_texto = c1.text_input("Buscar en descripción", key="bit_texto")
+            b_min = c2.number_input("Monto mínimo", min_value=0.0, value=None, key="bit_min")
+            b_max = c3.number_input("Monto máximo", min_value=0.0, value=None, key="bit_max")
+        b_desde = b_rango[0] if len(b_rango) > 0 else None
+        b_hasta = b_rango[1] if len(b_rango) > 1 else b_desde
+        filtro = dict(desde=b_desde, hasta=b_hasta, cuentas=b_ctas, tipos=b_tipos, texto=b_texto, monto_min=b_min, monto_max=b_max)
+
+        # Paginación por cursor: pila de cursores de las páginas ya vistas
+        firma = repr((version, filtro))
+        if st.session_state.get('bit_firma') != firma:
+            st.session_state['bit_firma'], st.session_state['bit_cursores'] = firma, [None]
+        cursores = st.session_state['bit_cursores']
+        v, siguiente = indice.consultar(**filtro, cursor=cursores[-1], limite=100)
+        # Mostrar Tipo para ver si es Devolución
+        st.dataframe(v[['FECHA','DESCRIPCION','IMPORTE_REAL','TIPO','BANCO']], use_container_width=True)
+        c1, c2, c3 = st.columns([1, 2, 1])
+        if c1.button("◀ Anteriores", disabled=len(cursores) == 1):
+            cursores.pop(); st.rerun()
+        c2.caption(f"Página {len(cursores)} · {len(indice):,} movimientos en total")
+        if c3.button("Siguientes ▶", disabled=siguiente is None):
+            cursores.append(siguiente); st.rerun()
+
+        # Exportación bajo demanda (historial completo o filtrado)
+        with st.expander("📥 Exportar"):
+            c1, c2, c3 = st.columns(3)
+            f_min, f_max = df_movs['FECHA'].min(), df_movs['FECHA'].max()
+            desde = c1.date_input("Desde", f_min.date() if pd.notna(f_min) else None, key="exp_desde")
+            hasta = c2.date_input("Hasta", f_max.date() if pd.notna(f_max) else None, key="exp_hasta")
+            formato = c3.radio("Formato", ["xlsx", "csv"], horizontal=True, key="exp_fmt")
+            ctas_exp = st.multiselect("Cuentas (vacío = todas)", sorted(df_cuentas.index), key="exp_ctas")
+            if st.button("Generar archivo"):
+                st.session_state['export'] = exportar(df_movs, version, desde, hasta, ctas_exp, formato,
+                                                      st.secrets.get("exports_path", ".cache/exports"))
+            ruta_exp = st.session_state.get('export')
+            if ruta_exp and os.path.exists(ruta_exp):
+                ext = os.path.splitext(ruta_exp)[1]
+                with open(ruta_exp, "rb") as f:
+                    st.download_button(f"Descargar {ext[1:].upper()}", f, f"bitacora{ext}")
+
+        if v.empty: st.info("Ningún movimiento coincide con los filtros.")
+        else:
+            sel = st.selectbox("Generar Recibo de:", v.index, format_func=lambda x: f"{v.loc[x,'DESCRIPCION']} (${v.loc[x,'IMPORTE']})")
+            if st.button("🖨️ PDF"):
+                from finanzas.documentos import generar_pdf  # fpdf se carga al primer clic
+                r = v.loc[sel]
+                st.download_button("Descargar PDF", generar_pdf(str(r['FECHA']), r['BANCO'], r['IMPORTE'], r['DESCRIPCION']), "recibo.pdf", "application/pdf")
+
+        # Cierre de mes: estados de cuenta de todas las cuentas + recibos de cobros
+        with st.expander("🗂️ Cierre de Mes (PDF)"):
+            mes_cierre = st.date_input("Mes", datetime.now().date().replace(day=1), key="mes_cierre")
+            if st.button("Generar estados y recibos"):
+                from finanzas.documentos import generar_lote, trabajos_cierre
+                trabajos = trabajos_cierre(df_movs, mes_cierre)
+                if trabajos:
+                    with st.spinner(f"Generando {len(trabajos)} documentos..."):
+                        zip_pdf = generar_lote(trabajos, pool=obtener_pool_pdf())
+                    st.download_button("📦 Descargar ZIP", zip_pdf, f"cierre_{mes_cierre.strftime('%Y-%m')}.zip", "application/zip")
+                else:
+                    st.info("No hay movimientos en ese mes.")
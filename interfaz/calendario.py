@@ -0,0 +1,35 @@
+import numpy as np
+import streamlit as st
+
+from finanzas.agenda import COLUMNAS, MESES, matriz
+
+TIPOS = ["Pagar", "Cobrar", "Corte", "Mensualidad"]
+
+
+# TAB 2: CALENDARIO
+def mostrar(d):
+    # Una tabla y un mapa de calor para todo el horizonte, no un bloque de widgets por evento
+    import plotly.express as px
+
+    c1, c2 = st.columns([1, 2])
+    meses = c1.slider("Horizonte (meses)", 1, 24, MESES, key="cal_meses")
+    tipos = c2.multiselect("Mostrar", TIPOS, default=TIPOS, key="cal_tipos")
+    cal = d.derivados("agenda", d.hoy, meses)
+    if cal.empty:
+        st.info("Sin pagos, cortes ni mensualidades en el horizonte.")
+        return
+
+    mapa = matriz(cal)
+    if not mapa.empty:
+        fig = px.imshow(mapa, text_auto=".3s", aspect="auto", color_continuous_scale="RdYlGn", color_continuous_midpoint=0,
+                        labels={"x": "Mes", "y": "Cuenta", "color": "Neto"}, title="Pagos (-) y cobros (+) por mes")
+        st.plotly_chart(fig, use_container_width=True)
+
+    vista = cal[cal["TIPO"].isin(tipos)][COLUMNAS]
+    vista.insert(0, "", np.where(vista["DIAS"] <= 3, "🔴", "🟢"))
+    st.dataframe(vista, hide_index=True, use_container_width=True, column_config={
+        "FECHA": st.column_config.DateColumn("Fecha", format="DD MMM YYYY"),
+        "EVENTO": "Evento", "TIPO": "Tipo", "CUENTA": "Cuenta",
+        "MONTO": st.column_config.NumberColumn("Monto", format="$%,.2f"),
+        "DIAS": st.column_config.NumberColumn("Días"),
+    })
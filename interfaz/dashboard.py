@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from finanzas.serie import REGLAS
+
+
+# TAB 1: DASHBOARD
+def mostrar(d):
+    # Plotly sólo se carga cuando la pestaña se dibuja
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    cubo, derivados = d.cubo, d.derivados
+    # Sumas y tablas del mes: una vez por versión de datos y mes
+    t = derivados("tablero", datetime.now().date().replace(day=1))
+    saldo, inv, gasto_del_mes = t.saldo, t.inv, t.gasto_mes
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric("💰 Liquidez Total", f"${saldo:,.2f}")
+    c2.metric("📈 Inversiones", f"${inv:,.2f}")
+    c3.metric("💸 Gastos Reales Mes", f"${gasto_del_mes:,.2f}", delta_color="inverse")
+
+    if not cubo.empty:
+        col1, col2 = st.columns(2)
+        with col1:
+            dm = t.por_categoria
+            if not dm.empty:
+                st.plotly_chart(px.pie(dm, values='SALIDAS', names='CATEGORIA', hole=0.4, title="Gastos del Mes"), use_container_width=True)
+        with col2:
+            serie = derivados("serie")
+            if len(serie):
+                ini, fin = (f.date() for f in serie.limites())
+                modo = st.radio("Resolución", ["Auto"] + list(REGLAS), horizontal=True, key="saldo_modo")
+                # Acercar la ventana pide la serie a mayor resolución para ese tramo
+                zoom = st.slider("Ventana", ini, fin, (ini, fin), key="saldo_zoom") if ini < fin else (ini, fin)
+                evo = derivados("vista_saldo", zoom[0], zoom[1], modo)
+                st.plotly_chart(px.line(evo, x='FECHA', y='SALDO', title="Historia de Saldo"), use_container_width=True)
+
+        col3, col4 = st.columns(2)
+        with col3:
+            mm = t.comparativo
+            if not mm.empty:
+                fig = px.bar(mm, x='MES', y=['SALIDAS', 'ENTRADAS'], barmode='group', title="Mes contra Mes")
+                st.plotly_chart(fig, use_container_width=True)
+                if len(mm) > 1 and pd.notna(mm['VAR_SALIDAS'].iloc[-1]):
+                    st.caption(f"Gasto vs mes anterior: {mm['VAR_SALIDAS'].iloc[-1]:+.1%}")
+        with col4:
+            msi = t.diferida
+            if not msi.empty:
+                st.plotly_chart(px.bar(msi, x='MES', y='SALIDAS', title="Mensualidades Comprometidas (MSI)"), use_container_width=True)
+
+        # Pronóstico: comprometido (MSI, préstamos, cobros) + meses históricos re-muestreados
+        with st.expander("🔮 Pronóstico de Liquidez"):
+            horizonte = st.slider("Meses", 12, 60, 24, step=6, key="pron_meses")
+            bandas, prob_neg = derivados("pronostico", datetime.now().date().replace(day=1), horizonte)
+            fig = go.Figure()
+            for bajo, alto, nombre, alfa in [('P5', 'P95', "90% de escenarios", 0.15), ('P25', 'P75', "50% de escenarios", 0.3)]:
+                fig.add_trace(go.Scatter(x=bandas['MES'], y=bandas[alto], line=dict(width=0), showlegend=False, hoverinfo='skip'))
+                fig.add_trace(go.Scatter(x=bandas['MES'], y=bandas[bajo], line=dict(width=0), fill='tonexty',
+                                         fillcolor=f"rgba(0,150,255,{alfa})", name=nombre))
+            fig.add_trace(go.Scatter(x=bandas['MES'], y=bandas['P50'], line=dict(color="#0096ff"), name="Mediana"))
+            fig.update_layout(title="Saldo Proyectado")
+            st.plotly_chart(fig, use_container_width=True)
+            c1, c2 = st.columns(2)
+            c1.metric("Probabilidad de saldo negativo", f"{prob_neg:.1%}")
+            c2.metric("Saldo mediano al final", f"${bandas['P50'].iloc[-1]:,.2f}")
@@ -0,0 +1,171 @@
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import pandas as pd
+import streamlit as st
+
+from finanzas import agenda
+from finanzas.almacen import HOJAS, OPCIONALES
+from finanzas.bitacora import IndiceBitacora
+from finanzas.categorias import compilar
+from finanzas.cubo import carga_diferida, comparativo_mensual, construir_cubo, gasto_mes, gastos_por_categoria
+from finanzas.cuentas import con_limites, indice_vacio, resumen_deudas, sumar_movimientos
+from finanzas.derivados import Grafo, huella, huella_vigente
+from finanzas.esquema import importe_real, tipar
+from finanzas.localizador import Localizador
+from finanzas.metricas import metricas
+from finanzas.motor import generar_flujo_real
+from finanzas.pronostico import pronosticar
+from finanzas.serie import SerieSaldo
+from interfaz.recursos import obtener_almacen, obtener_cola, obtener_memo, obtener_telegram
+
+
+# ================= CARGA DE DATOS =================
+@metricas.cacheado("leer_hojas", st.cache_resource(ttl=5))
+def leer_hojas():
+    """Lectura cruda de las hojas (y reglas de categoría), índice por cuenta y huella de cada hoja.
+    Se comparte sin copiar: nadie modifica estas listas (la cola superpone sobre copias)."""
+    leido_en = time.time()
+    almacen = obtener_almacen()
+    # Todas las hojas en una sola petición, con el índice por cuenta de esa misma
+    # lectura (en SQL con el motor local, incremental sobre el snapshot con Sheets)
+    try: registros, cuentas = almacen.leer_con_indice(HOJAS + OPCIONALES)
+    except:
+        try: registros = almacen.leer_todo(HOJAS + OPCIONALES)
+        except: registros = {hoja: [] for hoja in HOJAS + OPCIONALES}
+        cuentas = indice_vacio()
+    return registros, cuentas, leido_en, {hoja: huella(filas) for hoja, filas in registros.items()}
+
+
+# ================= DERIVADOS (UNA VEZ POR HUELLA DE SUS DATOS) =================
+# Fuentes: cada hoja (con la cola encima) e "indice" (resumen por cuenta de la
+# lectura, filas leídas). Ver finanzas/derivados.py.
+GRAFO = Grafo()
+
+
+@GRAFO.nodo("movs", "Hoja 1")
+def _movs(filas):
+    # Tipos según finanzas/esquema.py (fechas, importes, categorías)
+    try:
+        df_movs = tipar(pd.DataFrame(filas), "Hoja 1")
+        if not df_movs.empty:
+            # GASTO es negativo, INGRESO es positivo
+            # NOTA: 'Devolucion' cuenta como positivo (reduce deuda o suma dinero)
+            df_movs['IMPORTE_REAL'] = importe_real(df_movs)
+        return df_movs
+    except: return pd.DataFrame()
+
+
+@GRAFO.nodo("deudas", "Deudas")
+def _deudas(filas):
+    try: return tipar(pd.DataFrame(filas), "Deudas")
+    except: return pd.DataFrame()
+
+
+@GRAFO.nodo("inv", "Inversiones")
+def _inversiones(filas):
+    try: return tipar(pd.DataFrame(filas), "Inversiones")
+    except: return pd.DataFrame()
+
+
+@GRAFO.nodo("cuentas", "indice", "Hoja 1", "deudas")
+def _cuentas(indice, filas, df_deudas):
+    # Las filas que la cola agregó encima de la lectura se suman al índice por cuenta
+    cuentas, leidas = indice
+    return con_limites(sumar_movimientos(cuentas, pd.DataFrame(filas[leidas:])), df_deudas)
+
+
+@GRAFO.nodo("localizador", "Deudas")
+def _localizador(filas):
+    # NOMBRE -> fila y encabezado -> columna para escribir en "Deudas" sin buscar
+    return Localizador(filas)
+
+
+@GRAFO.nodo("flujo", "movs", "Categorias")
+def _flujo(df_movs, reglas):
+    # 🚀 MOTOR FINANCIERO: las reglas de categoría son parte de la clave
+    return generar_flujo_real(df_movs.copy(), compilar(reglas)) if not df_movs.empty else pd.DataFrame()
+
+
+@GRAFO.nodo("cubo", "flujo")
+def _cubo(df_flujo):
+    return construir_cubo(df_flujo)
+
+
+@GRAFO.nodo("tablero", "movs", "inv", "cubo")
+def _tablero(df_movs, df_inv, cubo, mes):
+    """Cifras y tablas de la pestaña 1 para el mes de `mes`"""
+    return SimpleNamespace(
+        saldo=df_movs['IMPORTE_REAL'].sum() if not df_movs.empty else 0,
+        inv=df_inv['MONTO_INICIAL'].sum() if not df_inv.empty else 0,
+        gasto_mes=gasto_mes(cubo, mes),
+        por_categoria=gastos_por_categoria(cubo, mes) if not cubo.empty else pd.DataFrame(),
+        comparativo=comparativo_mensual(cubo, mes) if not cubo.empty else pd.DataFrame(),
+        diferida=carga_diferida(cubo, mes) if not cubo.empty else pd.DataFrame())
+
+
+@GRAFO.nodo("agenda", "deudas", "cuentas", "flujo")
+def _agenda(df_deudas, df_cuentas, df_flujo, hoy, meses):
+    """Pagos, cortes y mensualidades de los próximos `meses`"""
+    return agenda.generar(df_deudas, df_cuentas, df_flujo, hoy, meses)
+
+
+@GRAFO.nodo("resumen_deudas", "deudas", "cuentas")
+def _resumen_deudas(df_deudas, df_cuentas):
+    """Cobros y pasivos activos con lo que muestra la pestaña 4 ya calculado"""
+    return resumen_deudas(df_deudas, df_cuentas)
+
+
+@GRAFO.nodo("bitacora", "movs")
+def _bitacora(df_movs):
+    """Índice ordenado de la bitácora"""
+    return IndiceBitacora(df_movs)
+
+
+@GRAFO.nodo("serie", "movs")
+def _serie(df_movs):
+    """Saldo acumulado movimiento a movimiento"""
+    return SerieSaldo(df_movs)
+
+
+@GRAFO.nodo("vista_saldo", "serie")
+def _vista_saldo(serie, desde, hasta, modo):
+    """Serie recortada y reducida a un número fijo de puntos"""
+    return serie.vista(desde, hasta, modo)
+
+
+@GRAFO.nodo("pronostico", "flujo", "deudas")
+def _pronostico(df_flujo, df_deudas, mes, meses):
+    """10,000 escenarios Monte Carlo del saldo desde el mes siguiente a `mes` (el actual)"""
+    return pronosticar(df_flujo, df_deudas, hoy=pd.Timestamp(mes), meses=meses, escenarios=10_000)
+
+
+# ================= HERRAMIENTAS DE ARCHIVO =================
+def guardar_registro(cola, hoja, datos):
+    try:
+        cola.anexar(hoja, [datos])
+        return True
+    except: return False
+
+
+def cargar():
+    """Almacén, cola y los derivados del rerun en un solo objeto"""
+    almacen, cola = obtener_almacen(), obtener_cola()
+    obtener_telegram()
+    registros, cuentas_leidas, leido_en, leidas = leer_hojas()
+    vigentes = cola.aplicar(registros, leido_en)
+    # La huella de cada hoja con la cola encima sólo rehashea las filas que cambió la cola
+    huellas = {h: huella_vigente(leidas.get(h, (0, 0)), registros.get(h, []), filas) for h, filas in vigentes.items()}
+    fuentes = {**vigentes, "indice": (cuentas_leidas, len(registros["Hoja 1"]))}
+    huellas["indice"] = leidas["Hoja 1"]
+    v = GRAFO.vista(obtener_memo(), fuentes, huellas)
+
+    hoy = datetime.now().date()
+    # Avisos de los próximos días: el primer mes de la agenda basta
+    try: alertas = agenda.alertas(v("agenda", hoy, 1))
+    except: alertas = []
+    return SimpleNamespace(almacen=almacen, cola=cola, derivados=v, df_movs=v("movs"), df_deudas=v("deudas"),
+                           df_inv=v("inv"), hoy=hoy, alertas=alertas, df_cuentas=v("cuentas"),
+                           loc_deudas=v("localizador"), df_flujo_real=v("flujo"), cubo=v("cubo"),
+                           reglas=vigentes.get("Categorias", []))
@@ -0,0 +1,109 @@
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+
+def celdas_deuda(loc_deudas, nombre, **cambios):
+    """Celdas a actualizar en Deudas; None (con aviso) si la deuda ya no está en la hoja"""
+    try: return loc_deudas.celdas(nombre, **cambios)
+    except KeyError:
+        st.error(f"No se encontró '{nombre}' en Deudas (¿se renombró o borró?). No se registró nada.")
+        return None
+
+
+# TAB 4: DEUDAS Y COBROS (TITANIUM EDITION)
+def mostrar(d):
+    df_deudas, cola, loc_deudas = d.df_deudas, d.cola, d.loc_deudas
+    # Montos por deuda calculados una vez por versión de Deudas / movimientos
+    cobros, deudas = d.derivados("resumen_deudas")
+    # A. ME DEBEN
+    st.subheader("🟢 Cuentas por Cobrar (Activos)")
+    if not df_deudas.empty:
+        if not cobros.empty:
+            for i, row in cobros.iterrows():
+                abo, pend = row['ABONADO'], row['PENDIENTE']
+                with st.container():
+                    c1, c2 = st.columns([2,1])
+                    c1.metric(row['NOMBRE'], f"Te deben: ${pend:,.2f}")
+                    c1.progress(float(row['AVANCE']))
+
+                    monto_rec = c2.number_input("Recibido", 0.0, float(pend), float(row['SUGERIDO']), key=f"rec_{i}")
+                    if c2.button("✅ Registrar Cobro", key=f"c_{i}"):
+                        celdas = celdas_deuda(loc_deudas, row['NOMBRE'], ABONADO=abo + monto_rec)
+                        if celdas is not None:
+                            cola.actualizar_celdas("Deudas", celdas)
+                            # Registrar entrada
+                            hoy_s = str(datetime.now().date())
+                            cola.anexar("Hoja 1", [["Auto", hoy_s, f"Cobro {row['NOMBRE']}", monto_rec, "-", "-", "Ingreso", "Efectivo", 1, 0, 0]])
+                            st.rerun()
+                    st.divider()
+        else: st.info("Nadie te debe dinero.")
+
+    # B. YO DEBO (PASIVOS AVANZADOS)
+    st.subheader("🔴 Mis Deudas (Pasivos)")
+    if not df_deudas.empty:
+        for i, row in deudas.iterrows():
+            nom = row['NOMBRE']
+            with st.container():
+                st.markdown(f"#### {nom}")
+
+                # Cálculo de Deuda
+                es_tarjeta, deuda = bool(row['ES_TARJETA']), float(row['DEUDA'])
+                if es_tarjeta:
+                    # CÁLCULO DE LÍMITE
+                    limite = float(row['LIMITE'])
+                    disp_txt = f"${row['DISPONIBLE']:,.2f}" if limite > 0 else "No definido"
+
+                    col_metrics = st.columns(3)
+                    col_metrics[0].metric("Deuda Total", f"${deuda:,.2f}")
+                    col_metrics[1].metric("Límite", f"${limite:,.2f}" if limite > 0 else "-")
+                    col_metrics[2].metric("Disponible", disp_txt)
+                    if limite > 0:
+                        st.progress(min(deuda / limite, 1.0), text=f"Utilización {deuda / limite:.0%}")
+                    if pd.notna(row['ULTIMO_MOV']):
+                        st.caption(f"Último movimiento: {row['ULTIMO_MOV'].strftime('%d/%m/%Y')} · {int(row['MOVIMIENTOS'])} movimientos")
+                else:
+                    st.metric("Pendiente Préstamo", f"${deuda:,.2f}")
+
+                # --- ACCIONES ---
+                # 1. PAGO NORMAL
+                with st.expander("💸 Realizar Pago / Abono"):
+                    a_pagar = st.number_input("Monto", 0.0, float(deuda), float(row['SUGERIDO']), key=f"p_in_{i}")
+                    if st.button("Pagar", key=f"p_btn_{i}"):
+                        # Si es prestamo, actualizar abono (se ubica antes de anotar nada)
+                        celdas = [] if es_tarjeta else celdas_deuda(loc_deudas, nom, ABONADO=row.get('ABONADO',0) + a_pagar)
+                        if celdas is not None:
+                            hoy_s = str(datetime.now().date())
+                            # Registrar en historial
+                            cola.anexar("Hoja 1", [["Auto", hoy_s, f"Pago {nom}", a_pagar, "-", "-", "Pago", nom if es_tarjeta else "Efectivo", 1, 0, 0]])
+                            if celdas: cola.actualizar_celdas("Deudas", celdas)
+                            st.toast("Pago registrado."); st.rerun()
+
+                # 2. INCUMPLIMIENTO (BOTÓN DE PÁNICO)
+                with st.expander("⚠️ Registrar Incumplimiento / Intereses"):
+                    st.warning("Esto aumentará tu deuda por intereses moratorios o penalizaciones.")
+                    col_pen1, col_pen2 = st.columns(2)
+                    penalizacion_fija = col_pen1.number_input("Comisión Fija (Multa)", 0.0, step=100.0, key=f"pen_{i}")
+                    interes_moratorio = col_pen2.number_input("Interés Moratorio %", 0.0, step=1.0, key=f"int_mor_{i}")
+
+                    nuevo_saldo_simulado = (deuda * (1 + interes_moratorio/100)) + penalizacion_fija
+                    st.write(f"Nueva deuda estimada: ${nuevo_saldo_simulado:,.2f}")
+
+                    if st.button("Aplicar Penalización", key=f"btn_pen_{i}"):
+                        # Lógica: Aumentar el MONTO_TOTAL de la deuda en Sheets
+                        # Si es tarjeta, es difícil porque se calcula por movimientos.
+                        # SOLUCIÓN: Generar un GASTO negativo (que aumente deuda) llamado "Intereses/Multa"
+                        hoy_s = str(datetime.now().date())
+                        monto_ajuste = nuevo_saldo_simulado - deuda
+
+                        # Si es préstamo fijo, también debemos subir el total en Deudas
+                        celdas = [] if es_tarjeta else celdas_deuda(loc_deudas, nom, MONTO_TOTAL=row.get('MONTO_TOTAL',0) + monto_ajuste)
+                        if celdas is not None:
+                            cola.anexar("Hoja 1", [
+                                ["Auto", hoy_s, f"Penalización/Interes {nom}", monto_ajuste, "-", "-", "Gasto", nom if es_tarjeta else "Efectivo", 1, 0, 0]
+                            ])
+                            if celdas: cola.actualizar_celdas("Deudas", celdas)
+                            st.toast("Deuda aumentada por penalización."); st.rerun()
+
+                st.divider()
@@ -0,0 +1,24 @@
+import pandas as pd
+import streamlit as st
+
+from finanzas.metricas import CUOTA_ESCRITURA, CUOTA_LECTURA, metricas
+from interfaz.recursos import obtener_memo
+
+
+# ================= DIAGNÓSTICO =================
+def mostrar(registro):
+    """Panel opcional con los tramos del rerun, cuota de Sheets y caches"""
+    with st.sidebar:
+        if registro and st.toggle("🩺 Diagnóstico", key="diagnostico"):
+            st.caption(f"Rerun: {registro['total_ms']:,.0f} ms")
+            tramos = pd.Series(registro['tramos'], name="ms").sort_values(ascending=False)
+            st.dataframe(tramos.round(1), use_container_width=True)
+            lec, esc = metricas.por_minuto("sheets.lectura"), metricas.por_minuto("sheets.escritura")
+            st.progress(min(lec / CUOTA_LECTURA, 1.0), f"Sheets lecturas/min: {lec}/{CUOTA_LECTURA}")
+            st.progress(min(esc / CUOTA_ESCRITURA, 1.0), f"Sheets escrituras/min: {esc}/{CUOTA_ESCRITURA}")
+            st.caption(f"Telegram: {metricas.contadores['telegram.peticion']} peticiones · {metricas.por_minuto('telegram.peticion')} último minuto")
+            caches = pd.DataFrame([(n, ll, f, a) for n, (ll, f, a) in metricas.caches().items()],
+                                  columns=["cache", "llamadas", "fallos", "aciertos"])
+            st.dataframe(caches.style.format({"aciertos": "{:.0%}"}), hide_index=True, use_container_width=True)
+            memo = obtener_memo().estado()
+            st.caption(f"Derivados: {memo['artefactos']} artefactos · {memo['mb']:,} de {memo['limite_mb']:,} MB · {memo['desalojos']} desalojos")
@@ -0,0 +1,181 @@
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from finanzas.categorias import TIPOS, compilar
+from interfaz.datos import guardar_registro
+from interfaz.recursos import obtener_telegram, procesar_telegram
+
+
+def dia_corte(df_deudas, cuenta):
+    """Día de corte registrado en Deudas para `cuenta` (0 si no hay)"""
+    if df_deudas.empty: return 0
+    try: return int(df_deudas[df_deudas['NOMBRE'] == cuenta].iloc[0].get('DIA_CORTE', 0))
+    except: return 0
+
+
+def rechazados(cola, clave, destino):
+    """Escrituras que `destino` rechazó (no se reintentan solas): ver, reintentar o descartar"""
+    rechazadas = cola.rechazadas()
+    if not rechazadas: return
+    st.error(f"❌ {len(rechazadas)} cambio(s) rechazados por {destino} (no se reintentan solos)")
+    with st.expander("Ver rechazados"):
+        st.dataframe(pd.DataFrame([{
+            "Hoja": r["op"]["hoja"], "Tipo": r["op"]["tipo"],
+            "Filas/celdas": len(r["op"].get("filas") or r["op"].get("celdas") or ()),
+            "Cuándo": datetime.fromtimestamp(r["momento"]).strftime("%d/%m %H:%M"), "Error": r["error"],
+        } for r in rechazadas]), hide_index=True)
+        c1, c2 = st.columns(2)
+        if c1.button("🔁 Reintentar", key=f"{clave}_reintentar"):
+            cola.reintentar_rechazadas()
+            st.rerun()
+        if c2.button("🗑️ Descartar", key=f"{clave}_descartar"):
+            cola.descartar_rechazadas()
+            st.rerun()
+
+
+# --- SIDEBAR: CENTRO DE MANDO ---
+def mostrar(d):
+    """Sincronización, estado de la cola y formularios de captura"""
+    almacen, cola, df_movs, df_deudas, df_cuentas = d.almacen, d.cola, d.df_movs, d.df_deudas, d.df_cuentas
+    with st.sidebar:
+        st.title("🎛️ Centro de Mando")
+
+        # BOTÓN DE SINCRONIZACIÓN Y ALERTAS
+        if st.button("🤖 Sincronizar y Alertas"):
+            procesar_telegram(df_deudas, d.derivados.clave("deudas"))
+            st.toast("Datos actualizados y alertas enviadas.")
+            st.rerun()
+
+        # Escrituras aún no confirmadas en el almacén
+        n_pend = cola.pendientes()
+        if cola.ultimo_error:
+            st.warning(f"⏳ {n_pend} cambio(s) sin sincronizar, reintentando: {cola.ultimo_error}")
+        elif n_pend:
+            st.caption(f"⏳ {n_pend} cambio(s) pendientes de sincronizar")
+        rechazados(cola, "cola", "el almacén")
+        espejo = getattr(almacen, 'cola_espejo', None)
+        if espejo is not None:
+            if espejo.ultimo_error:
+                st.warning(f"🪞 {espejo.pendientes()} cambio(s) sin copiar a Sheets, reintentando: {espejo.ultimo_error}")
+            rechazados(espejo, "espejo", "Google Sheets (espejo)")
+        if getattr(almacen, 'ultimo_error', None):
+            st.warning(f"📴 Sin conexión con Sheets, mostrando la última copia local: {almacen.ultimo_error}")
+        bot = obtener_telegram()
+        if bot and bot.ultimo_error:
+            st.warning(f"🤖 Telegram no responde, reintentando: {bot.ultimo_error}")
+
+        st.divider()
+
+        # 1. CONFIGURAR CUENTAS (AGREGADO: LIMITE DE CRÉDITO)
+        with st.expander("⚙️ Configurar Cuenta/Tarjeta"):
+            with st.form("conf_cuenta"):
+                cuentas = sorted(df_cuentas.index)
+                cta = st.selectbox("Cuenta", cuentas + ["Nueva..."])
+                tipo = st.selectbox("Tipo", ["Tarjeta Crédito", "Préstamo", "Débito/Efectivo"])
+
+                c1, c2 = st.columns(2)
+                d_corte = c1.number_input("Día Corte", 0, 31, 0)
+                d_pago = c2.number_input("Día Pago", 0, 31, 0)
+
+                # Nuevo: Límite de Crédito
+                limite = st.number_input("Límite de Crédito (Opcional)", min_value=0.0)
+
+                if st.form_submit_button("Guardar"):
+                    # Se guarda en Deudas. OJO: El orden importa si usas índices fijos.
+                    # ESTRUCTURA SUGERIDA: Nombre, Tipo, Total, Plazo, Corte, Pago, Abonado, Estado, Interes, Limite
+                    guardar_registro(cola, "Deudas", [cta, tipo, 0, 1, d_corte, d_pago, 0, "Activo", 0, limite])
+                    st.rerun()
+
+        # 2. DEUDAS (YO DEBO / ME DEBEN)
+        with st.expander("🤝 Deudas y Préstamos"):
+            with st.form("new_debt"):
+                quien = st.radio("Dirección", ["🔴 Yo Debo", "🟢 Me Deben"])
+                nom = st.text_input("Nombre / Concepto")
+                c1, c2 = st.columns(2)
+                monto = c1.number_input("Monto Inicial", min_value=0.0)
+                interes = c2.number_input("Interés (%)", 0.0)
+                c3, c4 = st.columns(2)
+                meses = c3.number_input("Plazo", 1, 60, 12)
+                dia = c4.number_input("Día Pago", 1, 31, 15)
+
+                total = monto * (1 + interes/100)
+                st.caption(f"Total: ${total:,.2f}")
+
+                if st.form_submit_button("Registrar"):
+                    tipo_int = "Por Cobrar" if "Me Deben" in quien else "Préstamo Fijo"
+                    guardar_registro(cola, "Deudas", [nom, tipo_int, total, meses, 0, dia, 0, "Activo", interes])
+                    st.rerun()
+
+        # 3. REGISTRAR MOVIMIENTOS (GASTOS, INGRESOS, PAGOS, DEVOLUCIONES)
+        with st.expander("📝 Registrar Movimiento"):
+            # Se agregaron tipos para Devolución
+            tipo_mov = st.selectbox("Tipo", [
+                "Gasto (-)", 
+                "Pago a Tarjeta/Deuda (-)", 
+                "Ingreso / Saldo (+)", 
+                "Devolución / Reembolso (+)"
+            ])
+
+            monto = st.number_input("Monto", 0.0, step=10.0)
+            desc = st.text_input("Concepto")
+            cuenta = st.selectbox("Cuenta Afectada", cuentas if cuentas else ["Efectivo"])
+
+            es_msi = False
+            plazo, int_extra = 1, 0.0
+
+            # Solo mostrar MSI si es Gasto
+            if "Gasto" in tipo_mov:
+                es_msi = st.checkbox("¿A Meses / Diferido?")
+                if es_msi:
+                    c1, c2 = st.columns(2)
+                    plazo = c1.number_input("Meses", 2, 48, 3)
+                    int_extra = c2.number_input("Interés Extra %", 0.0)
+                    st.caption(f"Final: ${monto*(1+int_extra/100):,.2f}")
+
+            if st.button("Guardar Movimiento"):
+                # Detectar corte auto
+                corte_auto = dia_corte(df_deudas, cuenta)
+
+                # Definir TIPO interno para la base de datos
+                if "Gasto" in tipo_mov: tipo_final = "Gasto"
+                elif "Pago" in tipo_mov: tipo_final = "Pago"
+                elif "Ingreso" in tipo_mov: tipo_final = "Ingreso"
+                else: tipo_final = "Devolucion" # Para que lo detecte como positivo
+
+                fecha = str(datetime.now().date())
+                guardar_registro(cola, "Hoja 1", ["Manual", fecha, desc, monto, "-", "-", tipo_final, cuenta, plazo, int_extra, corte_auto])
+                st.toast("Registrado.")
+                st.rerun()
+
+        # 4. IMPORTAR ESTADO DE CUENTA (CSV / OFX / QFX)
+        with st.expander("📥 Importar Estado de Cuenta"):
+            archivo = st.file_uploader("Archivo", type=["csv", "ofx", "qfx"], key="imp_archivo")
+            cuenta_imp = st.selectbox("Cuenta del estado", cuentas if cuentas else ["Efectivo"], key="imp_cuenta")
+            if archivo is not None and st.button("Importar"):
+                from finanzas.importador import importar
+                try:
+                    with st.spinner("Importando..."):
+                        r = importar(archivo, cola, cuenta_imp, df_movs, dia_corte=dia_corte(df_deudas, cuenta_imp))
+                    st.session_state['importacion'] = (f"✅ {r['nuevas']:,} nuevos · {r['duplicadas']:,} ya existían"
+                                                       f" · {r['invalidas']:,} sin fecha o importe")
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"No se pudo importar: {e}")
+            if st.session_state.get('importacion'): st.caption(st.session_state['importacion'])
+
+        # 5. REGLAS DE CATEGORÍA (hoja "Categorias"; gana la primera que coincide)
+        with st.expander("🏷️ Reglas de Categoría"):
+            if d.reglas:
+                st.dataframe(pd.DataFrame(d.reglas), hide_index=True, use_container_width=True)
+            for patron, error in compilar(d.reglas).errores:
+                st.warning(f"Regex inválida `{patron}`: {error}")
+            with st.form("nueva_regla", clear_on_submit=True):
+                patron = st.text_input("Palabra o frase / regex", placeholder="uber eats")
+                c1, c2 = st.columns(2)
+                categoria = c1.text_input("Categoría", placeholder="Comida")
+                tipo_regla = c2.selectbox("Tipo", TIPOS)
+                if st.form_submit_button("Agregar regla") and patron.strip() and categoria.strip():
+                    guardar_registro(cola, "Categorias", [patron.strip(), categoria.strip(), tipo_regla])
+                    st.rerun()
@@ -0,0 +1,21 @@
+import streamlit as st
+
+
+# ================= 🔒 LOGIN =================
+def check_password():
+    if st.session_state.get('password_correct', False):
+        return True
+
+    col1, col2, col3 = st.columns([1,2,1])
+    with col2:
+        st.markdown("### 💎 Acceso Master")
+        with st.form("login_form"):
+            user = st.text_input("Usuario")
+            pwd = st.text_input("Contraseña", type="password")
+            if st.form_submit_button("Entrar"):
+                if user == st.secrets.get("admin_user", "admin") and pwd == st.secrets.get("admin_pass", "1234"):
+                    st.session_state['password_correct'] = True
+                    st.rerun()
+                else:
+                    st.error("❌ Datos incorrectos")
+    return False
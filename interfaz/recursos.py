@@ -0,0 +1,122 @@
+import base64
+import json
+from datetime import datetime
+
+import streamlit as st
+
+from finanzas.metricas import metricas
+
+# ================= RECURSOS COMPARTIDOS =================
+# Conexiones y trabajadores de fondo, uno por proceso (st.cache_resource).
+# gspread, requests y el cliente de Telegram se importan al crear el recurso
+# que los usa: con el motor local y sin token no se cargan nunca.
+
+
+# ================= CONEXIÓN GOOGLE =================
+def conectar_google():
+    try:
+        with metricas.tramo("google.auth"):
+            import gspread
+            if 'credenciales_seguras' in st.secrets:
+                b64 = st.secrets['credenciales_seguras']
+                creds = json.loads(base64.b64decode(b64).decode('utf-8'))
+                gc = gspread.service_account_from_dict(creds)
+            else:
+                gc = gspread.service_account(filename='credentials.json')
+            metricas.contar("sheets.lectura")
+            return gc.open("BaseDatos_Maestra")
+    except Exception as e:
+        st.error(f"Error conexión Google: {e}")
+        st.stop()
+
+
+# ================= TELEGRAM & ALERTAS =================
+def enviar_mensaje_telegram(mensaje):
+    bot = obtener_telegram()
+    if bot and bot.chat_id:
+        try: bot.cliente.enviar(bot.chat_id, mensaje)
+        except: pass
+
+
+def procesar_telegram(df_deudas, version):
+    """Sincroniza mensajes y envía alertas de pago"""
+    TOKEN = st.secrets.get("telegram_token")
+    if not TOKEN: return
+
+    # 1. ALERTAS DE PAGO Y CORTE (3 días antes, una sola vez cada una)
+    hoy = datetime.now().date()
+    programador = obtener_programador()
+    programador.actualizar(df_deudas, version, hoy)
+    for msg in programador.pendientes(hoy):
+        enviar_mensaje_telegram(msg)
+
+    # 2. LEER GASTOS DE TELEGRAM (si el lector de fondo está apagado)
+    bot = obtener_telegram()
+    if bot and not st.secrets.get("telegram_worker", True):
+        try: bot.sondear(timeout=0)
+        except: pass
+
+
+# ================= ALMACENAMIENTO =================
+@st.cache_resource
+def obtener_cliente_sheets():
+    """Un solo cliente autenticado por proceso (cuota, reintentos y worksheets compartidos)"""
+    from finanzas.cliente_sheets import ClienteSheets
+    return ClienteSheets(conectar_google())
+
+
+def almacen_sheets():
+    """AlmacenSheets con su copia local; aquí se carga gspread"""
+    from finanzas.almacen import AlmacenSheets
+    from finanzas.snapshot import SnapshotLocal
+    return AlmacenSheets(obtener_cliente_sheets(), SnapshotLocal(st.secrets.get("snapshot_path", ".cache/snapshot.sqlite")))
+
+
+@st.cache_resource
+def obtener_almacen():
+    """'sheets' (por defecto) o 'local' (SQLite, con espejo opcional a Sheets)"""
+    if st.secrets.get("almacen", "sheets") == "local":
+        from finanzas.almacen import AlmacenLocal
+        espejo = almacen_sheets() if st.secrets.get("espejo_sheets", False) else None
+        return AlmacenLocal(st.secrets.get("almacen_path", ".cache/finanzas.sqlite"), espejo, st.secrets.get("cola_espejo_path"))
+    return almacen_sheets()
+
+
+@st.cache_resource
+def obtener_cola():
+    """Escrituras diferidas: se ven al instante y se envían en lote en segundo plano"""
+    from finanzas.cola import ColaEscritura
+    return ColaEscritura(obtener_almacen(), st.secrets.get("cola_path", ".cache/cola_escritura.json"))
+
+
+@st.cache_resource
+def obtener_memo():
+    """Artefactos derivados compartidos por todas las sesiones (LRU con tope de memoria)"""
+    from finanzas.derivados import LIMITE_MB, MemoLRU
+    return MemoLRU(st.secrets.get("derivados_mb", LIMITE_MB))
+
+
+@st.cache_resource
+def obtener_pool_pdf():
+    """Un solo pool de procesos para los PDF del cierre de mes (spawn, ver finanzas/documentos.py)"""
+    from finanzas.documentos import crear_pool
+    return crear_pool()
+
+
+@st.cache_resource
+def obtener_programador():
+    from finanzas.alertas import ProgramadorAlertas
+    return ProgramadorAlertas(ruta=st.secrets.get("alertas_path", ".cache/alertas_enviadas.json"))
+
+
+@st.cache_resource
+def obtener_telegram():
+    """Lector del bot con long-polling en segundo plano (None si no hay token)"""
+    TOKEN = st.secrets.get("telegram_token")
+    if not TOKEN: return None
+    from finanzas.telegram import ClienteTelegram, TrabajadorTelegram
+    cliente = ClienteTelegram(TOKEN, st.secrets.get("telegram_api_url", "https://api.telegram.org"))
+    bot = TrabajadorTelegram(cliente, obtener_cola(), st.secrets.get("telegram_user_id"),
+                             st.secrets.get("telegram_offset_path", ".cache/telegram_offset.json"))
+    if st.secrets.get("telegram_worker", True): bot.iniciar()
+    return bot